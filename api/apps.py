@@ -0,0 +1,14 @@
+"""
+API 应用配置
+"""
+
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    name = 'api'
+    verbose_name = 'API'
+
+    def ready(self):
+        # 注册模型信号
+        from api import signals  # noqa: F401
@@ -10,6 +10,7 @@ from django.contrib.auth import get_user_model
 from rest_framework.authentication import SessionAuthentication as DRFSessionAuthentication
 
 from django_models.models import User_info
+from api.core import user_cache
 
 
 class SessionAuthentication(DRFSessionAuthentication):
@@ -72,7 +73,7 @@ class User_infoBackend(ModelBackend):
 
     def get_user(self, user_id):
         """
-        根据 user_id 获取用户对象
+        根据 user_id 获取用户对象（每个已登录请求调用一次，优先读取用户缓存）
 
         Args:
             user_id: 用户 ID
@@ -85,7 +86,7 @@ class User_infoBackend(ModelBackend):
             if isinstance(user_id, str):
                 user_id = int(user_id)
 
-            return User_info.objects.get(pk=user_id)
+            return user_cache.get_user(user_id)
 
-        except (User_info.DoesNotExist, ValueError, TypeError):
+        except (ValueError, TypeError):
             return None
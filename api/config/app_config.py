@@ -17,11 +17,87 @@ class AppConfig:
 
     # ===== 会话配置 =====
     SESSION_COOKIE_AGE = 30 * 24 * 60 * 60  # 30 天
+    SESSION_PURGE_INTERVAL_SECONDS = 60 * 60  # 登录时触发后台清理过期会话的最小间隔（所有进程共用，经缓存协调）
+    SESSION_PURGE_BATCH_SIZE = 1000  # 每批删除的过期会话数（按主键分批，避免长时间锁表）
+    SESSION_PURGE_MAX_BATCHES = 20  # 后台清理每次最多删除的批数，其余留到下次
+
+    # ===== 用户缓存配置 =====
+    USER_CACHE_TTL_SECONDS = 60  # 认证用户缓存时长；修改用户时主动失效，缓存后端不共享时为修改生效的最长延迟
 
     # ===== API 配置 =====
     API_DEFAULT_PAGE_SIZE = 10
     API_MAX_PAGE_SIZE = 100
 
+    # ===== 上传配置 =====
+    UPLOAD_WORKERS = 4  # 多图上传并发处理线程数
+    UPLOAD_HASH_ALGORITHM = 'sha256'  # 上传文件摘要算法（决定存储文件名，需与 image_blob.digest 一致）
+    IMAGE_DERIVATIVE_WORKERS = 2  # 衍生图（缩略图/WebP/打印版）生成线程数
+    # 衍生图规格：max_size 为长边像素上限（不放大），format 为输出格式
+    IMAGE_VARIANTS = {
+        'thumb': {'max_size': 320, 'format': 'webp', 'quality': 75},  # 列表缩略图
+        'web': {'max_size': 1280, 'format': 'webp', 'quality': 80},  # 预览弹窗
+        'print': {'max_size': 2000, 'format': 'jpeg', 'quality': 85},  # 打印
+    }
+    BLOB_GC_GRACE_SECONDS = 24 * 60 * 60  # 引用计数降为 0 后的图片保留期（从未被引用的图片不回收）
+    UPLOAD_MAX_REQUEST_SIZE = 50 * 1024 * 1024  # multipart 上传请求体上限（读取请求体前按 Content-Length 检查）
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # 分片上传的分片大小（最后一片可以更小）
+    UPLOAD_SESSION_TTL_SECONDS = 24 * 60 * 60  # 分片上传会话无进展超过该时长即视为放弃，由清理命令删除
+    UPLOAD_SESSION_MAX_ACTIVE = 20  # 每个用户同时进行中的分片上传会话上限
+    MEDIA_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60  # 文件名带内容摘要的媒体文件缓存时长
+
+    # ===== URL 批量导入配置 =====
+    URL_IMPORT_MAX_URLS = 100  # 单次导入的 URL 数上限
+    URL_IMPORT_WORKERS = 8  # 后台获取网页信息的线程数（同时受 fetch_title 的并发上限约束）
+    URL_IMPORT_UPDATE_BATCH = 20  # 获取结果攒够该数量即批量写回
+
+    # ===== 近似重复检测配置 =====
+    DUPLICATE_MIN_SIMILARITY = 0.5  # 估计的 Jaccard 相似度不低于该值视为疑似重复
+    DUPLICATE_MAX_RESULTS = 5  # 每条内容最多返回的疑似重复数
+    DUPLICATE_MAX_CANDIDATES = 200  # 段键命中的候选上限（再按签名计算相似度）
+
+    # ===== 限流与准入控制配置 =====
+    # 令牌桶 (容量, 周期秒数)：容量为允许的突发请求数，令牌在一个周期内匀速补满
+    THROTTLE_RATES = {
+        'export': {'user': (3, 60), 'global': (10, 60)},  # PDF 导出（Typst 编译）
+        'search': {'user': (30, 60), 'global': (300, 60)},
+        'upload': {'user': (20, 60), 'global': (120, 60)},  # 含分片上传的创建会话和完成上传
+        'upload_chunk': {'user': (120, 60), 'global': (600, 60)},  # 分片上传的分片和进度查询（按 UPLOAD_CHUNK_SIZE 计约每人每分钟 120MB）
+    }
+    TYPST_MAX_CONCURRENT = 1  # 同时进行的 Typst 编译数（编译写入同一个 latest.json / latest.pdf，不宜调大）
+    TYPST_MAX_WAITING = 4  # 每个进程中等待编译名额的请求上限，超出直接返回 429
+    TYPST_WAIT_TIMEOUT_SECONDS = 30  # 等待编译名额的最长时间，超时返回 429
+
+    # ===== 内容分面计数配置 =====
+    CONTENT_FACETS_CACHE_SECONDS = 300  # 分面计数缓存时长（内容写入时立即失效，TTL 只用于回收旧缓存）
+    CONTENT_FACETS_MAX_TAGS = 50  # 返回的标签数上限（按内容数降序）
+
+    # ===== 管理面板配置 =====
+    DASHBOARD_CACHE_SECONDS = 30  # 管理面板统计快照缓存时长（统计数最多滞后该时长）
+    DASHBOARD_STATUS_COUNTERS = False  # 各状态内容数读取 content_status_count 计数表，而非对内容表分组计数
+
+    # ===== 发布审核统计配置 =====
+    ANALYTICS_ENABLED = True  # 内容状态变化时累加每日汇总表（content_daily_stat / content_daily_latency）
+    ANALYTICS_DEFAULT_DAYS = 30  # 统计接口未指定起始日期时的天数
+    ANALYTICS_MAX_DAYS = 366  # 单次查询的日期范围上限
+    ANALYTICS_TOP_USERS = 20  # 默认返回的责任人数
+
+    # ===== 增量变更配置 =====
+    CHANGE_FEED_SAFETY_SECONDS = 5  # 只返回写入早于该时长的变更日志（须大于内容写事务的最长提交耗时和服务器间时钟偏差）
+
+    # ===== 事件推送（SSE）配置 =====
+    EVENT_BUFFER_SIZE = 1000  # 进程内事件环形缓冲区大小（断线重连可回放的事件数）
+    SSE_HEARTBEAT_SECONDS = 15  # 心跳间隔，防止代理断开空闲连接
+    SSE_MAX_STREAM_SECONDS = 300  # 单个连接最长保持时间，到期后由客户端自动重连
+    SSE_RETRY_MILLISECONDS = 3000  # 建议客户端重连间隔
+    SSE_MAX_SUBSCRIBERS = 10  # 每个进程同时保持的 SSE 连接上限（每个连接占用一个工作线程），超出返回 503
+    SSE_BUSY_RETRY_SECONDS = 30  # 连接数已满时 Retry-After 建议的重试间隔
+    SSE_POLL_SECONDS = 2  # 有订阅者时读取变更日志、补发其他进程状态变更的间隔
+
+    # ===== 审核队列配置 =====
+    REVIEW_CLAIM_TTL_SECONDS = 15 * 60  # 领取有效期，过期后其他审核者可重新领取
+    REVIEW_CLAIM_MAX_COUNT = 20  # 单次最多领取条数
+    REVIEW_CLAIM_MAX_ACTIVE = 50  # 每位审核者同时持有的领取上限
+
     # ===== 内容状态流转规则 =====
     # 定义允许的状态转换
     STATUS_TRANSITIONS = {
@@ -3,6 +3,8 @@
 提供统一的异常处理接口
 """
 
+import math
+
 
 class APIException(Exception):
     """API 基础异常"""
@@ -67,3 +69,18 @@ class ConflictError(APIException):
 
     def __init__(self, message: str):
         super().__init__(message, code='conflict', status=409)
+
+
+class PayloadTooLargeError(APIException):
+    """请求体过大 (413)"""
+
+    def __init__(self, message: str = 'Request entity too large'):
+        super().__init__(message, code='payload_too_large', status=413)
+
+
+class TooManyRequestsError(APIException):
+    """请求过多 (429)，retry_after 为建议的重试间隔（秒）"""
+
+    def __init__(self, message: str = 'Too many requests', retry_after: float = None):
+        super().__init__(message, code='too_many_requests', status=429)
+        self.retry_after = math.ceil(retry_after) if retry_after is not None else None
@@ -0,0 +1,83 @@
+"""
+媒体文件路径与 URL
+上传图片、衍生图、导出 PDF 通过 /media/ 提供下载（见 api/views/media.py）
+"""
+
+import os
+import re
+from typing import Optional
+
+from django.conf import settings
+
+
+# 可通过 /media/ 访问的目录（相对 MEDIA_ROOT，即 static 目录）
+MEDIA_DIRS = ('uploads', 'pdfs')
+
+# 文件名包含内容摘要的文件内容永不变化，可长期缓存：
+# uploads/3f/<摘要>.png、uploads/derived/3f/<摘要>_thumb.webp、pdfs/2025-01-01.<摘要前12位>.pdf
+IMMUTABLE_NAME_REGEX = re.compile(
+    r'(?:^|/)(?:[0-9a-f]{64}(?:_[a-z]+)?|[^/]+\.[0-9a-f]{12})\.[A-Za-z0-9]+$'
+)
+
+
+def media_url(path: str) -> str:
+    """
+    相对 static 目录的路径转换为下载 URL
+
+    Args:
+        path: 如 uploads/3f/<摘要>.png、pdfs/2025-01-01.<摘要>.pdf
+
+    Returns:
+        MEDIA_DIRS 中的文件返回 /media/ 地址，其余返回 /static/ 地址
+    """
+    path = path.replace('\\', '/').lstrip('/')
+    if path.split('/', 1)[0] in MEDIA_DIRS:
+        return f"{settings.MEDIA_URL}{path}"
+    return f"{settings.STATIC_URL}{path}"
+
+
+def strip_url_prefix(url: str) -> str:
+    """
+    去掉 /static/ 或 /media/ 前缀，得到相对 static 目录的路径
+
+    Args:
+        url: 下载 URL 或已是相对路径的字符串
+
+    Returns:
+        相对 static 目录的路径
+    """
+    url = url.replace('\\', '/')
+    for prefix in (settings.STATIC_URL, settings.MEDIA_URL):
+        if url.startswith(prefix):
+            return url[len(prefix):]
+    return url
+
+
+def is_immutable(path: str) -> bool:
+    """文件名是否包含内容摘要（内容不会变化）"""
+    return bool(IMMUTABLE_NAME_REGEX.search(path))
+
+
+def resolve_media_path(path: str) -> Optional[str]:
+    """
+    将 /media/ 后的路径解析为绝对路径
+
+    只允许 MEDIA_DIRS 下的普通文件，拒绝 ..、隐藏文件（如分片上传暂存目录 .sessions）
+
+    Args:
+        path: URL 中 /media/ 之后的部分
+
+    Returns:
+        绝对路径；不允许访问或文件不存在时返回 None
+    """
+    parts = path.replace('\\', '/').split('/')
+    if not parts or parts[0] not in MEDIA_DIRS:
+        return None
+    if any(not part or part.startswith('.') for part in parts):
+        return None
+
+    root = os.path.realpath(settings.MEDIA_ROOT)
+    absolute = os.path.realpath(os.path.join(root, *parts))
+    if not absolute.startswith(root + os.sep) or not os.path.isfile(absolute):
+        return None
+    return absolute
@@ -0,0 +1,114 @@
+"""
+认证用户缓存
+
+每个已登录的 API 请求都要根据会话中的 user_id 取用户（User_infoBackend.get_user），
+权限类再据此判断角色。用户信息很少变化，按 user_id 缓存数据库行，
+用户被修改/删除时（post_save/post_delete 信号，事务提交后）删除缓存。
+
+缓存使用 Django 的 default 缓存（见 config/django_config.py 的 cache_settings），
+多个进程共用同一缓存后端时失效立即对所有进程生效；
+否则修改最迟在 USER_CACHE_TTL_SECONDS 后生效。
+"""
+
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+from django_models.models import User_info
+from api.config.app_config import app_config
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# 缓存值的字段列表（模型字段变化后旧缓存自动失效）
+_FIELD_NAMES = tuple(field.attname for field in User_info._meta.concrete_fields)
+
+
+def cache_key(user_id: int) -> str:
+    return f'user:{user_id}'
+
+
+def get_user(user_id: int) -> Optional[User_info]:
+    """
+    按主键获取用户，优先读取缓存
+
+    Args:
+        user_id: 用户ID
+
+    Returns:
+        User_info 实例（与从数据库加载的实例相同，可正常修改保存）；用户不存在时返回 None
+    """
+    key = cache_key(user_id)
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        # 缓存不可用时退回数据库查询
+        logger.warning(f"读取用户缓存失败, user_id={user_id}, error={str(e)}")
+        cached = None
+
+    if cached is not None and cached[0] == _FIELD_NAMES:
+        return User_info.from_db('default', _FIELD_NAMES, cached[1])
+
+    row = User_info.objects.filter(pk=user_id).values_list(*_FIELD_NAMES).first()
+    return _cache_row(row)
+
+
+def _cache_row(row, username_key: Optional[str] = None) -> Optional[User_info]:
+    """缓存查询到的用户行（及用户名映射），返回用户实例"""
+    if row is None:
+        return None
+    user = User_info.from_db('default', _FIELD_NAMES, row)
+    entries = {cache_key(user.id): (_FIELD_NAMES, row)}
+    if username_key:
+        entries[username_key] = user.id
+    try:
+        cache.set_many(entries, app_config.USER_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"写入用户缓存失败, user_id={user.id}, error={str(e)}")
+    return user
+
+
+def get_user_by_username(username: str) -> Optional[User_info]:
+    """
+    按用户名获取用户（Flask 应用的会话中保存的是用户名），优先读取缓存
+
+    用户名到ID的映射不随用户修改失效：取到的用户名不一致（已改名）时重新查询。
+
+    Args:
+        username: 用户名
+
+    Returns:
+        User_info 实例；用户不存在时返回 None
+    """
+    key = f'user:name:{username}'
+    try:
+        user_id = cache.get(key)
+    except Exception as e:
+        logger.warning(f"读取用户缓存失败, username={username}, error={str(e)}")
+        user_id = None
+
+    if user_id is not None:
+        user = get_user(user_id)
+        if user is not None and user.username == username:
+            return user
+
+    row = User_info.objects.filter(username=username).values_list(*_FIELD_NAMES).first()
+    return _cache_row(row, username_key=key)
+
+
+def invalidate(user_id: int) -> None:
+    """
+    删除用户缓存（在事务中调用时，提交后再删除，避免其他请求在提交前重新缓存旧数据）
+
+    Args:
+        user_id: 用户ID
+    """
+    def delete():
+        try:
+            cache.delete(cache_key(user_id))
+        except Exception as e:
+            logger.error(f"删除用户缓存失败, user_id={user_id}, error={str(e)}")
+
+    transaction.on_commit(delete)
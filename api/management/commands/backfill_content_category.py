@@ -0,0 +1,70 @@
+"""
+回填内容导出分类
+
+根据 tag/type 重新计算 content_management.category，用于新增 category 列之后的历史数据，
+以及分类规则调整后的重算。已有数据库需先执行仓库根目录的 upgrade_tables.sql 增加该列。
+
+用法:
+    python manage.py backfill_content_category
+    python manage.py backfill_content_category --batch-size 1000 --dry-run
+"""
+
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from django_models.models import Content
+from api.services.content_facet_service import ContentFacetService
+from api.services.tag_service import TagService
+
+
+class Command(BaseCommand):
+    help = '根据标签和类型回填内容导出分类（category 列）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='每批处理的内容条数')
+        parser.add_argument('--dry-run', action='store_true', help='只统计需要修改的条数，不写库')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        last_id = 0
+        scanned = 0
+        changed = 0
+        while True:
+            # 按主键分批扫描，只读取计算分类所需的列
+            rows = list(
+                Content.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'tag', 'type', 'category')[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            scanned += len(rows)
+
+            # 标签从 content_tag 一次读取本批；尚未回填关联的内容再解析 tag 字段
+            tag_map = TagService.tags_for_contents(row[0] for row in rows)
+
+            # 按目标分类归组，每个分类一条 UPDATE；使用 update() 不刷新 updated_at
+            pending = defaultdict(list)
+            for content_id, tag, type_, category in rows:
+                if content_id in tag_map:
+                    derived = Content.category_for_tags(tag_map[content_id], type_)
+                else:
+                    derived = Content.derive_category(tag, type_)
+                if derived != category:
+                    pending[derived].append(content_id)
+
+            for category, ids in pending.items():
+                changed += len(ids)
+                if not dry_run:
+                    Content.objects.filter(id__in=ids).update(category=category)
+
+        if changed and not dry_run:
+            # update() 不触发信号，按分类筛选的分面计数缓存需显式失效
+            ContentFacetService.invalidate()
+
+        action = '需要更新' if dry_run else '已更新'
+        self.stdout.write(self.style.SUCCESS(f'扫描 {scanned} 条内容，{action} {changed} 条'))
@@ -0,0 +1,55 @@
+"""
+回填链接去重键
+
+根据 link 重新计算 content_management.link_hash，用于新增 link_hash 列之后的历史数据，
+以及规范化规则调整后的重算。已有数据库需先执行仓库根目录的 upgrade_tables.sql 增加该列。
+
+用法:
+    python manage.py backfill_link_hash
+    python manage.py backfill_link_hash --batch-size 1000 --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from django_models.models import Content
+from common.methods.canonical_url import link_hash
+
+
+class Command(BaseCommand):
+    help = '根据链接回填内容的链接去重键（link_hash 列）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='每批处理的内容条数')
+        parser.add_argument('--dry-run', action='store_true', help='只统计需要修改的条数，不写库')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        last_id = 0
+        scanned = 0
+        changed = 0
+        while True:
+            # 按主键分批扫描，只读取计算去重键所需的列
+            rows = list(
+                Content.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'link', 'link_hash')[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            scanned += len(rows)
+
+            # 去重键各不相同，用 bulk_update 一条 UPDATE ... CASE 写回整批；不刷新 updated_at
+            pending = [
+                Content(id=content_id, link_hash=link_hash(link))
+                for content_id, link, current in rows
+                if link_hash(link) != current
+            ]
+            changed += len(pending)
+            if pending and not dry_run:
+                Content.objects.bulk_update(pending, ['link_hash'])
+
+        action = '需要更新' if dry_run else '已更新'
+        self.stdout.write(self.style.SUCCESS(f'扫描 {scanned} 条内容，{action} {changed} 条'))
@@ -0,0 +1,35 @@
+"""
+清理放弃的分片上传会话
+
+删除超过保留期无进展的 upload_session 记录及其暂存文件，以及暂存目录中没有会话记录的孤立文件。
+
+用法:
+    python manage.py cleanup_upload_sessions
+    python manage.py cleanup_upload_sessions --ttl-hours 6 --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.services.upload_session_service import UploadSessionService
+
+
+class Command(BaseCommand):
+    help = '清理长时间无进展的分片上传会话及暂存文件'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ttl-hours', type=float, default=None,
+                            help='会话无进展多久后清理（小时），默认使用 UPLOAD_SESSION_TTL_SECONDS')
+        parser.add_argument('--dry-run', action='store_true', help='只统计不删除')
+
+    def handle(self, *args, **options):
+        ttl_seconds = None
+        if options['ttl_hours'] is not None:
+            ttl_seconds = int(options['ttl_hours'] * 3600)
+
+        stats = UploadSessionService.cleanup(ttl_seconds=ttl_seconds, dry_run=options['dry_run'])
+
+        action = '可清理' if options['dry_run'] else '已清理'
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {stats['sessions']} 个上传会话，删除暂存文件 {stats['files_removed']} 个，"
+            f"释放 {stats['bytes_freed'] / 1024 / 1024:.1f} MB"
+        ))
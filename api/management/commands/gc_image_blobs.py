@@ -0,0 +1,47 @@
+"""
+回收未被引用的图片
+
+删除引用计数已降为 0（released_at 非空）且超过保留期的 image_blob 记录及其文件，分批执行。
+从未被内容引用过的图片不会被删除。
+
+用法:
+    python manage.py gc_image_blobs
+    python manage.py gc_image_blobs --recount --batch-size 500 --grace-hours 48 --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.services.blob_service import BlobService
+
+
+class Command(BaseCommand):
+    help = '回收未被任何内容引用的图片（数据库记录和文件）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='每批删除的图片数')
+        parser.add_argument('--grace-hours', type=float, default=None,
+                            help='引用释放后的保留时长（小时），默认使用 BLOB_GC_GRACE_SECONDS')
+        parser.add_argument('--recount', action='store_true',
+                            help='回收前根据全部 Content.image_list 重新计算引用计数')
+        parser.add_argument('--dry-run', action='store_true', help='只统计不删除')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            changed = BlobService.recount()
+            self.stdout.write(f'引用计数已重新计算，{changed} 张图片的计数发生变化')
+
+        grace_seconds = None
+        if options['grace_hours'] is not None:
+            grace_seconds = int(options['grace_hours'] * 3600)
+
+        stats = BlobService.collect_garbage(
+            batch_size=options['batch_size'],
+            grace_seconds=grace_seconds,
+            dry_run=options['dry_run'],
+        )
+
+        action = '可回收' if options['dry_run'] else '已回收'
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {stats['deleted']} 张图片，删除文件 {stats['files_removed']} 个，"
+            f"释放 {stats['bytes_freed'] / 1024 / 1024:.1f} MB"
+        ))
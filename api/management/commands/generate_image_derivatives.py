@@ -0,0 +1,55 @@
+"""
+补生成历史图片的衍生图
+
+为 image_blob.variants 为空（NULL，尚未生成）的图片同步生成衍生图并记录结果，分批执行。
+新上传的图片由上传接口提交后台任务生成，无需运行本命令。
+
+用法:
+    python manage.py generate_image_derivatives
+    python manage.py generate_image_derivatives --batch-size 100 --retry-failed
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from django_models.models import ImageBlob
+from api.services.blob_service import BlobService
+from api.services.image_derivative_service import ImageDerivativeService
+
+
+class Command(BaseCommand):
+    help = '为尚未生成衍生图的历史图片补生成缩略图、网页版和打印版'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='每批处理的图片数')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='同时重试之前生成失败（variants 为空字符串）的图片')
+
+    def handle(self, *args, **options):
+        if not ImageDerivativeService.is_available():
+            raise CommandError('未安装 Pillow，无法生成衍生图（pip install Pillow）')
+
+        pending = Q(variants__isnull=True)
+        if options['retry_failed']:
+            pending |= Q(variants='')
+
+        batch_size = options['batch_size']
+        last_id = 0
+        processed = 0
+        failed = 0
+        while True:
+            blobs = list(
+                ImageBlob.objects.filter(pending, id__gt=last_id).order_by('id')[:batch_size]
+            )
+            if not blobs:
+                break
+            for blob in blobs:
+                done = ImageDerivativeService.generate(blob.digest, BlobService.absolute_path(blob))
+                ImageDerivativeService.record(blob.digest, done)
+                processed += 1
+                if not done:
+                    failed += 1
+            last_id = blobs[-1].id
+            self.stdout.write(f'已处理 {processed} 张图片')
+
+        self.stdout.write(self.style.SUCCESS(f'共处理 {processed} 张图片，其中 {failed} 张生成失败'))
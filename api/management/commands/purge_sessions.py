@@ -0,0 +1,35 @@
+"""
+清理过期会话
+
+按主键分批删除 django_session 中已过期的会话（Django 自带的 clearsessions 用一条 DELETE 删除全部过期行，
+表很大时会长时间锁表）。使用签名 Cookie 会话存储时无需运行。
+
+用法:
+    python manage.py purge_sessions
+    python manage.py purge_sessions --batch-size 5000 --pause 0.5
+    python manage.py purge_sessions --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.services.session_service import SessionService
+
+
+class Command(BaseCommand):
+    help = '分批删除已过期的会话'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='每批删除的会话数，默认使用 SESSION_PURGE_BATCH_SIZE')
+        parser.add_argument('--pause', type=float, default=0.1, help='每批之间的间隔（秒）')
+        parser.add_argument('--dry-run', action='store_true', help='只统计过期会话数，不删除')
+
+    def handle(self, *args, **options):
+        count = SessionService.purge_expired(
+            batch_size=options['batch_size'],
+            pause_seconds=options['pause'],
+            dry_run=options['dry_run'],
+        )
+
+        action = '可清理' if options['dry_run'] else '已清理'
+        self.stdout.write(self.style.SUCCESS(f'{action} {count} 个过期会话'))
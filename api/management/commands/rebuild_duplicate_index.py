@@ -0,0 +1,27 @@
+"""
+重建近似重复索引
+
+根据标题和正文重新计算全部内容的 MinHash 签名和 LSH 段键（content_fingerprint、content_lsh_band 表），
+用于新增索引表之后的历史数据，以及签名参数调整后的重算。
+
+用法:
+    python manage.py rebuild_duplicate_index
+    python manage.py rebuild_duplicate_index --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.services.duplicate_service import DuplicateService
+
+
+class Command(BaseCommand):
+    help = '根据标题和正文重建内容的近似重复索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='每批处理的内容条数')
+
+    def handle(self, *args, **options):
+        stats = DuplicateService.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"扫描 {stats['scanned']} 条内容，写入签名 {stats['indexed']} 条（文本过短的内容不建索引）"
+        ))
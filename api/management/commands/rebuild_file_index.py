@@ -0,0 +1,34 @@
+"""
+重建上传文件索引
+
+用 os.scandir 扫描 static/uploads（跳过衍生图和分片暂存目录），按批写入 upload_file 表，
+并根据全部 Content.image_list 重新计算每个文件的引用内容；目录中已不存在的文件的记录会被删除。
+
+用法:
+    python manage.py rebuild_file_index
+    python manage.py rebuild_file_index --batch-size 1000 --hash
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.services.file_index_service import FileIndexService
+
+
+class Command(BaseCommand):
+    help = '扫描上传目录，全量重建文件索引（管理员文件浏览）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='每批写入的记录数')
+        parser.add_argument('--hash', action='store_true',
+                            help='为文件名不含摘要的旧文件计算 SHA-256 摘要（需读取文件内容）')
+
+    def handle(self, *args, **options):
+        stats = FileIndexService.rebuild(
+            batch_size=options['batch_size'],
+            compute_digests=options['hash'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"扫描 {stats['scanned']} 个文件：新增 {stats['created']}，更新 {stats['updated']}，"
+            f"删除 {stats['removed']} 条失效记录"
+        ))
@@ -0,0 +1,25 @@
+"""
+重算内容状态计数
+
+根据 content 表重新计算 content_status_count 表的各状态内容数
+（开启 DASHBOARD_STATUS_COUNTERS 后首次使用，或计数与实际不符时执行），并清除管理面板统计快照。
+
+用法:
+    python manage.py rebuild_status_counts
+"""
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from api.services.dashboard_service import DashboardService, SNAPSHOT_CACHE_KEY
+
+
+class Command(BaseCommand):
+    help = '根据内容表重算各状态内容数（管理面板统计）'
+
+    def handle(self, *args, **options):
+        counts = DashboardService.rebuild_counters()
+        cache.delete(SNAPSHOT_CACHE_KEY)
+
+        summary = '，'.join(f'{status} {count}' for status, count in sorted(counts.items()))
+        self.stdout.write(self.style.SUCCESS(f"已重算内容状态计数：{summary or '无内容'}"))
@@ -4,8 +4,16 @@ API 序列化器
 定义所有 API 端点的数据序列化逻辑
 """
 
+import json
+
+from django.db import models
 from rest_framework import serializers
-from django_models.models import User_info, Content, Comment
+from django_models.models import User_info, Content, Comment, UploadFile
+from api.core.media import media_url
+from api.services.blob_service import BlobService
+from api.services.image_derivative_service import ImageDerivativeService
+from api.services.tag_service import TagService
+from api.services.user_service import CONTENT_STATUS_COUNT_FIELDS
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -38,6 +46,63 @@ class UserSerializer(serializers.ModelSerializer):
         return obj.has_admin_perm
 
 
+class UserListSerializer(UserSerializer):
+    """
+    用户列表序列化器（附带内容数，取自 UserService.annotate_content_counts 的注解字段）
+    """
+    content_counts = serializers.SerializerMethodField()
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ['role', 'content_counts']
+
+    def get_content_counts(self, obj):
+        """创建/描述/审核的内容数，以及创建的内容中各状态的数量"""
+        return {
+            'created': obj.created_count,
+            'described': obj.described_count,
+            'reviewed': obj.reviewed_count,
+            'created_by_status': {
+                status: getattr(obj, f'created_{status}_count') for status in CONTENT_STATUS_COUNT_FIELDS
+            },
+        }
+
+
+def image_paths(content):
+    """解析 image_list（JSON 数组字符串）中的图片路径"""
+    if content is None or not getattr(content, 'image_list', None) or content.image_list == '[]':
+        return []
+    try:
+        paths = json.loads(content.image_list)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    if not isinstance(paths, list):
+        return []
+    return [path for path in paths if isinstance(path, str)]
+
+
+def image_digests(content):
+    """内容图片的摘要（旧格式路径没有摘要）"""
+    return list(BlobService.digests_from_image_list(getattr(content, 'image_list', None)))
+
+
+class ContentListSerializer(serializers.ListSerializer):
+    """
+    内容列表序列化器（一条查询批量读取本页内容的标签）
+    """
+
+    def to_representation(self, data):
+        contents = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child._tag_map = TagService.tags_for_contents(content.id for content in contents)
+        self.child._variant_map = ImageDerivativeService.variants_for(
+            digest for content in contents for digest in image_digests(content)
+        )
+        try:
+            return super().to_representation(contents)
+        finally:
+            del self.child._tag_map
+            del self.child._variant_map
+
+
 class ContentSerializer(serializers.ModelSerializer):
     """
     内容序列化器
@@ -53,9 +118,11 @@ class ContentSerializer(serializers.ModelSerializer):
     status_display = serializers.SerializerMethodField()
     can_delete = serializers.SerializerMethodField()
     tag_list = serializers.SerializerMethodField()  # 标签列表（JSON 数组格式）
+    image_variants = serializers.SerializerMethodField()  # 图片各规格 URL（缩略图/WebP/打印版）
 
     class Meta:
         model = Content
+        list_serializer_class = ContentListSerializer
         fields = [
             'id',
             'creator_id',
@@ -66,12 +133,14 @@ class ContentSerializer(serializers.ModelSerializer):
             'link',
             'content',
             'type',
+            'category',
             'status',
             'status_display',
             # 'tag',  # 移除原始字符串，只返回解析后的数组
             'tag_list',  # 标签列表（JSON 数组）
             'deadline',
             'image_list',
+            'image_variants',
             'publish_at',
             'created_at',
             'updated_at',
@@ -157,31 +226,37 @@ class ContentSerializer(serializers.ModelSerializer):
         """
         获取标签列表（JSON 数组格式）
 
-        支持两种格式：
-        1. 逗号分隔的字符串: "标签1,标签2,标签3"
-        2. JSON 数组字符串: '["标签1","标签2","标签3"]'
+        列表由 ContentListSerializer 批量读取 content_tag 关联；单个对象直接解析 tag 字段
+        （JSON 数组或逗号分隔的字符串），不额外查询。尚未回填关联的历史内容同样解析 tag 字段
 
         返回统一的数组格式: ["标签1", "标签2", "标签3"]
         """
-        import json
-
-        if obj is None or not hasattr(obj, 'tag') or not obj.tag:
+        if obj is None or not getattr(obj, 'tag', None) or obj.tag == '[]':
             return []
 
-        tag_str = obj.tag
+        tag_map = getattr(self, '_tag_map', None)
+        if tag_map is not None and obj.id in tag_map:
+            return tag_map[obj.id]
+        return Content.parse_tags(obj.tag)
 
-        # 尝试解析 JSON 数组
-        try:
-            if tag_str.startswith('['):
-                return json.loads(tag_str)
-        except (json.JSONDecodeError, TypeError):
-            pass
+    def get_image_variants(self, obj):
+        """
+        获取图片各规格的 URL
 
-        # 如果不是 JSON 数组，按逗号分割
-        if tag_str:
-            return [t.strip() for t in tag_str.split(',') if t.strip()]
+        返回: [{"original": ..., "thumb": ..., "web": ..., "print": ...}, ...]
+        衍生图尚未生成时对应规格为原图 URL（按 image_blob.variants 判断，列表由 ContentListSerializer 批量读取）
+        """
+        paths = image_paths(obj)
+        if not paths:
+            return []
 
-        return []
+        variant_map = getattr(self, '_variant_map', None)
+        if variant_map is None:
+            variant_map = ImageDerivativeService.variants_for(image_digests(obj))
+        return [
+            ImageDerivativeService.variant_urls(path, variant_map.get(BlobService.digest_from_path(path)))
+            for path in paths
+        ]
 
 
 class ContentCreateSerializer(serializers.ModelSerializer):
@@ -304,6 +379,42 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created', 'updated']
 
 
+class UploadFileSerializer(serializers.ModelSerializer):
+    """
+    上传文件索引序列化器（管理员文件浏览）
+    """
+    url = serializers.SerializerMethodField()
+    owner_username = serializers.SerializerMethodField()
+    content_ids = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadFile
+        fields = [
+            'id',
+            'path',
+            'url',
+            'size',
+            'digest',
+            'owner_id',
+            'owner_username',
+            'content_ids',
+            'ref_count',
+            'modified_at',
+        ]
+
+    def get_url(self, obj):
+        """下载地址"""
+        return media_url(obj.path)
+
+    def get_owner_username(self, obj):
+        """上传者用户名（由服务层批量填充）"""
+        return getattr(obj, 'owner_username', '')
+
+    def get_content_ids(self, obj):
+        """引用该文件的内容ID列表"""
+        return obj.get_content_ids()
+
+
 class LoginResponseSerializer(serializers.Serializer):
     """
     登录响应序列化器
@@ -11,6 +11,20 @@ from .publish_service import PublishService
 from .file_service import FileService
 from .pdf_service import PDFService
 from .export_service import ExportService
+from .change_feed_service import ChangeFeedService
+from .event_service import EventService
+from .review_queue_service import ReviewQueueService
+from .blob_service import BlobService
+from .image_derivative_service import ImageDerivativeService
+from .upload_session_service import UploadSessionService
+from .file_index_service import FileIndexService
+from .url_import_service import UrlImportService
+from .duplicate_service import DuplicateService
+from .session_service import SessionService
+from .dashboard_service import DashboardService
+from .analytics_service import AnalyticsService
+from .content_facet_service import ContentFacetService
+from .tag_service import TagService
 
 __all__ = [
     'BaseService',
@@ -21,4 +35,18 @@ __all__ = [
     'FileService',
     'PDFService',
     'ExportService',
+    'ChangeFeedService',
+    'EventService',
+    'ReviewQueueService',
+    'BlobService',
+    'ImageDerivativeService',
+    'UploadSessionService',
+    'FileIndexService',
+    'UrlImportService',
+    'DuplicateService',
+    'SessionService',
+    'DashboardService',
+    'AnalyticsService',
+    'ContentFacetService',
+    'TagService',
 ]
@@ -0,0 +1,429 @@
+"""
+发布与审核统计服务
+按天汇总内容状态流转和耗时分布，趋势统计只读汇总表，不扫描内容表
+
+设计说明：
+- content_daily_stat：每天、每个状态、每个责任人的流转次数（新建记为 created）
+- content_daily_latency：每天的审核耗时（待审核→审核完成）和发布耗时（创建→发布）直方图，
+  按固定分桶计数；任意日期范围的分位数由各桶计数求和后按累计分布插值得到，不需要逐条耗时
+- 内容新建或状态变化时由信号在同一事务中累加（Flask 和 Django API 的写入都经过模型保存），
+  批量创建由服务显式累加；汇总表写入失败只记录日志，不影响内容写入
+- backfill_content_analytics 命令根据变更日志和内容表重建汇总表
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Optional, Sequence
+
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from django_models.models import User_info, Content, ContentChangeLog, ContentDailyStat, ContentDailyLatency
+from api.core.exceptions import ValidationError
+from api.config.app_config import app_config
+from api.config.constants import (
+    CONTENT_STATUS_CHOICES,
+    CONTENT_STATUS_DRAFT,
+    CONTENT_STATUS_PENDING,
+    CONTENT_STATUS_REVIEWED,
+    CONTENT_STATUS_REJECTED,
+    CONTENT_STATUS_PUBLISHED,
+)
+from api.services.base_service import BaseService
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# 耗时分桶上界（秒）：第 i 个桶为 [BOUNDS[i-1], BOUNDS[i])，最后一个桶为 30 天以上
+LATENCY_BUCKET_BOUNDS = (
+    60, 5 * 60, 15 * 60, 30 * 60,
+    3600, 2 * 3600, 4 * 3600, 8 * 3600, 12 * 3600,
+    86400, 2 * 86400, 3 * 86400, 7 * 86400, 14 * 86400, 30 * 86400,
+)
+
+PERCENTILES = (50, 90, 99)
+
+# 报表中按天展示的状态（created 表示新建）
+REPORT_STATUSES = [ContentDailyStat.STATUS_CREATED] + [status for status, _ in CONTENT_STATUS_CHOICES]
+
+REVIEW_DONE_STATUSES = (CONTENT_STATUS_REVIEWED, CONTENT_STATUS_REJECTED)
+
+METRICS = (ContentDailyLatency.METRIC_REVIEW, ContentDailyLatency.METRIC_PUBLISH)
+
+
+def latency_bucket(seconds: float) -> int:
+    """耗时所在的分桶序号"""
+    return bisect_right(LATENCY_BUCKET_BOUNDS, max(0.0, seconds))
+
+
+def histogram_percentiles(counts: Sequence[int], percentiles: Sequence[int] = PERCENTILES) -> Dict[str, Optional[int]]:
+    """
+    根据分桶计数估算分位数（桶内按均匀分布线性插值）
+
+    Args:
+        counts: 各桶计数（长度为 len(LATENCY_BUCKET_BOUNDS) + 1）
+        percentiles: 分位点（0-100）
+
+    Returns:
+        {'p50_seconds': 秒, ...}；没有数据时为 None，落在最后一个桶时取其下界
+    """
+    cumulative = list(accumulate(counts))
+    total = cumulative[-1] if cumulative else 0
+    result = {}
+    for p in percentiles:
+        key = f'p{p}_seconds'
+        if not total:
+            result[key] = None
+            continue
+        rank = max(p / 100 * total, 1)
+        index = bisect_left(cumulative, rank)
+        lower = LATENCY_BUCKET_BOUNDS[index - 1] if index else 0
+        if index >= len(LATENCY_BUCKET_BOUNDS):
+            result[key] = lower
+            continue
+        before = cumulative[index - 1] if index else 0
+        upper = LATENCY_BUCKET_BOUNDS[index]
+        result[key] = round(lower + (rank - before) / counts[index] * (upper - lower))
+    return result
+
+
+def responsible_user(status: str, creator_id: Optional[int], describer_id: Optional[int],
+                     reviewer_id: Optional[int]) -> int:
+    """
+    状态流转的责任人：新建/草稿为创建者，待审核为描述者（无则创建者），审核/发布为审核者
+
+    Returns:
+        用户ID；未知时为 0
+    """
+    if status in (ContentDailyStat.STATUS_CREATED, CONTENT_STATUS_DRAFT):
+        user_id = creator_id
+    elif status == CONTENT_STATUS_PENDING:
+        user_id = describer_id or creator_id
+    elif status in REVIEW_DONE_STATUSES or status == CONTENT_STATUS_PUBLISHED:
+        user_id = reviewer_id
+    else:
+        user_id = None
+    return user_id or 0
+
+
+def _increment(model, lookup: Dict[str, Any], **deltas) -> None:
+    """累加汇总行（不存在时创建）"""
+    updated = model.objects.filter(**lookup).update(**{name: F(name) + value for name, value in deltas.items()})
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # 并发创建了同一行
+        model.objects.filter(**lookup).update(**{name: F(name) + value for name, value in deltas.items()})
+
+
+class AnalyticsService(BaseService):
+    """发布与审核统计服务类"""
+
+    @staticmethod
+    def on_status_changed(content: Content, old_status: Optional[str],
+                          status_since: Optional[datetime] = None) -> None:
+        """
+        内容新建（old_status 为 None）或状态变化后累加当天的汇总
+
+        Args:
+            content: 已保存的内容对象
+            old_status: 原状态
+            status_since: 保存前的 updated_at（变更日志中找不到进入待审核的时间时，作为审核耗时的起点）
+        """
+        if not app_config.ANALYTICS_ENABLED:
+            return
+        now = timezone.now()
+        day = now.date()
+        status = content.status
+        users = (content.creator_id, content.describer_id, content.reviewer_id)
+
+        try:
+            # 保存点：汇总表写入失败不影响内容写入所在的事务
+            with transaction.atomic():
+                if old_status is None:
+                    AnalyticsService._add_transition(day, ContentDailyStat.STATUS_CREATED, content.creator_id or 0)
+                if old_status is not None or status != CONTENT_STATUS_DRAFT:
+                    AnalyticsService._add_transition(day, status, responsible_user(status, *users))
+
+                if status in REVIEW_DONE_STATUSES and old_status == CONTENT_STATUS_PENDING:
+                    pending_since = ContentChangeLog.objects.filter(
+                        content_id=content.id, new_status=CONTENT_STATUS_PENDING
+                    ).order_by('-id').values_list('created_at', flat=True).first() or status_since
+                    if pending_since:
+                        AnalyticsService._add_latency(day, ContentDailyLatency.METRIC_REVIEW, now - pending_since)
+
+                if status == CONTENT_STATUS_PUBLISHED and content.created_at:
+                    AnalyticsService._add_latency(day, ContentDailyLatency.METRIC_PUBLISH, now - content.created_at)
+        except DatabaseError as e:
+            logger.error(
+                f"累加发布审核统计失败, content_id={content.id}, old_status={old_status}, "
+                f"new_status={status}, error={str(e)}"
+            )
+
+    @staticmethod
+    def on_bulk_created(user_id: int, count: int, status: str = CONTENT_STATUS_DRAFT) -> None:
+        """
+        批量创建内容（bulk_create 不触发信号）后累加当天的新建数
+
+        Args:
+            user_id: 创建者ID
+            count: 创建条数
+            status: 创建时的状态
+        """
+        if not app_config.ANALYTICS_ENABLED or count <= 0:
+            return
+        day = timezone.now().date()
+        try:
+            with transaction.atomic():
+                AnalyticsService._add_transition(day, ContentDailyStat.STATUS_CREATED, user_id, count)
+                if status != CONTENT_STATUS_DRAFT:
+                    AnalyticsService._add_transition(day, status, user_id, count)
+        except DatabaseError as e:
+            logger.error(f"累加发布审核统计失败, user_id={user_id}, count={count}, error={str(e)}")
+
+    @staticmethod
+    def _add_transition(day: date, status: str, user_id: int, count: int = 1) -> None:
+        _increment(ContentDailyStat, {'day': day, 'status': status, 'user_id': user_id}, count=count)
+
+    @staticmethod
+    def _add_latency(day: date, metric: str, elapsed: timedelta) -> None:
+        seconds = max(0, int(elapsed.total_seconds()))
+        _increment(
+            ContentDailyLatency,
+            {'day': day, 'metric': metric, 'bucket': latency_bucket(seconds)},
+            count=1,
+            total_seconds=seconds,
+        )
+
+    @staticmethod
+    def _parse_day(value: Optional[str], name: str) -> Optional[date]:
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise ValidationError(f'{name} 日期格式应为 YYYY-MM-DD')
+
+    @staticmethod
+    def get_report(start: Optional[str] = None, end: Optional[str] = None,
+                   user_limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        获取日期范围内的发布审核统计
+
+        每类数据一条按日期范围的聚合查询（汇总表按 day 索引），分位数由范围内各桶计数之和计算。
+
+        Args:
+            start: 起始日期（YYYY-MM-DD，含），默认为结束日期前 ANALYTICS_DEFAULT_DAYS - 1 天
+            end: 结束日期（YYYY-MM-DD，含），默认今天
+            user_limit: 返回的责任人数上限，默认 ANALYTICS_TOP_USERS
+
+        Returns:
+            {'start', 'end', 'daily', 'totals', 'users', 'latency'}
+
+        Raises:
+            ValidationError: 日期格式错误、起始晚于结束或范围超过 ANALYTICS_MAX_DAYS 天
+        """
+        end_day = AnalyticsService._parse_day(end, 'end') or timezone.now().date()
+        start_day = AnalyticsService._parse_day(start, 'start') or end_day - timedelta(days=app_config.ANALYTICS_DEFAULT_DAYS - 1)
+        if start_day > end_day:
+            raise ValidationError('start 不能晚于 end')
+        days = (end_day - start_day).days + 1
+        if days > app_config.ANALYTICS_MAX_DAYS:
+            raise ValidationError(f'日期范围不能超过 {app_config.ANALYTICS_MAX_DAYS} 天')
+        user_limit = max(1, min(user_limit or app_config.ANALYTICS_TOP_USERS, 100))
+
+        stats = ContentDailyStat.objects.filter(day__range=(start_day, end_day)).order_by()
+
+        # 每日各状态流转次数
+        daily = {start_day + timedelta(days=i): dict.fromkeys(REPORT_STATUSES, 0) for i in range(days)}
+        for row in stats.values('day', 'status').annotate(total=Sum('count')):
+            daily[row['day']][row['status']] = row['total']
+        totals = Counter()
+        for counts in daily.values():
+            totals.update(counts)
+
+        # 各责任人的流转次数
+        per_user = defaultdict(Counter)
+        for row in stats.exclude(user_id=0).values('user_id', 'status').annotate(total=Sum('count')):
+            per_user[row['user_id']][row['status']] = row['total']
+        top_users = sorted(per_user.items(), key=lambda item: (-sum(item[1].values()), item[0]))[:user_limit]
+        usernames = dict(User_info.objects.filter(id__in=[user_id for user_id, _ in top_users]).values_list('id', 'username'))
+
+        return {
+            'start': start_day.isoformat(),
+            'end': end_day.isoformat(),
+            'daily': [{'date': day.isoformat(), **counts} for day, counts in daily.items()],
+            'totals': {status: totals[status] for status in REPORT_STATUSES},
+            'users': [
+                {
+                    'user_id': user_id,
+                    'username': usernames.get(user_id),
+                    'total': sum(counts.values()),
+                    **{status: counts[status] for status in REPORT_STATUSES},
+                }
+                for user_id, counts in top_users
+            ],
+            'latency': AnalyticsService._latency_report(start_day, end_day),
+        }
+
+    @staticmethod
+    def _latency_report(start_day: date, end_day: date) -> Dict[str, Any]:
+        """各耗时类型的整体分位数、平均值、分桶计数和每日分位数"""
+        bucket_count = len(LATENCY_BUCKET_BOUNDS) + 1
+        overall = {metric: [0] * bucket_count for metric in METRICS}
+        seconds = dict.fromkeys(METRICS, 0)
+        daily = {metric: defaultdict(lambda: [0] * bucket_count) for metric in METRICS}
+
+        rows = ContentDailyLatency.objects.filter(
+            day__range=(start_day, end_day), metric__in=METRICS
+        ).order_by().values('metric', 'day', 'bucket').annotate(total=Sum('count'), total_seconds=Sum('total_seconds'))
+        for row in rows:
+            if not 0 <= row['bucket'] < bucket_count:
+                continue
+            overall[row['metric']][row['bucket']] += row['total']
+            daily[row['metric']][row['day']][row['bucket']] += row['total']
+            seconds[row['metric']] += row['total_seconds']
+
+        report = {}
+        for metric in METRICS:
+            count = sum(overall[metric])
+            report[metric] = {
+                'count': count,
+                'mean_seconds': round(seconds[metric] / count) if count else None,
+                **histogram_percentiles(overall[metric]),
+                'buckets': [
+                    {'le_seconds': LATENCY_BUCKET_BOUNDS[i] if i < len(LATENCY_BUCKET_BOUNDS) else None, 'count': n}
+                    for i, n in enumerate(overall[metric])
+                ],
+                'daily': [
+                    {'date': day.isoformat(), 'count': sum(counts), **histogram_percentiles(counts)}
+                    for day, counts in sorted(daily[metric].items())
+                ],
+            }
+        return report
+
+    @staticmethod
+    def backfill(since: Optional[date] = None, batch_size: int = 2000, dry_run: bool = False) -> Dict[str, int]:
+        """
+        根据变更日志和内容表重建汇总表（since 之前的汇总行保持不变）
+
+        - 变更日志按 (content_id, id) 顺序流式读取，逐条内容配对"进入待审核→审核完成"计算审核耗时
+        - 变更日志出现之前的内容：按 created_at 记新建，已发布内容按 publish_at 记发布
+        - 发布耗时取已发布内容的 publish_at - created_at
+        - 先在内存中汇总，再在一个事务中删除旧行并批量写入
+
+        Args:
+            since: 从该日期开始重建，默认全部
+            batch_size: 流式读取和批量写入的批大小
+            dry_run: 只汇总不写入
+
+        Returns:
+            {'logs', 'contents', 'stat_rows', 'latency_rows'}
+        """
+        transitions = Counter()
+        latencies = defaultdict(lambda: [0, 0])
+
+        def in_range(moment: Optional[datetime]) -> bool:
+            return moment is not None and (since is None or moment.date() >= since)
+
+        def add_latency(day: date, metric: str, elapsed: timedelta) -> None:
+            elapsed_seconds = max(0, int(elapsed.total_seconds()))
+            entry = latencies[(day, metric, latency_bucket(elapsed_seconds))]
+            entry[0] += 1
+            entry[1] += elapsed_seconds
+
+        content_users = {
+            row[0]: row[1:]
+            for row in Content.objects.values_list('id', 'creator_id', 'describer_id', 'reviewer_id').iterator(chunk_size=batch_size)
+        }
+
+        logged_created = set()
+        logged_published = set()
+        current_id = None
+        pending_since = None
+        log_count = 0
+        logs = ContentChangeLog.objects.filter(
+            action__in=[ContentChangeLog.ACTION_CREATE, ContentChangeLog.ACTION_STATUS]
+        ).order_by('content_id', 'id').values_list(
+            'content_id', 'action', 'old_status', 'new_status', 'operator_id', 'created_at'
+        )
+        for content_id, action, old_status, new_status, operator_id, created_at in logs.iterator(chunk_size=batch_size):
+            log_count += 1
+            if content_id != current_id:
+                current_id, pending_since = content_id, None
+            users = content_users.get(content_id)
+
+            def user_for(status: str) -> int:
+                # 内容已删除时取变更日志中的操作者
+                return responsible_user(status, *users) if users else operator_id or 0
+
+            if action == ContentChangeLog.ACTION_CREATE:
+                logged_created.add(content_id)
+                if in_range(created_at):
+                    transitions[(created_at.date(), ContentDailyStat.STATUS_CREATED, user_for(ContentDailyStat.STATUS_CREATED))] += 1
+                changed = new_status != CONTENT_STATUS_DRAFT
+            else:
+                changed = new_status != old_status
+            if changed and new_status and in_range(created_at):
+                transitions[(created_at.date(), new_status, user_for(new_status))] += 1
+
+            if new_status == CONTENT_STATUS_PUBLISHED:
+                logged_published.add(content_id)
+            if new_status == CONTENT_STATUS_PENDING:
+                pending_since = created_at
+            elif new_status in REVIEW_DONE_STATUSES and old_status == CONTENT_STATUS_PENDING and pending_since:
+                if in_range(created_at):
+                    add_latency(created_at.date(), ContentDailyLatency.METRIC_REVIEW, created_at - pending_since)
+                pending_since = None
+
+        content_count = 0
+        contents = Content.objects.values_list(
+            'id', 'status', 'creator_id', 'describer_id', 'reviewer_id', 'created_at', 'publish_at'
+        )
+        for content_id, status, creator_id, describer_id, reviewer_id, created_at, publish_at in contents.iterator(chunk_size=batch_size):
+            content_count += 1
+            if content_id not in logged_created and in_range(created_at):
+                transitions[(created_at.date(), ContentDailyStat.STATUS_CREATED, creator_id or 0)] += 1
+            if status != CONTENT_STATUS_PUBLISHED or not in_range(publish_at):
+                continue
+            if content_id not in logged_published:
+                transitions[(publish_at.date(), CONTENT_STATUS_PUBLISHED, reviewer_id or 0)] += 1
+            if created_at:
+                add_latency(publish_at.date(), ContentDailyLatency.METRIC_PUBLISH, publish_at - created_at)
+
+        stat_rows = [
+            ContentDailyStat(day=day, status=status, user_id=user_id, count=count)
+            for (day, status, user_id), count in transitions.items()
+        ]
+        latency_rows = [
+            ContentDailyLatency(day=day, metric=metric, bucket=bucket, count=count, total_seconds=total)
+            for (day, metric, bucket), (count, total) in latencies.items()
+        ]
+
+        if not dry_run:
+            with BaseService.transaction():
+                stale_stats = ContentDailyStat.objects.all()
+                stale_latencies = ContentDailyLatency.objects.all()
+                if since is not None:
+                    stale_stats = stale_stats.filter(day__gte=since)
+                    stale_latencies = stale_latencies.filter(day__gte=since)
+                stale_stats.delete()
+                stale_latencies.delete()
+                ContentDailyStat.objects.bulk_create(stat_rows, batch_size=batch_size)
+                ContentDailyLatency.objects.bulk_create(latency_rows, batch_size=batch_size)
+
+        stats = {
+            'logs': log_count,
+            'contents': content_count,
+            'stat_rows': len(stat_rows),
+            'latency_rows': len(latency_rows),
+        }
+        logger.info(f"回填发布审核统计, since={since}, dry_run={dry_run}, stats={stats}")
+        return stats
@@ -55,6 +55,10 @@ class AuthService(BaseService):
         user.last_login = timezone.now()
         user.save(update_fields=['last_login'])
 
+        # 登录会写入新会话，顺便按间隔在后台清理过期会话
+        from api.services.session_service import SessionService
+        SessionService.schedule_purge()
+
         return user
 
     @staticmethod
@@ -0,0 +1,301 @@
+"""
+图片存储服务
+内容寻址的图片存储：按摘要去重、维护引用计数、清理引用已释放的图片
+
+回收规则：只有曾被 Content.image_list 引用、之后引用计数降为 0（记录 released_at）且超过保留期的图片
+才会被删除。上传接口返回的 URL 可能被写入正文等不计引用的位置，从未被引用过的图片一律保留；
+再次上传或按摘要引用同一图片会清除 released_at。
+"""
+
+import glob
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from django_models.models import Content, ImageBlob, UploadFile
+from api.core.exceptions import ValidationError
+from api.config.app_config import app_config
+from api.services.base_service import BaseService
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# 从图片路径/URL 中提取摘要：.../<64位十六进制摘要>.<扩展名>
+DIGEST_PATH_REGEX = re.compile(r'(?:^|/)([0-9a-f]{64})\.[A-Za-z0-9]+$')
+DIGEST_REGEX = re.compile(r'^[0-9a-f]{64}$')
+
+
+class BlobService(BaseService):
+    """图片存储服务类"""
+
+    @staticmethod
+    def digest_from_path(path: str) -> Optional[str]:
+        """
+        从图片路径或 URL 中提取摘要
+
+        Args:
+            path: 如 uploads/3f/<摘要>.png 或 /static/uploads/3f/<摘要>.png
+
+        Returns:
+            摘要；旧格式路径（时间戳/原文件名命名）返回 None
+        """
+        if not path:
+            return None
+        match = DIGEST_PATH_REGEX.search(str(path).replace('\\', '/'))
+        return match.group(1) if match else None
+
+    @staticmethod
+    def digests_from_image_list(image_list: Optional[str]) -> Counter:
+        """
+        统计 image_list（JSON 数组字符串）中各摘要出现的次数
+
+        Args:
+            image_list: Content.image_list 字段值
+
+        Returns:
+            Counter({摘要: 次数})
+        """
+        if not image_list or image_list == '[]':
+            return Counter()
+        try:
+            paths = json.loads(image_list)
+        except (json.JSONDecodeError, TypeError):
+            return Counter()
+        if not isinstance(paths, list):
+            return Counter()
+
+        digests = (BlobService.digest_from_path(path) for path in paths if isinstance(path, str))
+        return Counter(digest for digest in digests if digest)
+
+    @staticmethod
+    def register(digest: str, path: str, size: int) -> ImageBlob:
+        """
+        登记上传的图片（已存在则刷新 updated_at 并清除 released_at，不再被回收）
+
+        在事务中锁定记录后确认文件仍然存在：与回收并发时，回收在持有行锁期间删除文件，
+        登记会等待回收提交后再检查，不会返回已被删除的文件。
+
+        Args:
+            digest: 内容摘要
+            path: 存储路径（相对 static 目录）
+            size: 文件大小
+
+        Returns:
+            图片存储记录（已存在时 path 为首次保存的路径）
+
+        Raises:
+            ValidationError: 文件已被回收（需重新上传）
+        """
+        with transaction.atomic():
+            blob = ImageBlob.objects.select_for_update().filter(digest=digest).first()
+            created = blob is None
+            if created:
+                blob, created = ImageBlob.objects.get_or_create(
+                    digest=digest,
+                    defaults={'path': path, 'size': size},
+                )
+
+            if not os.path.exists(BlobService.absolute_path(blob)):
+                if blob.path == path or not os.path.exists(BlobService.absolute_path(ImageBlob(path=path))):
+                    logger.warning(f"登记图片失败: 文件已被回收, digest={digest}, path={blob.path}")
+                    raise ValidationError('图片已被清理，请重新上传')
+                # 原路径的文件已丢失，改用本次保存的文件
+                blob.path = path
+
+            if not created:
+                ImageBlob.objects.filter(id=blob.id).update(path=blob.path, updated_at=datetime.now(), released_at=None)
+        logger.debug(f"登记图片, digest={digest}, path={blob.path}, created={created}")
+        return blob
+
+    @staticmethod
+    def lookup(digests: Iterable[str]) -> Dict[str, ImageBlob]:
+        """
+        按摘要批量查找已存储的图片（文件确实存在才返回）
+
+        Args:
+            digests: 摘要列表
+
+        Returns:
+            {摘要: 图片存储记录}
+        """
+        digests = {d.lower() for d in digests if d and DIGEST_REGEX.match(d.lower())}
+        if not digests:
+            return {}
+        blobs = ImageBlob.objects.filter(digest__in=digests)
+        return {
+            blob.digest: blob
+            for blob in blobs
+            if os.path.exists(BlobService.absolute_path(blob))
+        }
+
+    @staticmethod
+    def absolute_path(blob: ImageBlob) -> str:
+        """图片文件绝对路径"""
+        # blob.path 形如 uploads/3f/<摘要>.png，UPLOAD_ROOT 对应 static/uploads
+        relative = blob.path.split('/', 1)[1] if '/' in blob.path else blob.path
+        return os.path.join(settings.UPLOAD_ROOT, *relative.split('/'))
+
+    @staticmethod
+    def adjust_refs(delta: Counter) -> None:
+        """
+        按摘要调整引用计数（正数增加，负数减少）
+
+        Args:
+            delta: Counter({摘要: 增量})
+        """
+        # 同一增量的摘要合并为一条 UPDATE
+        by_amount: Dict[int, List[str]] = {}
+        for digest, amount in delta.items():
+            if amount:
+                by_amount.setdefault(amount, []).append(digest)
+
+        for amount, digests in by_amount.items():
+            if amount > 0:
+                # 再次被引用：清除释放时间，之后再次释放时重新计算保留期
+                ImageBlob.objects.filter(digest__in=digests).update(
+                    ref_count=F('ref_count') + amount, released_at=None
+                )
+            else:
+                ImageBlob.objects.filter(digest__in=digests).update(ref_count=F('ref_count') + amount)
+
+        # 引用计数降为 0 的图片开始计算保留期
+        released = [digest for amount, digests in by_amount.items() if amount < 0 for digest in digests]
+        if released:
+            ImageBlob.objects.filter(digest__in=released, ref_count__lte=0, released_at__isnull=True) \
+                .update(released_at=datetime.now())
+
+        if by_amount:
+            logger.debug(f"调整图片引用计数, delta={dict(delta)}")
+
+    @staticmethod
+    def on_image_list_changed(old_image_list: Optional[str], new_image_list: Optional[str]) -> None:
+        """
+        Content.image_list 变化时更新引用计数
+
+        Args:
+            old_image_list: 变化前的值（新建内容为 None）
+            new_image_list: 变化后的值（删除内容为 None）
+        """
+        delta = Counter(BlobService.digests_from_image_list(new_image_list))
+        delta.subtract(BlobService.digests_from_image_list(old_image_list))
+        BlobService.adjust_refs(delta)
+
+    @staticmethod
+    def recount(batch_size: int = 500) -> int:
+        """
+        根据全部 Content.image_list 重新计算引用计数（修复计数漂移）
+
+        Args:
+            batch_size: 每批读取的内容条数
+
+        Returns:
+            引用计数发生变化的图片数
+        """
+        counts = Counter()
+        last_id = 0
+        while True:
+            rows = list(
+                Content.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'image_list')[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            for _, image_list in rows:
+                counts.update(BlobService.digests_from_image_list(image_list))
+
+        changed = 0
+        now = datetime.now()
+        for blob_id, digest, ref_count in ImageBlob.objects.values_list('id', 'digest', 'ref_count').iterator():
+            actual = counts.get(digest, 0)
+            if actual != ref_count:
+                # 计数由正降为 0 才视为引用释放；从未被引用的图片保持不可回收；仍被引用的图片清除释放时间
+                if actual <= 0 < ref_count:
+                    released = {'released_at': now}
+                elif actual > 0:
+                    released = {'released_at': None}
+                else:
+                    released = {}
+                ImageBlob.objects.filter(id=blob_id).update(ref_count=actual, **released)
+                changed += 1
+
+        logger.info(f"重新计算图片引用计数, contents_scanned_until={last_id}, blobs_changed={changed}")
+        return changed
+
+    @staticmethod
+    def remove_files(blob: ImageBlob) -> int:
+        """
+        删除图片文件及其衍生图（缩略图/WebP/打印版）
+
+        Returns:
+            删除的文件数
+        """
+        removed = 0
+        derived = glob.glob(os.path.join(settings.UPLOAD_ROOT, 'derived', blob.digest[:2], f'{blob.digest}_*'))
+        for path in [BlobService.absolute_path(blob)] + derived:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"删除图片文件失败, digest={blob.digest}, path={path}, error={str(e)}")
+        return removed
+
+    @staticmethod
+    def collect_garbage(batch_size: int = 200, grace_seconds: Optional[int] = None, dry_run: bool = False) -> Dict[str, int]:
+        """
+        分批删除引用已释放且超过保留期的图片（数据库记录和文件）
+
+        只回收 released_at 早于保留期的图片（从未被引用的图片不回收）。每批在事务中以
+        SELECT ... FOR UPDATE 锁定并再次确认 ref_count 为 0、released_at 未被清除，
+        在持有行锁期间删除记录和文件：并发的登记（再次上传同一图片）会等待回收提交，
+        再发现文件已不存在并要求重新上传，而不是返回已被删除的文件。
+
+        Args:
+            batch_size: 每批删除条数
+            grace_seconds: 保留期（默认 BLOB_GC_GRACE_SECONDS）
+            dry_run: 只统计不删除
+
+        Returns:
+            {'deleted': 删除记录数, 'files_removed': 删除文件数, 'bytes_freed': 释放字节数}
+        """
+        if grace_seconds is None:
+            grace_seconds = app_config.BLOB_GC_GRACE_SECONDS
+        cutoff = datetime.now() - timedelta(seconds=grace_seconds)
+
+        stats = {'deleted': 0, 'files_removed': 0, 'bytes_freed': 0}
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    ImageBlob.objects.select_for_update()
+                    .filter(id__gt=last_id, ref_count__lte=0, released_at__lt=cutoff)
+                    .order_by('id')[:batch_size]
+                )
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                if not dry_run:
+                    ImageBlob.objects.filter(id__in=[blob.id for blob in batch]).delete()
+                    UploadFile.objects.filter(path__in=[blob.path for blob in batch]).delete()
+                    for blob in batch:
+                        stats['files_removed'] += BlobService.remove_files(blob)
+
+            stats['deleted'] += len(batch)
+            stats['bytes_freed'] += sum(blob.size for blob in batch)
+
+        logger.info(
+            f"图片回收完成, dry_run={dry_run}, deleted={stats['deleted']}, "
+            f"files_removed={stats['files_removed']}, bytes_freed={stats['bytes_freed']}"
+        )
+        return stats
@@ -0,0 +1,195 @@
+"""
+变更订阅服务
+记录内容变更日志，并基于单调游标提供增量变更查询（前端增量同步）
+
+游标为自增主键，但并发事务的提交顺序与主键分配顺序不一致：较小的 ID 可能在较大的 ID 之后才提交。
+若直接返回 id > since 的全部日志，客户端的游标可能越过尚未提交的日志，之后再也读不到它。
+因此只返回写入时间早于安全窗口（CHANGE_FEED_SAFETY_SECONDS）的日志，游标也不越过窗口内的第一条：
+只要写入日志的事务在窗口内提交，就不会被漏掉；代价是变更最多延迟一个窗口才可见。
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from django_models.models import User_info, Content, ContentChangeLog
+from api.config.app_config import app_config
+from api.config.constants import ALLOWED_CONTENT_STATUSES
+from api.services.base_service import BaseService
+from api.services.event_service import EventService
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class ChangeFeedService(BaseService):
+    """变更订阅服务类"""
+
+    DEFAULT_LIMIT = 200
+    MAX_LIMIT = 1000
+
+    @staticmethod
+    def record(
+        content_id: int,
+        action: str,
+        operator: Optional[User_info] = None,
+        old_status: Optional[str] = None,
+        new_status: Optional[str] = None,
+    ) -> ContentChangeLog:
+        """
+        写入一条变更日志
+
+        应与内容写操作处于同一事务中，保证"内容已变更"与"日志可见"同时成立。
+
+        Args:
+            content_id: 内容ID
+            action: 变更类型（create/update/status/delete）
+            operator: 操作者用户对象
+            old_status: 变更前状态
+            new_status: 变更后状态
+
+        Returns:
+            变更日志对象
+        """
+        entry = ContentChangeLog.objects.create(
+            content_id=content_id,
+            action=action,
+            old_status=old_status,
+            new_status=new_status,
+            operator_id=operator.id if operator else None,
+        )
+        logger.debug(
+            f"记录内容变更, cursor={entry.id}, content_id={content_id}, action={action}, "
+            f"old_status={old_status}, new_status={new_status}"
+        )
+        return entry
+
+    @staticmethod
+    def record_content(
+        content: Content,
+        action: str,
+        operator: Optional[User_info] = None,
+        old_status: Optional[str] = None,
+    ) -> ContentChangeLog:
+        """
+        根据内容对象写入变更日志（new_status 取内容当前状态）
+
+        状态变更会在事务提交后通过事件广播器推送给 SSE 订阅者。
+
+        Args:
+            content: 内容对象
+            action: 变更类型
+            operator: 操作者用户对象
+            old_status: 变更前状态
+
+        Returns:
+            变更日志对象
+        """
+        entry = ChangeFeedService.record(
+            content.id,
+            action,
+            operator=operator,
+            old_status=old_status,
+            new_status=content.status,
+        )
+        if action == ContentChangeLog.ACTION_STATUS:
+            EventService.content_status_changed(content, old_status, operator, change_id=entry.id)
+        return entry
+
+    @staticmethod
+    def _visible_before() -> datetime:
+        """安全窗口的起点：早于该时间写入的日志视为已提交"""
+        return datetime.now() - timedelta(seconds=app_config.CHANGE_FEED_SAFETY_SECONDS)
+
+    @staticmethod
+    def latest_cursor() -> int:
+        """
+        获取当前可安全使用的最新游标
+
+        从最新的日志向前（主键倒序）找到第一条早于安全窗口的日志；窗口内的日志留给下次增量查询，
+        客户端随后拉取的全量中若已包含这些变更，增量中会再出现一次（按 ID 覆盖即可）。
+
+        Returns:
+            变更日志 ID（无日志时为 0）
+        """
+        return ContentChangeLog.objects.filter(created_at__lte=ChangeFeedService._visible_before()) \
+            .order_by('-id').values_list('id', flat=True).first() or 0
+
+    @staticmethod
+    def get_changes(user: User_info, since: Optional[int] = None, limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
+        """
+        获取游标之后的增量变更
+
+        - since 为空时不返回变更，只返回当前最新游标（客户端先拉全量，再用游标拉增量）
+        - 同一内容在本批次内多次变更时只返回最终状态
+        - 对当前用户不可见的内容（已删除，或普通用户看到的 terminated）放入 deleted_ids
+
+        Args:
+            user: 当前用户
+            since: 上次同步得到的游标
+            limit: 本次最多读取的变更日志条数
+
+        Returns:
+            包含 cursor、has_more、contents、deleted_ids、changes 的字典
+        """
+        limit = max(1, min(limit, ChangeFeedService.MAX_LIMIT))
+
+        if since is None:
+            return {
+                'cursor': ChangeFeedService.latest_cursor(),
+                'has_more': False,
+                'contents': [],
+                'deleted_ids': [],
+                'changes': [],
+            }
+
+        # 多取一条用于判断是否还有更多
+        entries = list(ContentChangeLog.objects.filter(id__gt=since).order_by('id')[:limit + 1])
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        # 在第一条位于安全窗口内的日志处截断：其之前可能还有未提交的较小 ID，游标不能越过它
+        visible_before = ChangeFeedService._visible_before()
+        for index, entry in enumerate(entries):
+            if entry.created_at > visible_before:
+                entries = entries[:index]
+                has_more = False
+                break
+        cursor = entries[-1].id if entries else since
+
+        # 同一内容只保留本批次最后一次变更
+        latest = {}
+        for entry in entries:
+            latest[entry.content_id] = entry
+
+        upsert_ids = [cid for cid, entry in latest.items() if entry.action != ContentChangeLog.ACTION_DELETE]
+        contents = Content.objects.filter(id__in=upsert_ids)
+        if not user.has_admin_perm:
+            contents = contents.filter(status__in=ALLOWED_CONTENT_STATUSES)
+        contents = list(contents)
+
+        visible_ids = {content.id for content in contents}
+        deleted_ids = [cid for cid in latest if cid not in visible_ids]
+
+        logger.debug(
+            f"增量变更查询, user={user.username}, since={since}, cursor={cursor}, "
+            f"entries={len(entries)}, upserts={len(contents)}, deletes={len(deleted_ids)}"
+        )
+
+        return {
+            'cursor': cursor,
+            'has_more': has_more,
+            'contents': contents,
+            'deleted_ids': deleted_ids,
+            'changes': [
+                {
+                    'cursor': entry.id,
+                    'content_id': entry.content_id,
+                    'action': entry.action,
+                    'old_status': entry.old_status,
+                    'new_status': entry.new_status,
+                    'created_at': entry.created_at,
+                }
+                for entry in entries
+            ],
+        }
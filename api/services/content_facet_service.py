@@ -0,0 +1,258 @@
+"""
+内容列表筛选与分面计数服务
+
+- 内容列表（/api/contents/）和分面计数（/api/contents/facets/）共用同一套筛选条件和可见性规则
+- 分面计数：每个维度（状态、类型、标签）一条 GROUP BY 查询（标签经 content_tag 关联表分组）；统计某个维度时不应用该维度自身的筛选，
+  下拉框中其他选项的数量仍然可见
+- 结果按"可见性 + 筛选条件"的签名缓存；内容写入时递增缓存代数，旧代数的缓存不再被读取（随 TTL 过期）
+"""
+
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from django_models.models import User_info, Content, Tag, ContentTag
+from api.config.app_config import app_config
+from api.config.constants import ALLOWED_CONTENT_STATUSES, CONTENT_STATUS_CHOICES
+from api.services.base_service import BaseService
+from api.services.tag_service import TagService
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+GENERATION_CACHE_KEY = 'content_facets:generation'
+
+# 影响筛选结果的查询参数（分页、排序参数不影响计数）
+FILTER_PARAMS = (
+    'status', 'type', 'category', 'tag', 'q',
+    'publish_start_date', 'publish_end_date', 'deadline_end_date', 'only_published',
+)
+
+# 分面维度 -> 对应的筛选参数
+FACET_PARAMS = {
+    'status': 'status',
+    'type': 'type',
+    'tag': 'tag',
+}
+
+
+def _split(value: str) -> List[str]:
+    """逗号分隔的多值参数"""
+    return [v.strip() for v in value.split(',')]
+
+
+class ContentFacetService(BaseService):
+    """内容列表筛选与分面计数服务类"""
+
+    @staticmethod
+    def visible_contents(user: User_info):
+        """
+        当前用户可见的内容
+
+        - 管理员：可以看到所有状态（包括 terminated）
+        - 普通用户：只能看到活跃状态（排除 terminated）
+        """
+        if user.has_admin_perm:
+            return Content.objects.all()
+        return Content.objects.filter(status__in=ALLOWED_CONTENT_STATUSES)
+
+    @staticmethod
+    def apply_filters(queryset, params: Mapping[str, str], exclude: Iterable[str] = ()):
+        """
+        应用内容列表的筛选参数
+
+        Args:
+            queryset: 内容查询集
+            params: 查询参数（request.query_params）
+            exclude: 不应用的参数（分面计数时排除当前维度）
+
+        Returns:
+            筛选后的查询集
+        """
+        exclude = set(exclude)
+
+        def get(name: str, default: str = '') -> str:
+            return '' if name in exclude else (params.get(name) or default)
+
+        # 状态过滤（支持多值）: ?status=draft,pending
+        status_param = get('status')
+        if status_param:
+            queryset = queryset.filter(status__in=_split(status_param))
+
+        # 类型过滤（支持多值）: ?type=教务,竞赛
+        type_param = get('type')
+        if type_param:
+            queryset = queryset.filter(type__in=_split(type_param))
+
+        # 导出分类过滤（支持多值）: ?category=college,club
+        category_param = get('category')
+        if category_param:
+            queryset = queryset.filter(category__in=_split(category_param))
+
+        # 标签过滤（支持多值，精确匹配，经 content_tag 索引）: ?tag=讲座,院级活动
+        tag_param = get('tag')
+        if tag_param:
+            queryset = queryset.filter(id__in=TagService.content_ids_with_tags(_split(tag_param)))
+
+        # 搜索
+        query = get('q')
+        if query:
+            queryset = queryset.filter(title__icontains=query)
+
+        # 发布日期范围过滤
+        publish_start_date = get('publish_start_date')
+        publish_end_date = get('publish_end_date')
+        if publish_start_date and publish_end_date:
+            try:
+                start = datetime.strptime(publish_start_date, '%Y-%m-%d')
+                end = datetime.strptime(publish_end_date, '%Y-%m-%d')
+                start_of_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+                end_of_day = end.replace(hour=23, minute=59, second=59, microsecond=999999)
+                queryset = queryset.filter(
+                    publish_at__gte=start_of_day,
+                    publish_at__lte=end_of_day
+                )
+            except ValueError:
+                logger.warning(f"无效的发布日期格式: start={publish_start_date}, end={publish_end_date}")
+
+        # 截止日期过滤（DDL 查询）
+        deadline_end_date = get('deadline_end_date')
+        if deadline_end_date:
+            try:
+                end_of_day = datetime.strptime(deadline_end_date, '%Y-%m-%d')
+                end_of_day = end_of_day.replace(hour=23, minute=59, second=59, microsecond=999999)
+                queryset = queryset.filter(deadline__gt=end_of_day)
+            except ValueError:
+                logger.warning(f"无效的截止日期格式: {deadline_end_date}")
+
+        # 只返回已发布内容
+        if get('only_published', 'false').lower() == 'true':
+            queryset = queryset.filter(status='published')
+
+        return queryset
+
+    @staticmethod
+    def _generation() -> int:
+        generation = cache.get(GENERATION_CACHE_KEY)
+        if generation is None:
+            # 以当前时间为初值：代数键被淘汰后重建时不会与仍在缓存中的旧代数重复
+            generation = int(time.time() * 1000)
+            cache.add(GENERATION_CACHE_KEY, generation, None)
+            generation = cache.get(GENERATION_CACHE_KEY, generation)
+        return generation
+
+    @staticmethod
+    def cache_key(user: User_info, params: Mapping[str, str], generation: int) -> str:
+        """按可见性和筛选参数生成缓存键（参数顺序、空参数不影响）"""
+        signature = {name: params.get(name) for name in FILTER_PARAMS if params.get(name)}
+        digest = hashlib.sha1(
+            json.dumps(signature, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+        scope = 'admin' if user.has_admin_perm else 'user'
+        return f'content_facets:{generation}:{scope}:{digest}'
+
+    @staticmethod
+    def get_facets(user: User_info, params: Mapping[str, str]) -> Dict[str, Any]:
+        """
+        获取当前筛选条件下各状态、类型、标签的内容数（优先读取缓存）
+
+        Args:
+            user: 当前用户
+            params: 内容列表的查询参数
+
+        Returns:
+            {'total', 'facets': {'status': {...}, 'type': {...}, 'tag': [...]}}
+        """
+        try:
+            key = ContentFacetService.cache_key(user, params, ContentFacetService._generation())
+            result = cache.get(key)
+        except Exception as e:
+            logger.warning(f"读取分面计数缓存失败, error={str(e)}")
+            key, result = None, None
+        if result is not None:
+            return result
+
+        result = ContentFacetService.compute_facets(user, params)
+        if key:
+            try:
+                cache.set(key, result, app_config.CONTENT_FACETS_CACHE_SECONDS)
+            except Exception as e:
+                logger.warning(f"写入分面计数缓存失败, error={str(e)}")
+        return result
+
+    @staticmethod
+    def compute_facets(user: User_info, params: Mapping[str, str]) -> Dict[str, Any]:
+        """
+        计算分面计数（每个维度一条分组查询，不使用缓存）
+
+        Args:
+            user: 当前用户
+            params: 内容列表的查询参数
+
+        Returns:
+            同 get_facets
+        """
+        visible = ContentFacetService.visible_contents(user)
+
+        def grouped(column: str) -> Dict[str, int]:
+            exclude = [FACET_PARAMS[column]] if FACET_PARAMS.get(column) else []
+            rows = ContentFacetService.apply_filters(visible, params, exclude=exclude) \
+                .order_by().values(column).annotate(count=Count('id')).values_list(column, 'count')
+            return dict(rows)
+
+        # 状态：列出当前用户可见的所有状态（没有内容的为 0）
+        visible_statuses = [s for s, _ in CONTENT_STATUS_CHOICES if user.has_admin_perm or s in ALLOWED_CONTENT_STATUSES]
+        status_counts = {**dict.fromkeys(visible_statuses, 0), **grouped('status')}
+
+        type_counts = grouped('type')
+
+        # 标签：content_tag 按 tag_id 分组（限定为筛选结果的内容），再一次查出标签名
+        filtered_ids = ContentFacetService.apply_filters(visible, params, exclude=[FACET_PARAMS['tag']]) \
+            .order_by().values('id')
+        tag_id_counts = dict(
+            ContentTag.objects.filter(content_id__in=filtered_ids)
+            .order_by().values('tag_id').annotate(count=Count('id')).values_list('tag_id', 'count')
+        )
+        tag_names = dict(Tag.objects.filter(id__in=list(tag_id_counts)).values_list('id', 'name'))
+        tag_counts = {tag_names[tag_id]: count for tag_id, count in tag_id_counts.items() if tag_id in tag_names}
+
+        # 总数：状态分面未应用状态筛选，按所选状态求和即为当前筛选结果数
+        status_param = params.get('status')
+        if status_param:
+            total = sum(status_counts.get(s, 0) for s in set(_split(status_param)))
+        else:
+            total = sum(status_counts.values())
+
+        return {
+            'total': total,
+            'facets': {
+                'status': status_counts,
+                'type': dict(sorted(type_counts.items(), key=lambda item: (-item[1], item[0]))),
+                'tag': [
+                    {'tag': tag, 'count': count}
+                    for tag, count in sorted(tag_counts.items(), key=lambda item: (-item[1], item[0]))
+                    [:app_config.CONTENT_FACETS_MAX_TAGS]
+                ],
+            },
+        }
+
+    @staticmethod
+    def invalidate() -> None:
+        """内容写入后递增缓存代数（在事务中调用时，提交后再递增）"""
+        def bump():
+            try:
+                cache.incr(GENERATION_CACHE_KEY)
+            except ValueError:
+                # 代数键不存在：下次读取时重新初始化
+                pass
+            except Exception as e:
+                logger.error(f"递增分面计数缓存代数失败, error={str(e)}")
+
+        transaction.on_commit(bump)
@@ -4,15 +4,18 @@
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from django.db import transaction
 from django.db.models import Q
-from django_models.models import User_info, Content
-from api.core.exceptions import ValidationError, PermissionDeniedError, NotFoundError, BusinessLogicError
-from api.config.constants import CONTENT_STATUS_PUBLISHED
+from django_models.models import User_info, Content, ContentChangeLog
+from api.core.exceptions import ValidationError, PermissionDeniedError, NotFoundError, BusinessLogicError, ConflictError
+from api.config.constants import CONTENT_STATUS_PUBLISHED, CONTENT_STATUS_TERMINATED
 from api.config.app_config import app_config
 from api.services.base_service import BaseService
+from api.services.change_feed_service import ChangeFeedService
+from api.services.review_queue_service import ReviewQueueService
 from api.logging import get_logger
+from common.methods.canonical_url import link_hash
 import json
 
 
@@ -23,16 +26,18 @@ class ContentService(BaseService):
     """内容服务类"""
 
     @staticmethod
-    def create_content(creator: User_info, data: Dict[str, Any]) -> Content:
+    def create_content(creator: User_info, data: Dict[str, Any]) -> Tuple[Content, bool]:
         """
         创建内容
 
+        规范化链接相同的内容已存在时直接返回已有内容，不重复创建。
+
         Args:
             creator: 创建者用户对象
             data: 内容数据
 
         Returns:
-            新创建的内容对象
+            (内容对象, 是否新创建)
 
         Raises:
             ValidationError: 参数验证失败
@@ -70,6 +75,13 @@ class ContentService(BaseService):
                 )
                 raise ValidationError(f'无效的内容类型，必须是: {", ".join(CONTENT_TYPES)}')
 
+            # 链接去重（走 link_hash 索引）
+            if link:
+                existing = ContentService.find_by_link(link)
+                if existing is not None:
+                    logger.info(f"链接已存在，不重复创建, {user_info}, link={link}, content_id={existing.id}")
+                    return existing, False
+
             # 创建内容
             with BaseService.transaction():
                 content_obj = Content.objects.create(
@@ -85,13 +97,14 @@ class ContentService(BaseService):
                     status='draft',
                     image_list='[]',
                 )
+                ChangeFeedService.record_content(content_obj, ContentChangeLog.ACTION_CREATE, creator)
 
             # 记录成功日志
             logger.info(
                 f"内容创建成功, {user_info}, content_id={content_obj.id}, "
                 f"title={title}, type={type_}, status={content_obj.status}"
             )
-            return content_obj
+            return content_obj, True
 
         except ValidationError as e:
             # 验证错误已在上面处理，这里记录警告
@@ -158,10 +171,18 @@ class ContentService(BaseService):
                     else:
                         setattr(content, field, data[field])
 
-            content.save()
+            # 只写入实际变化的字段；没有变化时不写库、不刷新 updated_at、不记录变更
+            dirty_fields = content.get_dirty_fields()
+            if not dirty_fields:
+                logger.info(f"内容更新跳过: 无变化, {user_info}, {content_info}")
+                return content
+
+            with BaseService.transaction():
+                content.save()
+                ChangeFeedService.record_content(content, ContentChangeLog.ACTION_UPDATE, user)
 
             # 记录成功日志
-            logger.info(f"内容更新成功, {user_info}, {content_info}, updated_fields={update_fields}")
+            logger.info(f"内容更新成功, {user_info}, {content_info}, updated_fields={dirty_fields}")
             return content
 
         except (PermissionDeniedError, BusinessLogicError) as e:
@@ -209,9 +230,12 @@ class ContentService(BaseService):
                 raise BusinessLogicError(f'当前状态({content.status})不允许提交描述')
 
             # 更新为待审核状态
+            old_status = content.status
             content.describer_id = describer.id
             content.status = 'pending'
-            content.save()
+            with BaseService.transaction():
+                content.save()
+                ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, describer, old_status)
 
             # 记录成功日志
             logger.info(
@@ -282,7 +306,9 @@ class ContentService(BaseService):
             # 更新为待审核状态（不修改 describer_id）
             old_status = content.status
             content.status = 'pending'
-            content.save()
+            with BaseService.transaction():
+                content.save()
+                ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, submitter, old_status)
 
             # 记录成功日志
             logger.info(
@@ -322,6 +348,7 @@ class ContentService(BaseService):
             NotFoundError: 内容不存在
             PermissionDeniedError: 无权限审核
             BusinessLogicError: 状态不允许审核或不能审核自己的内容
+            ConflictError: 内容已被其他审核者从审核队列领取
         """
         # 记录入口日志
         user_info = f"user={reviewer.username}, user_id={reviewer.id}"
@@ -356,12 +383,24 @@ class ContentService(BaseService):
                 )
                 raise BusinessLogicError(f'当前状态({content.status})不允许审核')
 
-            # 更新状态
+            # 领取检查：被其他审核者领取的内容不能审核
+            if ReviewQueueService.is_claimed_by_other(content, reviewer):
+                logger.warning(
+                    f"内容审核失败: 已被他人领取, {user_info}, content_id={content_id}, "
+                    f"locker_id={content.locker_id}"
+                )
+                raise ConflictError('该内容已被其他审核者领取，请从审核队列领取其他内容')
+
+            # 更新状态（审核完成即释放领取）
             old_status = content.status
             content.reviewer_id = reviewer.id
             new_status = 'reviewed' if approved else 'rejected'
             content.status = new_status
-            content.save()
+            content.locker_id = None
+            content.locked_at = None
+            with BaseService.transaction():
+                content.save()
+                ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, reviewer, old_status)
 
             # 记录成功日志
             logger.info(
@@ -370,7 +409,7 @@ class ContentService(BaseService):
             )
             return content
 
-        except (PermissionDeniedError, NotFoundError, BusinessLogicError) as e:
+        except (PermissionDeniedError, NotFoundError, BusinessLogicError, ConflictError) as e:
             # 业务逻辑错误已在上面处理
             raise
         except Exception as e:
@@ -427,7 +466,9 @@ class ContentService(BaseService):
             old_status = content.status
             content.status = 'draft'
             content.reviewer_id = None
-            content.save()
+            with BaseService.transaction():
+                content.save()
+                ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, user, old_status)
 
             # 记录成功日志
             logger.info(
@@ -492,7 +533,9 @@ class ContentService(BaseService):
             # 取消（终止）内容
             old_status = content.status
             content.status = 'terminated'
-            content.save()
+            with BaseService.transaction():
+                content.save()
+                ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, user, old_status)
 
             # 记录成功日志
             logger.info(
@@ -548,7 +591,11 @@ class ContentService(BaseService):
             content_title = content.title
             content_status = content.status
 
-            content.delete()
+            with BaseService.transaction():
+                content.delete()
+                ChangeFeedService.record(
+                    content_id, ContentChangeLog.ACTION_DELETE, operator=user, old_status=content_status
+                )
 
             # 记录成功日志
             logger.info(
@@ -631,6 +678,42 @@ class ContentService(BaseService):
             )
             raise
 
+    @staticmethod
+    def find_by_links(links: Iterable[str]) -> Dict[str, Content]:
+        """
+        按规范化链接批量查找已有内容（走 link_hash 索引，已终止的内容不算重复）
+
+        Args:
+            links: 链接列表
+
+        Returns:
+            {链接去重键: 最早创建的内容}
+        """
+        hashes = {link_hash(link) for link in links} - {''}
+        if not hashes:
+            return {}
+
+        found = {}
+        contents = Content.objects.filter(link_hash__in=hashes).exclude(
+            status=CONTENT_STATUS_TERMINATED
+        ).order_by('id')
+        for content in contents:
+            found.setdefault(content.link_hash, content)
+        return found
+
+    @staticmethod
+    def find_by_link(link: str) -> Optional[Content]:
+        """
+        按规范化链接查找已有内容
+
+        Args:
+            link: 链接
+
+        Returns:
+            最早创建的同链接内容；不存在时返回 None
+        """
+        return ContentService.find_by_links([link]).get(link_hash(link))
+
     @staticmethod
     def _process_tag(tag_input):
         """
@@ -706,7 +789,9 @@ class ContentService(BaseService):
 
         # 更新状态
         content.status = new_status
-        content.save()
+        with BaseService.transaction():
+            content.save()
+            ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, admin, old_status)
 
         # 审计日志
         logger.info(
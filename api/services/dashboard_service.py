@@ -0,0 +1,144 @@
+"""
+管理面板统计服务
+
+- 各状态内容数和今日发布数用一条分组聚合查询得到（原先每项一条 COUNT）
+- 结果缓存 DASHBOARD_CACHE_SECONDS 秒，短时间内的重复访问不查询数据库
+- 开启 DASHBOARD_STATUS_COUNTERS 时，各状态内容数改为读取 content_status_count 表，
+  由内容保存/删除信号在同一事务中增减，统计开销与内容表大小无关
+"""
+
+from typing import Any, Dict, Optional
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from django_models.models import User_info, Content, ContentStatusCount
+from api.config.app_config import app_config
+from api.config.constants import CONTENT_STATUS_CHOICES, CONTENT_STATUS_PENDING, CONTENT_STATUS_PUBLISHED
+from api.services.base_service import BaseService
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+SNAPSHOT_CACHE_KEY = 'dashboard:stats'
+
+STATUSES = [status for status, _ in CONTENT_STATUS_CHOICES]
+
+
+class DashboardService(BaseService):
+    """管理面板统计服务类"""
+
+    @staticmethod
+    def get_stats() -> Dict[str, Any]:
+        """
+        获取管理面板统计数据（优先读取缓存的快照）
+
+        Returns:
+            {'total_users', 'total_contents', 'pending_reviews', 'published_today', 'status_counts', 'generated_at'}
+        """
+        try:
+            stats = cache.get(SNAPSHOT_CACHE_KEY)
+        except Exception as e:
+            logger.warning(f"读取管理面板统计缓存失败, error={str(e)}")
+            stats = None
+        if stats is not None:
+            return stats
+
+        stats = DashboardService.compute_stats()
+        try:
+            cache.set(SNAPSHOT_CACHE_KEY, stats, app_config.DASHBOARD_CACHE_SECONDS)
+        except Exception as e:
+            logger.warning(f"写入管理面板统计缓存失败, error={str(e)}")
+        return stats
+
+    @staticmethod
+    def compute_stats() -> Dict[str, Any]:
+        """
+        计算管理面板统计数据（不使用快照缓存）
+
+        Returns:
+            同 get_stats
+        """
+        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if app_config.DASHBOARD_STATUS_COUNTERS:
+            status_counts = DashboardService.read_counters()
+            published_today = Content.objects.filter(
+                status=CONTENT_STATUS_PUBLISHED,
+                publish_at__gte=today_start
+            ).count()
+        else:
+            # 一条 GROUP BY status 查询，条件聚合同时得到今日发布数；order_by() 去掉默认排序，避免排序字段进入分组
+            status_counts = dict.fromkeys(STATUSES, 0)
+            published_today = 0
+            rows = Content.objects.order_by().values('status').annotate(
+                count=Count('id'),
+                today=Count('id', filter=Q(publish_at__gte=today_start)),
+            )
+            for row in rows:
+                status_counts[row['status']] = row['count']
+                if row['status'] == CONTENT_STATUS_PUBLISHED:
+                    published_today = row['today']
+
+        return {
+            'total_users': User_info.objects.count(),
+            'total_contents': sum(status_counts.values()),
+            'pending_reviews': status_counts.get(CONTENT_STATUS_PENDING, 0),
+            'published_today': published_today,
+            'status_counts': status_counts,
+            'generated_at': timezone.now().isoformat(timespec='seconds'),
+        }
+
+    @staticmethod
+    def read_counters() -> Dict[str, int]:
+        """读取状态计数表（为空时先根据内容表重算）"""
+        counts = dict(ContentStatusCount.objects.values_list('status', 'count'))
+        if not counts:
+            counts = DashboardService.rebuild_counters()
+        return {**dict.fromkeys(STATUSES, 0), **counts}
+
+    @staticmethod
+    def rebuild_counters() -> Dict[str, int]:
+        """
+        根据内容表重算状态计数（锁定计数行，与并发的增减互斥）
+
+        Returns:
+            {状态: 内容数}
+        """
+        with BaseService.transaction():
+            list(ContentStatusCount.objects.select_for_update().all())
+            counts = dict(
+                Content.objects.order_by().values('status').annotate(count=Count('id')).values_list('status', 'count')
+            )
+            for status in set(STATUSES) | set(counts):
+                ContentStatusCount.objects.update_or_create(status=status, defaults={'count': counts.get(status, 0)})
+        logger.info(f"重算内容状态计数, counts={counts}")
+        return counts
+
+    @staticmethod
+    def on_status_changed(old_status: Optional[str], new_status: Optional[str], count: int = 1) -> None:
+        """
+        内容状态变化时增减计数（新建时 old_status 为 None，删除时 new_status 为 None）
+
+        Args:
+            old_status: 原状态
+            new_status: 新状态
+            count: 内容条数（批量创建时大于 1）
+        """
+        if not app_config.DASHBOARD_STATUS_COUNTERS or old_status == new_status:
+            return
+        if old_status:
+            ContentStatusCount.objects.filter(status=old_status).update(count=F('count') - count)
+        if new_status:
+            updated = ContentStatusCount.objects.filter(status=new_status).update(count=F('count') + count)
+            if not updated and ContentStatusCount.objects.exists():
+                # 计数表已初始化但缺少该状态的行（计数表为空时由 read_counters 整体重算）
+                try:
+                    with transaction.atomic():
+                        ContentStatusCount.objects.create(status=new_status, count=count)
+                except IntegrityError:
+                    # 并发创建了同一状态的行
+                    ContentStatusCount.objects.filter(status=new_status).update(count=F('count') + count)
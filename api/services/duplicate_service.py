@@ -0,0 +1,230 @@
+"""
+近似重复检测服务
+维护内容的 MinHash 签名和 LSH 段键，按段键索引查找疑似重复的内容
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from django_models.models import Content, ContentFingerprint, ContentLshBand
+from api.config.app_config import app_config
+from api.config.constants import CONTENT_STATUS_TERMINATED
+from api.services.base_service import BaseService
+from api.logging import get_logger
+from common.methods.minhash import band_keys, decode_signature, encode_signature, similarity, text_signature
+
+
+logger = get_logger(__name__)
+
+
+class DuplicateService(BaseService):
+    """近似重复检测服务类"""
+
+    @staticmethod
+    def index_contents(contents: Iterable[Content]) -> int:
+        """
+        批量更新内容的签名和段键（文本过短的内容移除索引）
+
+        Args:
+            contents: 内容对象（需加载 id、title、content）
+
+        Returns:
+            写入签名的内容数
+        """
+        contents = list(contents)
+        if not contents:
+            return 0
+        ids = [content.id for content in contents]
+
+        fingerprints = []
+        bands = []
+        for content in contents:
+            sig = text_signature(content.title, content.content)
+            if sig is None:
+                continue
+            fingerprints.append(ContentFingerprint(content_id=content.id, signature=encode_signature(sig)))
+            bands.extend(ContentLshBand(content_id=content.id, band_key=key) for key in band_keys(sig))
+
+        with BaseService.transaction():
+            ContentLshBand.objects.filter(content_id__in=ids).delete()
+            ContentFingerprint.objects.filter(content_id__in=ids).delete()
+            ContentFingerprint.objects.bulk_create(fingerprints)
+            ContentLshBand.objects.bulk_create(bands)
+
+        logger.debug(f"更新内容指纹, contents={len(ids)}, indexed={len(fingerprints)}")
+        return len(fingerprints)
+
+    @staticmethod
+    def remove(content_id: int) -> None:
+        """删除内容的签名和段键"""
+        ContentLshBand.objects.filter(content_id=content_id).delete()
+        ContentFingerprint.objects.filter(content_id=content_id).delete()
+
+    @staticmethod
+    def _match(signatures: Dict[int, List[int]], exclude_self: bool = True) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        为多个签名查找疑似重复（一次段键查询 + 一次签名查询 + 一次内容查询）
+
+        Args:
+            signatures: {键: 签名}，键为内容ID（或 0 表示尚未保存的文本）
+            exclude_self: 是否排除与键相同的内容ID
+
+        Returns:
+            {键: [{'id', 'title', 'status', 'creator_id', 'similarity'}]}，按相似度降序
+        """
+        key_owner = defaultdict(set)
+        for owner, sig in signatures.items():
+            for key in band_keys(sig):
+                key_owner[key].add(owner)
+        if not key_owner:
+            return {}
+
+        candidates = defaultdict(set)
+        rows = ContentLshBand.objects.filter(band_key__in=list(key_owner)).values_list('band_key', 'content_id')
+        for key, content_id in rows[:app_config.DUPLICATE_MAX_CANDIDATES * len(signatures)]:
+            for owner in key_owner[key]:
+                if not (exclude_self and content_id == owner):
+                    candidates[owner].add(content_id)
+
+        candidate_ids = set().union(*candidates.values()) if candidates else set()
+        stored = {
+            content_id: decode_signature(value)
+            for content_id, value in ContentFingerprint.objects.filter(content_id__in=candidate_ids)
+            .values_list('content_id', 'signature')
+        }
+
+        scores = {}
+        for owner, ids in candidates.items():
+            sig = signatures[owner]
+            matched = [
+                (content_id, similarity(sig, stored[content_id]))
+                for content_id in ids if content_id in stored
+            ]
+            matched = [item for item in matched if item[1] >= app_config.DUPLICATE_MIN_SIMILARITY]
+            matched.sort(key=lambda item: (-item[1], item[0]))
+            scores[owner] = matched
+
+        matched_ids = {content_id for matched in scores.values() for content_id, _ in matched}
+        contents = {
+            content.id: content
+            for content in Content.objects.filter(id__in=matched_ids)
+            .exclude(status=CONTENT_STATUS_TERMINATED)
+            .only('id', 'title', 'status', 'creator_id')
+        }
+
+        result = {}
+        for owner, matched in scores.items():
+            items = [
+                {
+                    'id': content_id,
+                    'title': contents[content_id].title,
+                    'status': contents[content_id].status,
+                    'creator_id': contents[content_id].creator_id,
+                    'similarity': round(score, 2),
+                }
+                for content_id, score in matched if content_id in contents
+            ]
+            result[owner] = items[:app_config.DUPLICATE_MAX_RESULTS]
+        return result
+
+    @staticmethod
+    def find_similar(title: str, content: str, exclude_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        查找与给定文本疑似重复的内容
+
+        Args:
+            title: 标题
+            content: 正文
+            exclude_id: 排除的内容ID（通常为内容自身）
+
+        Returns:
+            [{'id', 'title', 'status', 'creator_id', 'similarity'}]，按相似度降序；文本过短时为空
+        """
+        sig = text_signature(title, content)
+        if sig is None:
+            return []
+        owner = exclude_id or 0
+        return DuplicateService._match({owner: sig}).get(owner, [])
+
+    @staticmethod
+    def find_similar_to(content: Content) -> List[Dict[str, Any]]:
+        """
+        查找与已保存内容疑似重复的其他内容
+
+        Args:
+            content: 内容对象
+
+        Returns:
+            同 find_similar
+        """
+        return DuplicateService.find_similar(content.title, content.content, exclude_id=content.id)
+
+    @staticmethod
+    def likely_duplicates(content: Content) -> List[Dict[str, Any]]:
+        """
+        创建内容后的疑似重复提示（查询失败只记录日志，不影响创建结果）
+
+        Args:
+            content: 新创建的内容对象
+
+        Returns:
+            同 find_similar，失败时为空列表
+        """
+        try:
+            return DuplicateService.find_similar_to(content)
+        except Exception as e:
+            logger.error(f"查找疑似重复内容失败, content_id={content.id}, error={str(e)}", exc_info=True)
+            return []
+
+    @staticmethod
+    def find_similar_for_contents(contents: Iterable[Content]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        批量查找疑似重复（审核队列等列表使用，使用已保存的签名）
+
+        Args:
+            contents: 内容对象列表
+
+        Returns:
+            {内容ID: [...]}，没有疑似重复的内容不在结果中
+        """
+        ids = [content.id for content in contents]
+        signatures = {
+            content_id: decode_signature(value)
+            for content_id, value in ContentFingerprint.objects.filter(content_id__in=ids)
+            .values_list('content_id', 'signature')
+        }
+        if not signatures:
+            return {}
+        return {owner: items for owner, items in DuplicateService._match(signatures).items() if items}
+
+    @staticmethod
+    def rebuild(batch_size: int = 500) -> Dict[str, int]:
+        """
+        按主键分批重建全部内容的签名和段键
+
+        Args:
+            batch_size: 每批处理的内容条数
+
+        Returns:
+            {'scanned': 扫描条数, 'indexed': 写入签名条数}
+        """
+        stats = {'scanned': 0, 'indexed': 0}
+        last_id = 0
+        while True:
+            batch = list(
+                Content.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .only('id', 'title', 'content')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+            stats['scanned'] += len(batch)
+            stats['indexed'] += DuplicateService.index_contents(batch)
+
+        # 已删除内容残留的索引
+        ContentLshBand.objects.filter(content_id__gt=last_id).delete()
+        ContentFingerprint.objects.filter(content_id__gt=last_id).delete()
+
+        logger.info(f"重建近似重复索引完成, scanned={stats['scanned']}, indexed={stats['indexed']}")
+        return stats
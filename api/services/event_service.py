@@ -0,0 +1,335 @@
+"""
+事件推送服务
+进程内事件广播器：服务层发布事件，SSE 连接订阅事件
+
+设计说明：
+- 所有订阅者共享同一个环形缓冲区，新事件到达时通过 Condition 唤醒等待线程，
+  不会为每个订阅者单独查询数据库
+- 事件 ID 形如 "<boot>:<seq>"，boot 为进程启动标识；客户端断线重连时携带
+  Last-Event-ID，若事件已滚出缓冲区或进程已重启，则下发 resync 事件，
+  由客户端通过 /api/contents/changes/ 补齐
+- 每个 SSE 连接占用一个工作线程，每个进程同时保持的连接数不超过 SSE_MAX_SUBSCRIBERS，超出由视图返回 503
+- 广播器是进程内的；为了让其他进程（多进程部署的 Django、Flask 应用）的状态变更也能送达，
+  有订阅者时由 ChangeLogPoller 线程每 SSE_POLL_SECONDS 秒读取一次 content_change_log，
+  把本进程未发布过的状态变更补发到广播器（只有一个线程查询数据库，与订阅者数量无关）
+"""
+
+import itertools
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from django.db import connection, transaction
+
+from django_models.models import Content, ContentChangeLog
+from api.config.app_config import app_config
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# ===== 事件类型 =====
+EVENT_CONTENT_STATUS = 'content.status'
+EVENT_EXPORT_COMPLETED = 'export.completed'
+EVENT_RESYNC = 'resync'
+
+EVENT_TYPES = [EVENT_CONTENT_STATUS, EVENT_EXPORT_COMPLETED]
+
+
+class Event:
+    """单条事件"""
+
+    __slots__ = ('seq', 'type', 'data', 'user_ids', 'created_at')
+
+    def __init__(self, seq: int, event_type: str, data: Dict[str, Any], user_ids: FrozenSet[int] = frozenset()):
+        """
+        Args:
+            seq: 进程内单调递增序号
+            event_type: 事件类型
+            data: 事件数据
+            user_ids: 与事件相关的用户（创建者、操作者），用于 mine=true 过滤
+        """
+        self.seq = seq
+        self.type = event_type
+        self.data = data
+        self.user_ids = user_ids
+        self.created_at = time.time()
+
+
+class EventBroadcaster:
+    """进程内事件广播器"""
+
+    def __init__(self, buffer_size: int = 1000, max_subscribers: int = 10):
+        """
+        Args:
+            buffer_size: 环形缓冲区大小（决定断线重连可回放的事件数）
+            max_subscribers: 同时保持的订阅者（SSE 连接）上限
+        """
+        self.boot_id = uuid.uuid4().hex[:8]
+        self.max_subscribers = max_subscribers
+        self._condition = threading.Condition()
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._subscribers = 0
+        self._subscribers_lock = threading.Lock()
+
+    def subscribe(self) -> bool:
+        """登记一个订阅者，已达上限时返回 False"""
+        with self._subscribers_lock:
+            if self._subscribers >= self.max_subscribers:
+                return False
+            self._subscribers += 1
+            return True
+
+    def unsubscribe(self) -> None:
+        """注销订阅者"""
+        with self._subscribers_lock:
+            self._subscribers = max(0, self._subscribers - 1)
+
+    @property
+    def subscriber_count(self) -> int:
+        """当前订阅者数量"""
+        return self._subscribers
+
+    def format_id(self, seq: int) -> str:
+        """生成对外的事件 ID"""
+        return f'{self.boot_id}:{seq}'
+
+    def parse_id(self, event_id: Optional[str]) -> Optional[int]:
+        """
+        解析客户端的 Last-Event-ID
+
+        Returns:
+            本进程内的序号；ID 为空返回 None；ID 属于其他进程/已重启返回 -1
+        """
+        if not event_id:
+            return None
+        boot, _, seq = event_id.partition(':')
+        if boot != self.boot_id or not seq.isdigit():
+            return -1
+        return int(seq)
+
+    def publish(self, event_type: str, data: Dict[str, Any], user_ids=()) -> Event:
+        """
+        发布事件并唤醒所有等待中的订阅者
+
+        Args:
+            event_type: 事件类型
+            data: 事件数据（需可 JSON 序列化）
+            user_ids: 与事件相关的用户 ID
+
+        Returns:
+            事件对象
+        """
+        with self._condition:
+            event = Event(
+                seq=next(self._seq),
+                event_type=event_type,
+                data=data,
+                user_ids=frozenset(uid for uid in user_ids if uid is not None),
+            )
+            self._buffer.append(event)
+            self._last_seq = event.seq
+            self._condition.notify_all()
+        logger.debug(f"发布事件, id={self.format_id(event.seq)}, type={event_type}")
+        return event
+
+    def publish_on_commit(self, event_type: str, data: Dict[str, Any], user_ids=()) -> None:
+        """事务提交后再发布（事务回滚则不发布）"""
+        transaction.on_commit(lambda: self.publish(event_type, data, user_ids))
+
+    @property
+    def last_seq(self) -> int:
+        """最新事件序号"""
+        return self._last_seq
+
+    def wait_for_events(self, after_seq: int, timeout: float) -> Tuple[List[Event], bool]:
+        """
+        等待序号大于 after_seq 的事件
+
+        Args:
+            after_seq: 已收到的最后一个事件序号
+            timeout: 最长等待秒数（超时用于发送心跳）
+
+        Returns:
+            (事件列表, 是否有事件已滚出缓冲区需要客户端重新同步)
+        """
+        with self._condition:
+            if self._last_seq <= after_seq:
+                self._condition.wait(timeout)
+            if self._last_seq <= after_seq:
+                return [], False
+
+            oldest_seq = self._buffer[0].seq if self._buffer else self._last_seq + 1
+            overflowed = after_seq + 1 < oldest_seq
+            events = [event for event in self._buffer if event.seq > after_seq]
+        return events, overflowed
+
+
+# 全局广播器实例
+broadcaster = EventBroadcaster(buffer_size=app_config.EVENT_BUFFER_SIZE, max_subscribers=app_config.SSE_MAX_SUBSCRIBERS)
+
+
+class ChangeLogPoller:
+    """
+    从 content_change_log 补发其他进程产生的状态变更
+
+    有订阅者时运行，没有订阅者后自动退出。游标推进规则与 /api/contents/changes/ 相同：
+    只越过写入早于 CHANGE_FEED_SAFETY_SECONDS 的日志，窗口内的日志每次重新读取，按 ID 去重，
+    因此并发事务乱序提交的日志也不会漏发。
+    """
+
+    def __init__(self, source: EventBroadcaster):
+        self._broadcaster = source
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._cursor: Optional[int] = None
+        # 已发布的变更日志 ID（本进程写入的或已补发的），游标越过后清理
+        self._seen = set()
+
+    def mark_published(self, change_id: int) -> None:
+        """本进程写入并直接发布的变更日志，轮询时不再补发"""
+        with self._lock:
+            self._seen.add(change_id)
+
+    def ensure_running(self) -> None:
+        """确保轮询线程在运行（订阅者连接时调用）"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='change-log-poller', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while self._broadcaster.subscriber_count > 0:
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.error(f"读取变更日志失败, error={str(e)}", exc_info=True)
+                    connection.close()
+                time.sleep(app_config.SSE_POLL_SECONDS)
+        finally:
+            # 后台线程不经过请求周期，退出时关闭数据库连接
+            connection.close()
+
+    def poll(self) -> int:
+        """
+        读取一次变更日志并补发未发布过的状态变更
+
+        Returns:
+            补发的事件数
+        """
+        visible_before = datetime.now() - timedelta(seconds=app_config.CHANGE_FEED_SAFETY_SECONDS)
+        if self._cursor is None:
+            # 首次运行：从安全窗口起点开始，不回放更早的历史
+            self._cursor = ContentChangeLog.objects.filter(created_at__lte=visible_before) \
+                .order_by('-id').values_list('id', flat=True).first() or 0
+
+        entries = list(
+            ContentChangeLog.objects.filter(id__gt=self._cursor, action=ContentChangeLog.ACTION_STATUS)
+            .order_by('id')[:500]
+        )
+        with self._lock:
+            pending = [entry for entry in entries if entry.id not in self._seen]
+            self._seen.update(entry.id for entry in pending)
+
+        if pending:
+            contents = Content.objects.in_bulk({entry.content_id for entry in pending})
+            for entry in pending:
+                content = contents.get(entry.content_id)
+                self._broadcaster.publish(
+                    EVENT_CONTENT_STATUS,
+                    {
+                        'content_id': entry.content_id,
+                        'title': content.title if content else None,
+                        'type': content.type if content else None,
+                        'old_status': entry.old_status,
+                        'new_status': entry.new_status,
+                        'creator_id': content.creator_id if content else None,
+                        'operator_id': entry.operator_id,
+                    },
+                    user_ids=(
+                        content.creator_id if content else None,
+                        content.describer_id if content else None,
+                        entry.operator_id,
+                    ),
+                )
+
+        # 游标停在第一条位于安全窗口内的日志之前
+        for entry in entries:
+            if entry.created_at > visible_before:
+                break
+            self._cursor = entry.id
+        with self._lock:
+            self._seen = {change_id for change_id in self._seen if change_id > self._cursor}
+
+        if pending:
+            logger.debug(f"补发其他进程的状态变更, count={len(pending)}, cursor={self._cursor}")
+        return len(pending)
+
+
+# 全局变更日志轮询器
+change_log_poller = ChangeLogPoller(broadcaster)
+
+
+class EventService:
+    """事件发布入口（供服务层调用）"""
+
+    @staticmethod
+    def content_status_changed(content, old_status: Optional[str], operator=None,
+                               change_id: Optional[int] = None) -> None:
+        """
+        广播内容状态变更（事务提交后发送）
+
+        Args:
+            content: 内容对象
+            old_status: 变更前状态
+            operator: 操作者用户对象
+            change_id: 对应的变更日志 ID（轮询器据此跳过，避免重复推送）
+        """
+        operator_id = operator.id if operator else None
+        if change_id is not None:
+            change_log_poller.mark_published(change_id)
+        broadcaster.publish_on_commit(
+            EVENT_CONTENT_STATUS,
+            {
+                'content_id': content.id,
+                'title': content.title,
+                'type': content.type,
+                'old_status': old_status,
+                'new_status': content.status,
+                'creator_id': content.creator_id,
+                'operator_id': operator_id,
+            },
+            user_ids=(content.creator_id, content.describer_id, operator_id),
+        )
+
+    @staticmethod
+    def export_completed(kind: str, result: Dict[str, Any], user=None) -> None:
+        """
+        广播导出任务完成
+
+        Args:
+            kind: 导出类型（pdf 等）
+            result: 导出结果
+            user: 触发导出的用户
+        """
+        user_id = user.id if user else None
+        broadcaster.publish(
+            EVENT_EXPORT_COMPLETED,
+            {
+                'kind': kind,
+                'success': bool(result.get('success')),
+                'message': result.get('message', ''),
+                'url': result.get('pdf_url'),
+                'count': result.get('count', 0),
+                'operator_id': user_id,
+            },
+            user_ids=(user_id,),
+        )
@@ -14,7 +14,8 @@ from django_models.models import User_info
 from api.services.base_service import BaseService
 from api.services.publish_service import PublishService
 from api.services.pdf_service import PDFService
-from api.core.exceptions import ValidationError
+from api.services.event_service import EventService
+from api.core.exceptions import ValidationError, TooManyRequestsError
 
 from api.logging import get_logger
 
@@ -39,6 +40,7 @@ class ExportService(BaseService):
 
         Raises:
             ValidationError: 参数验证失败
+            TooManyRequestsError: 编译名额已满
         """
         # 记录入口日志
         user_info = f"user={user.username if user else 'anonymous'}, user_id={user.id if user else None}" if user else "user=anonymous"
@@ -49,6 +51,9 @@ class ExportService(BaseService):
             # 复用 PDFService 的逻辑
             result = PDFService.generate_pdf_from_selection(date_str=date_str, content_ids=content_ids)
 
+            # 通知发布面板导出完成（成功或编译失败）
+            EventService.export_completed('pdf', result, user)
+
             # 记录成功日志
             logger.info(f"PDF生成成功, {user_info}, mode={mode}, output_path={result.get('pdf_path', 'N/A')}")
             return result
@@ -60,6 +65,10 @@ class ExportService(BaseService):
                 exc_info=True
             )
             raise
+        except TooManyRequestsError:
+            # 编译名额已满，未开始生成
+            logger.warning(f"PDF生成被拒绝（编译排队已满）, {user_info}, mode={mode}")
+            raise
         except Exception as e:
             # 记录失败日志（包含完整堆栈）
             logger.error(
@@ -67,6 +76,7 @@ class ExportService(BaseService):
                 f"error_type={type(e).__name__}, error_message={str(e)}",
                 exc_info=True
             )
+            EventService.export_completed('pdf', {'success': False, 'message': str(e)}, user)
             raise
 
     @staticmethod
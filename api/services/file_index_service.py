@@ -0,0 +1,383 @@
+"""
+上传文件索引服务
+维护 static/uploads 的文件索引（upload_file 表），管理员文件浏览只查询索引、不扫描目录
+
+设计说明：
+- 上传成功时写入索引（含上传者），Content.image_list 变化时由信号更新引用内容ID
+- 通过其他途径写入目录的文件（Flask 上传、手工拷贝）在首次被内容引用时补登记，
+  或由 rebuild_file_index 命令用 os.scandir 全量扫描后批量重建
+- 衍生图目录（derived/）和分片上传暂存目录（.sessions/）不纳入索引
+"""
+
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from django.conf import settings
+
+from django_models.models import User_info, Content, ImageBlob, UploadFile
+from api.core.exceptions import PermissionDeniedError, ConflictError
+from api.core.media import strip_url_prefix
+from api.config.app_config import app_config
+from api.config.constants import UPLOAD_DIR
+from api.services.base_service import BaseService
+from api.services.blob_service import BlobService
+from api.logging import get_logger
+from common.methods.hash_file import hash_file
+
+
+logger = get_logger(__name__)
+
+# 不纳入索引的子目录（相对上传根目录）
+EXCLUDED_DIRS = {'derived'}
+
+
+class FileIndexService(BaseService):
+    """上传文件索引服务类"""
+
+    ALLOWED_SORT_FIELDS = ['modified_at', 'size', 'path', 'ref_count', 'id']
+
+    @staticmethod
+    def normalize_path(path: str) -> Optional[str]:
+        """
+        统一为相对 static 目录的路径（uploads/...）
+
+        Args:
+            path: image_list 中的路径或下载 URL
+
+        Returns:
+            上传目录下的路径；不在上传目录下时返回 None
+        """
+        if not isinstance(path, str) or not path:
+            return None
+        path = strip_url_prefix(path).lstrip('/')
+        if not path.startswith(f'{UPLOAD_DIR}/'):
+            return None
+        return path
+
+    @staticmethod
+    def absolute_path(path: str) -> str:
+        """索引路径对应的绝对路径"""
+        relative = path[len(UPLOAD_DIR) + 1:]
+        return os.path.join(settings.UPLOAD_ROOT, *relative.split('/'))
+
+    @staticmethod
+    def paths_from_image_list(image_list: Optional[str]) -> Set[str]:
+        """解析 image_list 中的上传文件路径"""
+        if not image_list or image_list == '[]':
+            return set()
+        try:
+            paths = json.loads(image_list)
+        except (json.JSONDecodeError, TypeError):
+            return set()
+        if not isinstance(paths, list):
+            return set()
+        normalized = (FileIndexService.normalize_path(path) for path in paths)
+        return {path for path in normalized if path}
+
+    @staticmethod
+    def record_upload(path: str, size: int, digest: Optional[str] = None,
+                      owner_id: Optional[int] = None) -> UploadFile:
+        """
+        登记上传的文件（已存在则更新大小/摘要，上传者只在为空时写入）
+
+        Args:
+            path: 相对 static 目录的路径
+            size: 文件大小
+            digest: 内容摘要
+            owner_id: 上传用户ID
+
+        Returns:
+            索引记录
+        """
+        entry, created = UploadFile.objects.get_or_create(
+            path=path,
+            defaults={'size': size, 'digest': digest, 'owner_id': owner_id, 'modified_at': datetime.now()},
+        )
+        if not created:
+            updates = {'size': size}
+            if digest:
+                updates['digest'] = digest
+            if entry.owner_id is None and owner_id is not None:
+                updates['owner_id'] = owner_id
+            UploadFile.objects.filter(id=entry.id).update(**updates)
+        return entry
+
+    @staticmethod
+    def on_image_list_changed(content_id: int, old_image_list: Optional[str],
+                              new_image_list: Optional[str]) -> None:
+        """
+        Content.image_list 变化时更新文件的引用内容ID
+
+        Args:
+            content_id: 内容ID
+            old_image_list: 变化前的值（新建内容为 None）
+            new_image_list: 变化后的值（删除内容为 None）
+        """
+        old_paths = FileIndexService.paths_from_image_list(old_image_list)
+        new_paths = FileIndexService.paths_from_image_list(new_image_list)
+        added = new_paths - old_paths
+        removed = old_paths - new_paths
+        if not added and not removed:
+            return
+
+        with BaseService.transaction():
+            entries = {
+                entry.path: entry
+                for entry in UploadFile.objects.select_for_update().filter(path__in=added | removed)
+            }
+
+            # 未登记的文件（Flask 上传等）首次被引用时补登记
+            for path in added - set(entries):
+                absolute = FileIndexService.absolute_path(path)
+                try:
+                    stat = os.stat(absolute)
+                except OSError:
+                    continue
+                entries[path] = UploadFile.objects.create(
+                    path=path,
+                    size=stat.st_size,
+                    digest=BlobService.digest_from_path(path),
+                    modified_at=datetime.fromtimestamp(stat.st_mtime),
+                )
+
+            changed = []
+            for path, entry in entries.items():
+                ids = set(entry.get_content_ids())
+                if path in added:
+                    ids.add(content_id)
+                else:
+                    ids.discard(content_id)
+                entry.set_content_ids(ids)
+                changed.append(entry)
+            UploadFile.objects.bulk_update(changed, ['content_ids', 'ref_count'])
+
+        logger.debug(
+            f"更新文件引用, content_id={content_id}, added={len(added)}, removed={len(removed)}"
+        )
+
+    @staticmethod
+    def list_files(
+        query: str = '',
+        owner_id: Optional[int] = None,
+        referenced: Optional[bool] = None,
+        extension: str = '',
+        sort_field: str = 'modified_at',
+        sort_order: str = 'desc',
+        page: int = 1,
+        page_size: int = 20
+    ) -> Dict[str, Any]:
+        """
+        分页查询文件索引
+
+        Args:
+            query: 路径关键词
+            owner_id: 上传者ID
+            referenced: True 只看被引用的文件，False 只看未被引用的文件
+            extension: 扩展名（如 .png）
+            sort_field: 排序字段（modified_at/size/path/ref_count/id）
+            sort_order: 排序方向（asc/desc）
+            page: 页码
+            page_size: 每页条数
+
+        Returns:
+            分页结果（results 中的记录附带 owner_username 属性）
+        """
+        files = UploadFile.objects.all()
+
+        if query:
+            files = files.filter(path__icontains=query)
+        if owner_id is not None:
+            files = files.filter(owner_id=owner_id)
+        if referenced is True:
+            files = files.filter(ref_count__gt=0)
+        elif referenced is False:
+            files = files.filter(ref_count=0)
+        if extension:
+            files = files.filter(path__iendswith=extension if extension.startswith('.') else f'.{extension}')
+
+        if sort_field not in FileIndexService.ALLOWED_SORT_FIELDS:
+            sort_field = 'modified_at'
+        order_prefix = '' if sort_order == 'asc' else '-'
+        # id 作为次要排序，保证分页稳定
+        files = files.order_by(f'{order_prefix}{sort_field}', f'{order_prefix}id')
+
+        result = FileIndexService.paginate(files, page, page_size)
+
+        # 批量查询上传者用户名
+        owner_ids = {entry.owner_id for entry in result['results'] if entry.owner_id}
+        usernames = dict(User_info.objects.filter(id__in=owner_ids).values_list('id', 'username'))
+        for entry in result['results']:
+            entry.owner_username = usernames.get(entry.owner_id, '')
+
+        return result
+
+    @staticmethod
+    def delete_file(file_id: int, operator: User_info, force: bool = False) -> UploadFile:
+        """
+        删除文件（磁盘文件和索引记录）
+
+        Args:
+            file_id: 索引记录ID
+            operator: 操作者（需管理员权限）
+            force: 文件仍被内容引用时是否强制删除
+
+        Returns:
+            已删除的索引记录
+
+        Raises:
+            PermissionDeniedError: 无管理员权限
+            NotFoundError: 记录不存在
+            ConflictError: 文件仍被内容引用
+        """
+        if not operator.has_admin_perm:
+            raise PermissionDeniedError('需要管理员权限')
+
+        entry = FileIndexService.get_object_or_404(UploadFile, file_id, '文件不存在')
+        if entry.ref_count > 0 and not force:
+            raise ConflictError(f'文件仍被 {entry.ref_count} 条内容引用')
+
+        blob = None
+        if entry.digest:
+            blob = ImageBlob.objects.filter(digest=entry.digest, path=entry.path).first()
+
+        with BaseService.transaction():
+            UploadFile.objects.filter(id=entry.id).delete()
+            if blob is not None:
+                ImageBlob.objects.filter(id=blob.id).delete()
+
+        if blob is not None:
+            BlobService.remove_files(blob)
+        else:
+            try:
+                os.remove(FileIndexService.absolute_path(entry.path))
+            except FileNotFoundError:
+                pass
+
+        logger.info(
+            f"删除上传文件, operator={operator.username}, path={entry.path}, "
+            f"ref_count={entry.ref_count}, force={force}"
+        )
+        return entry
+
+    @staticmethod
+    def scan_uploads() -> Iterator[os.DirEntry]:
+        """用 os.scandir 遍历上传目录下的文件（跳过隐藏目录和衍生图目录）"""
+        root = settings.UPLOAD_ROOT
+        if not os.path.isdir(root):
+            return
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if directory == root and entry.name in EXCLUDED_DIRS:
+                            continue
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+
+    @staticmethod
+    def _content_refs(batch_size: int) -> Dict[str, List[int]]:
+        """按批读取全部内容，得到 {路径: [内容ID]}"""
+        refs = defaultdict(list)
+        last_id = 0
+        while True:
+            rows = list(
+                Content.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'image_list')[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            for content_id, image_list in rows:
+                for path in FileIndexService.paths_from_image_list(image_list):
+                    refs[path].append(content_id)
+        return refs
+
+    @staticmethod
+    def rebuild(batch_size: int = 500, compute_digests: bool = False) -> Dict[str, int]:
+        """
+        扫描上传目录全量重建索引（保留已有记录的上传者）
+
+        Args:
+            batch_size: 每批写入/读取条数
+            compute_digests: 是否为文件名不含摘要的旧文件计算摘要（需读取文件内容）
+
+        Returns:
+            {'scanned', 'created', 'updated', 'removed'}
+        """
+        refs = FileIndexService._content_refs(batch_size)
+        existing = {
+            path: (entry_id, digest)
+            for entry_id, path, digest in UploadFile.objects.values_list('id', 'path', 'digest').iterator()
+        }
+
+        stats = {'scanned': 0, 'created': 0, 'updated': 0, 'removed': 0}
+        seen = set()
+        to_create: List[UploadFile] = []
+        to_update: List[UploadFile] = []
+
+        def flush():
+            if to_create:
+                UploadFile.objects.bulk_create(to_create, batch_size=batch_size)
+                stats['created'] += len(to_create)
+                to_create.clear()
+            if to_update:
+                UploadFile.objects.bulk_update(
+                    to_update, ['size', 'digest', 'content_ids', 'ref_count', 'modified_at'], batch_size=batch_size
+                )
+                stats['updated'] += len(to_update)
+                to_update.clear()
+
+        prefix_length = len(settings.UPLOAD_ROOT.rstrip(os.sep)) + 1
+        for dir_entry in FileIndexService.scan_uploads():
+            relative = dir_entry.path[prefix_length:].replace(os.sep, '/')
+            path = f'{UPLOAD_DIR}/{relative}'
+            if len(path) > 255:
+                logger.warning(f"文件路径过长，跳过索引, path={path}")
+                continue
+            stats['scanned'] += 1
+            seen.add(path)
+
+            stat = dir_entry.stat()
+            entry_id, digest = existing.get(path, (None, None))
+            digest = digest or BlobService.digest_from_path(path)
+            if digest is None and compute_digests:
+                try:
+                    with open(dir_entry.path, 'rb') as f:
+                        digest = hash_file(f, algorithm=app_config.UPLOAD_HASH_ALGORITHM, chunk_size=1024 * 1024)
+                except OSError as e:
+                    logger.warning(f"计算文件摘要失败, path={path}, error={str(e)}")
+
+            entry = UploadFile(
+                id=entry_id,
+                path=path,
+                size=stat.st_size,
+                digest=digest,
+                modified_at=datetime.fromtimestamp(stat.st_mtime),
+            )
+            entry.set_content_ids(refs.get(path, []))
+            (to_update if entry_id else to_create).append(entry)
+
+            if len(to_create) + len(to_update) >= batch_size:
+                flush()
+        flush()
+
+        # 删除目录中已不存在的文件的记录
+        stale_ids = [entry_id for path, (entry_id, _) in existing.items() if path not in seen]
+        for start in range(0, len(stale_ids), batch_size):
+            UploadFile.objects.filter(id__in=stale_ids[start:start + batch_size]).delete()
+        stats['removed'] = len(stale_ids)
+
+        logger.info(
+            f"重建文件索引完成, scanned={stats['scanned']}, created={stats['created']}, "
+            f"updated={stats['updated']}, removed={stats['removed']}"
+        )
+        return stats
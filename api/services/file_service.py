@@ -5,20 +5,37 @@
 
 import os
 import json
-from datetime import datetime
-from typing import List
-from django.core.files.uploadedfile import InMemoryUploadedFile
-from django_models.models import User_info, Content
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django_models.models import User_info, Content, ContentChangeLog
 from api.core.exceptions import ValidationError, PermissionDeniedError
+from api.core.media import media_url
+from api.config.app_config import app_config
 from api.config.constants import ALLOWED_IMAGE_EXTENSIONS, MAX_FILE_SIZE, UPLOAD_DIR
 from api.services.base_service import BaseService
+from api.services.change_feed_service import ChangeFeedService
+from api.services.blob_service import BlobService
+from api.services.image_derivative_service import ImageDerivativeService
+from api.services.file_index_service import FileIndexService
+from api.logging import get_logger
+from common.methods.save_upload import save_upload
+
+
+logger = get_logger(__name__)
+
+# 多图上传线程池（按需创建）
+_upload_executor = None
+_executor_lock = threading.Lock()
 
 
 class FileService(BaseService):
     """文件服务类"""
 
     @staticmethod
-    def validate_image_file(image_file: InMemoryUploadedFile) -> None:
+    def validate_image_file(image_file: UploadedFile) -> None:
         """
         验证图片文件
 
@@ -42,42 +59,125 @@ class FileService(BaseService):
             raise ValidationError(f'文件大小超过限制 ({MAX_FILE_SIZE / 1024 / 1024}MB)')
 
     @staticmethod
-    def save_image_file(image_file: InMemoryUploadedFile, user_id: int) -> str:
+    def _get_executor() -> ThreadPoolExecutor:
+        """获取多图上传线程池（进程内共享，首次使用时创建）"""
+        global _upload_executor
+        if _upload_executor is None:
+            with _executor_lock:
+                if _upload_executor is None:
+                    _upload_executor = ThreadPoolExecutor(
+                        max_workers=app_config.UPLOAD_WORKERS,
+                        thread_name_prefix='upload',
+                    )
+        return _upload_executor
+
+    @staticmethod
+    def store_image_file(image_file: UploadedFile, owner_id: Optional[int] = None) -> Dict[str, Any]:
         """
-        保存图片文件
+        校验并流式保存图片，以内容摘要命名
+
+        数据块边写盘边计算摘要（单次遍历），保存到 UPLOAD_ROOT/<摘要前两位>/<摘要><扩展名>，
+        同一秒内的多次上传、同名文件不会互相覆盖；相同内容只保存一份，并登记到图片存储表。
 
         Args:
             image_file: 上传的图片文件
-            user_id: 用户ID
+            owner_id: 上传用户ID（记录到文件索引）
 
         Returns:
-            保存的文件路径
+            {'name', 'digest', 'size', 'path', 'url'}，path 为相对 static 目录的路径
 
         Raises:
             ValidationError: 文件验证失败
         """
-        # 验证文件
-        FileService.validate_image_file(image_file)
+        saved = FileService.write_image_file(image_file)
+        return FileService.register_saved_image(image_file.name, saved, owner_id=owner_id)
+
+    @staticmethod
+    def write_image_file(image_file: UploadedFile) -> Dict[str, Any]:
+        """
+        校验并流式写盘（不访问数据库，可在线程池中执行）
+
+        Args:
+            image_file: 上传的图片文件
+
+        Returns:
+            save_upload 的返回值
 
-        # 创建上传目录
-        upload_path = os.path.join(UPLOAD_DIR, f'user_{user_id}')
-        os.makedirs(upload_path, exist_ok=True)
+        Raises:
+            ValidationError: 文件验证失败
+        """
+        FileService.validate_image_file(image_file)
 
-        # 生成唯一文件名
         ext = os.path.splitext(image_file.name)[1].lower()
-        filename = f'{int(datetime.now().timestamp())}_{image_file.name}'
-        filepath = os.path.join(upload_path, filename)
+        try:
+            return save_upload(
+                image_file.chunks(),
+                settings.UPLOAD_ROOT,
+                ext,
+                algorithm=app_config.UPLOAD_HASH_ALGORITHM,
+                max_size=MAX_FILE_SIZE,
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
 
-        # 保存文件
-        with open(filepath, 'wb+') as destination:
-            for chunk in image_file.chunks():
-                destination.write(chunk)
+    @staticmethod
+    def register_saved_image(name: str, saved: Dict[str, Any], owner_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        登记已按摘要保存的图片（图片存储表和文件索引），并提交衍生图生成任务
 
-        # 返回相对路径
-        return os.path.join(UPLOAD_DIR, f'user_{user_id}', filename)
+        Args:
+            name: 原始文件名
+            saved: save_upload/commit_upload 的返回值
+            owner_id: 上传用户ID
+
+        Returns:
+            {'name', 'digest', 'size', 'path', 'url'}，path 为相对 static 目录的路径
+        """
+        path = f"{UPLOAD_DIR}/{saved['relative_path']}"
+        blob = BlobService.register(saved['digest'], path, saved['size'])
+        if blob.path != path:
+            # 相同内容已以其他扩展名保存过：复用已有文件
+            if not saved['existed']:
+                os.remove(saved['absolute_path'])
+            path = blob.path
+        else:
+            # 后台生成缩略图/WebP/打印版本（已生成过的会直接跳过）
+            ImageDerivativeService.schedule(saved['digest'], saved['absolute_path'])
+        FileIndexService.record_upload(path, saved['size'], saved['digest'], owner_id)
+
+        logger.debug(
+            f"图片已保存, name={name}, size={saved['size']}, "
+            f"digest={saved['digest']}, existed={saved['existed']}"
+        )
+        return {
+            'name': name,
+            'digest': saved['digest'],
+            'size': saved['size'],
+            'path': path,
+            'url': media_url(path),
+        }
 
     @staticmethod
-    def upload_image(image_file: InMemoryUploadedFile, user: User_info) -> str:
+    def save_image_file(image_file: UploadedFile, user_id: int) -> str:
+        """
+        保存图片文件
+
+        Args:
+            image_file: 上传的图片文件
+            user_id: 用户ID（仅用于日志，文件按内容摘要存储）
+
+        Returns:
+            保存的文件路径（相对 static 目录）
+
+        Raises:
+            ValidationError: 文件验证失败
+        """
+        stored = FileService.store_image_file(image_file, owner_id=user_id)
+        logger.info(f"用户上传图片, user_id={user_id}, name={stored['name']}, path={stored['path']}")
+        return stored['path']
+
+    @staticmethod
+    def upload_image(image_file: UploadedFile, user: User_info) -> str:
         """
         上传单个图片
 
@@ -96,39 +196,124 @@ class FileService(BaseService):
         if not user.has_editor_perm:
             raise PermissionDeniedError('需要编辑权限才能上传图片')
 
-        # 保存图片
-        from datetime import datetime
         image_path = FileService.save_image_file(image_file, user.id)
 
-        return f'/static/{image_path}'
+        return media_url(image_path)
 
     @staticmethod
-    def upload_multiple_images(image_files: List[InMemoryUploadedFile], user: User_info) -> List[str]:
+    def upload_multiple_images(image_files: List[UploadedFile], user: User_info) -> List[Dict[str, Any]]:
         """
-        上传多个图片
+        上传多个图片（线程池并发写盘）
+
+        线程池中只做校验、写盘和计算摘要；登记图片存储表和文件索引在请求线程中进行，
+        工作线程不持有数据库连接。单个文件失败不影响其他文件，每个文件单独返回结果。
 
         Args:
             image_files: 上传的图片文件列表
             user: 当前用户
 
         Returns:
-            图片URL路径列表
+            与输入顺序一致的结果列表，每项为
+            {'name', 'success', 'url', 'digest', 'size'}（成功）或 {'name', 'success', 'message'}（失败）
 
         Raises:
             PermissionDeniedError: 无权限上传
-            ValidationError: 文件验证失败
         """
         # 权限检查
         if not user.has_editor_perm:
             raise PermissionDeniedError('需要编辑权限才能上传图片')
 
-        # 上传所有图片
-        image_urls = []
-        for image_file in image_files:
-            url = FileService.upload_image(image_file, user)
-            image_urls.append(url)
+        user_info = f"user={user.username}, user_id={user.id}"
+        logger.info(f"开始上传图片, {user_info}, count={len(image_files)}")
+
+        def write(image_file):
+            try:
+                return FileService.write_image_file(image_file), None
+            except ValidationError as e:
+                return None, e.message
+            except OSError as e:
+                logger.error(f"图片保存失败, {user_info}, name={image_file.name}, error={str(e)}", exc_info=True)
+                return None, '文件保存失败'
+
+        if len(image_files) <= 1:
+            written = [write(image_file) for image_file in image_files]
+        else:
+            written = list(FileService._get_executor().map(write, image_files))
+
+        results = []
+        for image_file, (saved, message) in zip(image_files, written):
+            if saved is None:
+                results.append({'name': image_file.name, 'success': False, 'message': message})
+                continue
+            try:
+                stored = FileService.register_saved_image(image_file.name, saved, owner_id=user.id)
+            except ValidationError as e:
+                results.append({'name': image_file.name, 'success': False, 'message': e.message})
+                continue
+            except OSError as e:
+                logger.error(f"图片保存失败, {user_info}, name={image_file.name}, error={str(e)}", exc_info=True)
+                results.append({'name': image_file.name, 'success': False, 'message': '文件保存失败'})
+                continue
+            results.append({
+                'name': stored['name'],
+                'success': True,
+                'url': stored['url'],
+                'digest': stored['digest'],
+                'size': stored['size'],
+            })
+
+        succeeded = sum(1 for result in results if result['success'])
+        logger.info(
+            f"图片上传完成, {user_info}, total={len(results)}, succeeded={succeeded}, "
+            f"failed={len(results) - succeeded}"
+        )
+        return results
 
-        return image_urls
+    @staticmethod
+    def reference_existing_images(digests: List[str], user: User_info) -> List[Dict[str, Any]]:
+        """
+        按摘要引用已存储的图片（重复上传时只传摘要，不传文件内容）
+
+        Args:
+            digests: 客户端计算的 SHA-256 摘要列表
+            user: 当前用户
+
+        Returns:
+            与输入顺序一致的结果列表，格式同 upload_multiple_images；
+            未找到的摘要返回 success=False，客户端应改为上传文件
+
+        Raises:
+            PermissionDeniedError: 无权限上传
+        """
+        if not user.has_editor_perm:
+            raise PermissionDeniedError('需要编辑权限才能上传图片')
+
+        blobs = BlobService.lookup(digests)
+        results = []
+        for digest in digests:
+            blob = blobs.get((digest or '').lower())
+            if blob is None:
+                results.append({'name': digest, 'success': False, 'message': '图片不存在，请上传文件'})
+                continue
+            try:
+                blob = BlobService.register(blob.digest, blob.path, blob.size)
+            except ValidationError:
+                # 查找之后被回收
+                results.append({'name': digest, 'success': False, 'message': '图片不存在，请上传文件'})
+                continue
+            results.append({
+                'name': digest,
+                'success': True,
+                'url': media_url(blob.path),
+                'digest': blob.digest,
+                'size': blob.size,
+            })
+
+        logger.info(
+            f"按摘要引用图片, user={user.username}, total={len(digests)}, "
+            f"found={sum(1 for result in results if result['success'])}"
+        )
+        return results
 
     @staticmethod
     def add_image_to_content(content: Content, image_path: str) -> str:
@@ -162,21 +347,25 @@ class FileService(BaseService):
 
         # 保存
         content.image_list = json.dumps(image_list)
-        content.save(update_fields=['image_list'])
+        with BaseService.transaction():
+            content.save(update_fields=['image_list'])
+            ChangeFeedService.record_content(content, ContentChangeLog.ACTION_UPDATE)
 
         return content.image_list
 
     @staticmethod
-    def create_content_from_url(url: str, user: User_info) -> Content:
+    def create_content_from_url(url: str, user: User_info) -> Tuple[Content, bool]:
         """
         从URL创建内容（粘贴功能）
 
+        规范化链接相同的内容已存在时直接返回已有内容，不重复创建。
+
         Args:
             url: 粘贴的URL
             user: 当前用户
 
         Returns:
-            新创建的内容对象
+            (内容对象, 是否新创建)
 
         Raises:
             PermissionDeniedError: 无权限创建
@@ -190,7 +379,7 @@ class FileService(BaseService):
         if not url or not url.startswith('http'):
             raise ValidationError('无效的URL')
 
-        # 创建内容
+        # 创建内容（链接已存在时返回已有内容）
         from api.services.content_service import ContentService
         data = {
             'title': url,  # 默认使用URL作为标题
@@ -200,6 +389,4 @@ class FileService(BaseService):
             'status': 'draft',
         }
 
-        content = ContentService.create_content(user, data)
-
-        return content
+        return ContentService.create_content(user, data)
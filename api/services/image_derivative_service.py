@@ -0,0 +1,258 @@
+"""
+图片衍生图服务
+为上传的图片生成缩略图、网页用 WebP 和打印用版本
+
+设计说明：
+- 衍生图按源图摘要缓存在 UPLOAD_ROOT/derived/<摘要前两位>/<摘要>_<规格>.<扩展名>，
+  已存在则直接复用，同一源图只处理一次
+- 上传完成后提交到后台线程池生成，不阻塞上传请求；生成结果（含失败）记录在 image_blob.variants，
+  读取接口只查该列决定返回衍生图还是原图，不检查文件、不提交生成任务；
+  历史图片由 generate_image_derivatives 命令补生成
+- 生成时先按 EXIF 方向旋正，再以像素数据重新编码，不写入 EXIF/ICC 等元数据
+- Pillow 为可选依赖：未安装时不生成衍生图，所有规格回退为原图
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.db import connection
+
+from django_models.models import ImageBlob
+from api.config.app_config import app_config
+from api.config.constants import UPLOAD_DIR
+from api.core.media import media_url, strip_url_prefix
+from api.services.base_service import BaseService
+from api.services.blob_service import BlobService
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# 衍生图目录（相对上传根目录）
+DERIVED_DIR = 'derived'
+
+# 衍生图线程池及进行中的任务（按需创建）
+_derivative_executor = None
+_executor_lock = threading.Lock()
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+
+# Pillow 是否可用（首次使用时检测）
+_pillow_checked = False
+_pillow_available = False
+
+
+def _pillow():
+    """延迟导入 Pillow，未安装时返回 None（只记录一次警告）"""
+    global _pillow_checked, _pillow_available
+    if not _pillow_checked:
+        try:
+            import PIL  # noqa: F401
+            _pillow_available = True
+        except ImportError:
+            logger.warning("未安装 Pillow，图片衍生图功能已禁用（pip install Pillow）")
+        _pillow_checked = True
+    if not _pillow_available:
+        return None
+    from PIL import Image, ImageOps
+    return Image, ImageOps
+
+
+class ImageDerivativeService(BaseService):
+    """图片衍生图服务类"""
+
+    @staticmethod
+    def is_available() -> bool:
+        """衍生图功能是否可用（已安装 Pillow）"""
+        return _pillow() is not None
+
+    @staticmethod
+    def derived_relative_path(digest: str, variant: str) -> str:
+        """衍生图相对上传根目录的路径"""
+        spec = app_config.IMAGE_VARIANTS[variant]
+        return f"{DERIVED_DIR}/{digest[:2]}/{digest}_{variant}.{spec['format']}"
+
+    @staticmethod
+    def derived_absolute_path(digest: str, variant: str) -> str:
+        """衍生图绝对路径"""
+        relative = ImageDerivativeService.derived_relative_path(digest, variant)
+        return os.path.join(settings.UPLOAD_ROOT, *relative.split('/'))
+
+    @staticmethod
+    def generate(digest: str, source_path: str, variants: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        同步生成衍生图（已存在的跳过）
+
+        Args:
+            digest: 源图摘要
+            source_path: 源图绝对路径
+            variants: 需要生成的规格，默认全部
+
+        Returns:
+            {规格: 衍生图绝对路径}（只包含成功生成或已存在的规格）
+        """
+        pil = _pillow()
+        if pil is None:
+            return {}
+        Image, ImageOps = pil
+
+        variants = variants or list(app_config.IMAGE_VARIANTS)
+        todo = {}
+        done = {}
+        for variant in variants:
+            path = ImageDerivativeService.derived_absolute_path(digest, variant)
+            if os.path.exists(path):
+                done[variant] = path
+            else:
+                todo[variant] = path
+        if not todo:
+            return done
+
+        try:
+            with Image.open(source_path) as source:
+                # 先按 EXIF 方向旋正，之后重新编码时不再携带 EXIF
+                source = ImageOps.exif_transpose(source)
+                source.load()
+                for variant, path in todo.items():
+                    spec = app_config.IMAGE_VARIANTS[variant]
+                    image = source.copy()
+                    image.thumbnail((spec['max_size'], spec['max_size']))
+                    if spec['format'] == 'jpeg' and image.mode not in ('RGB', 'L'):
+                        image = image.convert('RGB')
+                    elif image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+                        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+                    # 去除 EXIF/ICC/注释等元数据（Pillow 保存时会沿用 info 中的部分字段）
+                    image.info = {}
+
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    temp_path = f'{path}.{threading.get_ident()}.part'
+                    image.save(temp_path, format=spec['format'].upper(), quality=spec['quality'], optimize=True)
+                    os.replace(temp_path, path)
+                    done[variant] = path
+        except (OSError, ValueError) as e:
+            # Pillow 无法识别的文件抛出 UnidentifiedImageError（OSError 子类）
+            logger.warning(f"生成图片衍生图失败, digest={digest}, source={source_path}, error={str(e)}")
+
+        logger.debug(f"图片衍生图已生成, digest={digest}, variants={sorted(done)}")
+        return done
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        """获取衍生图线程池（进程内共享，首次使用时创建）"""
+        global _derivative_executor
+        if _derivative_executor is None:
+            with _executor_lock:
+                if _derivative_executor is None:
+                    _derivative_executor = ThreadPoolExecutor(
+                        max_workers=app_config.IMAGE_DERIVATIVE_WORKERS,
+                        thread_name_prefix='derivative',
+                    )
+        return _derivative_executor
+
+    @staticmethod
+    def schedule(digest: str, source_path: str) -> bool:
+        """
+        提交后台生成任务（同一源图同时只有一个任务）
+
+        Args:
+            digest: 源图摘要
+            source_path: 源图绝对路径
+
+        Returns:
+            是否提交了新任务
+        """
+        if not ImageDerivativeService.is_available():
+            return False
+
+        with _in_flight_lock:
+            if digest in _in_flight:
+                return False
+            _in_flight.add(digest)
+
+        def run():
+            try:
+                done = ImageDerivativeService.generate(digest, source_path)
+                ImageDerivativeService.record(digest, done)
+            except Exception as e:
+                logger.error(f"记录图片衍生图失败, digest={digest}, error={str(e)}", exc_info=True)
+            finally:
+                with _in_flight_lock:
+                    _in_flight.discard(digest)
+                # 后台线程不经过请求周期，用完即关闭数据库连接
+                connection.close()
+
+        ImageDerivativeService._get_executor().submit(run)
+        return True
+
+    @staticmethod
+    def record(digest: str, done: Dict[str, str]) -> None:
+        """
+        记录已生成的规格（生成失败记为空字符串，读取时回退原图，不再重试）
+
+        Args:
+            digest: 源图摘要
+            done: generate 的返回值
+        """
+        ImageBlob.objects.filter(digest=digest).update(variants=','.join(sorted(done)))
+
+    @staticmethod
+    def variants_for(digests: Iterable[str]) -> Dict[str, Set[str]]:
+        """
+        批量读取图片已生成的规格（一条查询）
+
+        Args:
+            digests: 源图摘要
+
+        Returns:
+            {摘要: {规格, ...}}；尚未生成的图片不在结果中
+        """
+        digests = set(digests)
+        if not digests:
+            return {}
+        rows = ImageBlob.objects.filter(digest__in=digests, variants__isnull=False).values_list('digest', 'variants')
+        return {digest: set(filter(None, variants.split(','))) for digest, variants in rows}
+
+    @staticmethod
+    def variant_path(image_path: str, variant: str, available: Optional[Set[str]] = None) -> str:
+        """
+        获取图片指定规格的路径（相对 static 目录）
+
+        Args:
+            image_path: image_list 中的图片路径（uploads/...、/static/uploads/... 或 /media/uploads/...）
+            variant: 规格名（thumb/web/print）
+            available: 该图片已生成的规格（variants_for 的结果），只按它判断，不访问文件系统
+
+        Returns:
+            衍生图路径；未生成时返回原图路径
+        """
+        original = strip_url_prefix(image_path)
+
+        digest = BlobService.digest_from_path(original)
+        if digest is None or variant not in app_config.IMAGE_VARIANTS:
+            return original
+
+        if available and variant in available:
+            return f"{UPLOAD_DIR}/{ImageDerivativeService.derived_relative_path(digest, variant)}"
+        return original
+
+    @staticmethod
+    def variant_urls(image_path: str, available: Optional[Set[str]] = None) -> Dict[str, str]:
+        """
+        获取图片所有规格的 URL
+
+        Args:
+            image_path: image_list 中的图片路径
+            available: 该图片已生成的规格（variants_for 的结果）
+
+        Returns:
+            {'original': ..., 'thumb': ..., 'web': ..., 'print': ...}
+        """
+        original = strip_url_prefix(image_path)
+
+        urls = {'original': media_url(original)}
+        for variant in app_config.IMAGE_VARIANTS:
+            urls[variant] = media_url(ImageDerivativeService.variant_path(original, variant, available))
+        return urls
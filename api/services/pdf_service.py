@@ -13,6 +13,8 @@ from django.conf import settings
 from django_models.models import Content
 from api.services.base_service import BaseService
 from api.core.exceptions import ValidationError
+from api.core.media import media_url
+from common.methods.hash_file import hash_file
 
 logger = logging.getLogger(__name__)
 
@@ -57,8 +59,10 @@ class PDFService(BaseService):
 
         Raises:
             ValidationError: 参数验证失败
+            TooManyRequestsError: 编译名额已满（等待队列满或等待超时）
         """
         from api.utils.publish_utils import compile_typst_pdf, generate_typst_data
+        from api.throttling import typst_gate
 
         config = PDFService.get_publish_config()
 
@@ -97,43 +101,54 @@ class PDFService(BaseService):
         os.makedirs(config['json_archive_dir'], exist_ok=True)
         os.makedirs(config['pdf_output_dir'], exist_ok=True)
 
-        # 写入JSON（最新）
-        json_str = json.dumps(typst_data, ensure_ascii=False, indent=2)
-        logger.info(f"准备写入JSON到: {config['latest_json_path']}")
-        logger.info(f"JSON数据大小: {len(json_str)} bytes")
-        with open(config['latest_json_path'], 'w', encoding='utf-8') as f:
-            f.write(json_str)
-        logger.info(f"JSON写入成功: {config['latest_json_path']}")
-
-        # 归档JSON数据
-        archive_json_path = os.path.join(config['json_archive_dir'], f'{archive_date}.json')
-        with open(archive_json_path, 'w', encoding='utf-8') as f:
-            f.write(json_str)
-
-        # 编译PDF（最新）
-        pdf_result = compile_typst_pdf(
-            json_path=config['latest_json_path'],
-            output_path=config['latest_pdf_path'],
-            fonts_dir=config['fonts_dir'],
-            template_path=config['typst_template_path'],
-            typst_cmd=config['typst_command']
-        )
-
-        if not pdf_result['success']:
-            return {
-                'success': False,
-                'message': pdf_result['message']
-            }
+        # 写入 latest.json 到生成带摘要副本期间独占编译名额（并发导出排队，队列满或等待超时返回 429）
+        with typst_gate.admit():
+            # 写入JSON（最新）
+            json_str = json.dumps(typst_data, ensure_ascii=False, indent=2)
+            logger.info(f"准备写入JSON到: {config['latest_json_path']}")
+            logger.info(f"JSON数据大小: {len(json_str)} bytes")
+            with open(config['latest_json_path'], 'w', encoding='utf-8') as f:
+                f.write(json_str)
+            logger.info(f"JSON写入成功: {config['latest_json_path']}")
+
+            # 归档JSON数据
+            archive_json_path = os.path.join(config['json_archive_dir'], f'{archive_date}.json')
+            with open(archive_json_path, 'w', encoding='utf-8') as f:
+                f.write(json_str)
+
+            # 编译PDF（最新）
+            pdf_result = compile_typst_pdf(
+                json_path=config['latest_json_path'],
+                output_path=config['latest_pdf_path'],
+                fonts_dir=config['fonts_dir'],
+                template_path=config['typst_template_path'],
+                typst_cmd=config['typst_command']
+            )
 
-        # 归档PDF
-        archive_pdf_path = os.path.join(config['pdf_output_dir'], f'{archive_date}.pdf')
-        import shutil
-        shutil.copy2(config['latest_pdf_path'], archive_pdf_path)
+            if not pdf_result['success']:
+                return {
+                    'success': False,
+                    'message': pdf_result['message']
+                }
+
+            # 归档PDF
+            archive_pdf_path = os.path.join(config['pdf_output_dir'], f'{archive_date}.pdf')
+            import shutil
+            shutil.copy2(config['latest_pdf_path'], archive_pdf_path)
+
+            # 文件名带内容摘要的副本：内容变化则 URL 变化，可长期缓存
+            with open(config['latest_pdf_path'], 'rb') as f:
+                pdf_digest = hash_file(f, algorithm='sha256', chunk_size=1024 * 1024)
+            hashed_name = f'{archive_date}.{pdf_digest[:12]}.pdf'
+            hashed_pdf_path = os.path.join(config['pdf_output_dir'], hashed_name)
+            if not os.path.exists(hashed_pdf_path):
+                shutil.copy2(config['latest_pdf_path'], hashed_pdf_path)
 
         # 返回PDF URL
         return {
             'success': True,
-            'pdf_url': '/static/latest.pdf',
+            'pdf_url': media_url(f'pdfs/{hashed_name}'),
+            'latest_url': '/static/latest.pdf',
             'pdf_path': config['latest_pdf_path'],
             'count': count,
             'due_contents': due_contents
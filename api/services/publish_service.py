@@ -7,9 +7,10 @@ from typing import Dict, Any, List, Union
 from datetime import datetime
 import logging
 from django.db.models import Q
-from django_models.models import User_info, Content
+from django_models.models import User_info, Content, ContentChangeLog
 from api.core.exceptions import ValidationError, BusinessLogicError
 from api.services.base_service import BaseService
+from api.services.change_feed_service import ChangeFeedService
 
 from api.logging import get_logger
 
@@ -50,9 +51,12 @@ class PublishService(BaseService):
                 content = Content.objects.get(id=content_id)
                 # 只有已审核的内容才能发布
                 if content.status == 'reviewed':
+                    old_status = content.status
                     content.status = 'published'
                     content.publish_at = datetime.now()
-                    content.save()
+                    with BaseService.transaction():
+                        content.save()
+                        ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, user, old_status)
                     updated_count += 1
                     logger.debug(f"内容发布成功: content_id={content_id}, title={content.title}, {user_info}")
                 else:
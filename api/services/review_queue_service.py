@@ -0,0 +1,238 @@
+"""
+审核队列服务
+审核者"领取下一批"待审核内容，避免多人同时打开同一条内容重复审核
+
+设计说明：
+- 领取信息复用 Content.locker_id / locked_at，locked_at 超过 REVIEW_CLAIM_TTL_SECONDS 即视为过期，
+  无需后台任务清理，过期的领取会被下一次领取直接覆盖
+- 优先级：先回收过期的领取，再按截止时间最近的优先（无截止时间排最后），其次创建时间最早的优先
+- 候选分三条查询依次读取，每条都能按 idx_status_deadline (status, locker_id, deadline, created_at)
+  顺序扫描、读够即停：过期领取（领取中的行很少）、未领取且有截止时间、未领取且无截止时间。
+  不用 `deadline IS NULL` 排序表达式和 locked_at 的 OR 条件，它们会让 MySQL 放弃索引顺序改为 filesort，
+  FOR UPDATE 时锁住扫描到的全部待审核行
+- 数据库支持 SELECT ... FOR UPDATE SKIP LOCKED（MySQL 8.0+、PostgreSQL）时，并发领取的审核者
+  会直接跳过彼此正在领取的行，互不等待；不支持时退化为带条件的 UPDATE（乐观领取），
+  只有 UPDATE 命中的行才算领取成功
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.db import connection
+from django.db.models import F, Q
+
+from django_models.models import User_info, Content
+from api.core.exceptions import ValidationError, PermissionDeniedError, ConflictError
+from api.config.app_config import app_config
+from api.services.base_service import BaseService
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class ReviewQueueService(BaseService):
+    """审核队列服务类"""
+
+    @staticmethod
+    def claim_expire_before() -> datetime:
+        """早于该时间的领取视为已过期"""
+        return datetime.now() - timedelta(seconds=app_config.REVIEW_CLAIM_TTL_SECONDS)
+
+    @staticmethod
+    def is_claimed_by_other(content: Content, user: User_info) -> bool:
+        """
+        内容是否被其他审核者领取且未过期
+
+        Args:
+            content: 内容对象
+            user: 当前用户
+
+        Returns:
+            被他人有效领取返回 True
+        """
+        return (
+            content.locker_id is not None
+            and content.locker_id != user.id
+            and content.locked_at is not None
+            and content.locked_at >= ReviewQueueService.claim_expire_before()
+        )
+
+    @staticmethod
+    def _claimable_filter(reviewer: User_info) -> Q:
+        """可领取条件：待审核、非本人创建、未被领取或领取已过期"""
+        return (
+            Q(status='pending')
+            & ~Q(creator_id=reviewer.id)
+            & (Q(locker_id__isnull=True) | Q(locked_at__isnull=True)
+               | Q(locked_at__lt=ReviewQueueService.claim_expire_before()))
+        )
+
+    @staticmethod
+    def _queue_order():
+        """队列优先级排序（用于少量行，如审核者自己持有的领取）"""
+        return [F('deadline').asc(nulls_last=True), 'created_at', 'id']
+
+    @staticmethod
+    def _candidate_querysets(reviewer: User_info):
+        """按优先级依次读取的候选查询（均为待审核、非本人创建）"""
+        pending = Content.objects.filter(status='pending').exclude(creator_id=reviewer.id)
+        expired = pending.filter(locker_id__isnull=False).filter(
+            Q(locked_at__isnull=True) | Q(locked_at__lt=ReviewQueueService.claim_expire_before())
+        )
+        free = pending.filter(locker_id__isnull=True)
+        return [
+            expired.order_by(*ReviewQueueService._queue_order()),
+            free.filter(deadline__isnull=False).order_by('deadline', 'created_at', 'id'),
+            free.filter(deadline__isnull=True).order_by('created_at', 'id'),
+        ]
+
+    @staticmethod
+    def get_my_claims(reviewer: User_info) -> List[Content]:
+        """
+        获取审核者当前持有的有效领取（按队列优先级排序）
+
+        Args:
+            reviewer: 审核者用户对象
+
+        Returns:
+            内容列表
+        """
+        return list(
+            Content.objects.filter(
+                locker_id=reviewer.id,
+                status='pending',
+                locked_at__gte=ReviewQueueService.claim_expire_before(),
+            ).order_by(*ReviewQueueService._queue_order())
+        )
+
+    @staticmethod
+    def claim_next(reviewer: User_info, count: int = 1) -> List[Content]:
+        """
+        领取下一批待审核内容
+
+        已持有的有效领取会被续期并一并返回，新领取的数量受 REVIEW_CLAIM_MAX_ACTIVE 限制。
+
+        Args:
+            reviewer: 审核者用户对象
+            count: 本次希望新领取的条数
+
+        Returns:
+            审核者当前持有的全部领取（含本次新领取）
+
+        Raises:
+            PermissionDeniedError: 无审核权限
+            ValidationError: 领取数量不合法
+        """
+        user_info = f"user={reviewer.username}, user_id={reviewer.id}"
+        logger.info(f"开始领取审核任务, {user_info}, count={count}")
+
+        if not reviewer.has_editor_perm:
+            logger.warning(f"领取审核任务失败: 无权限, {user_info}")
+            raise PermissionDeniedError('需要编辑权限才能审核')
+
+        if count < 1 or count > app_config.REVIEW_CLAIM_MAX_COUNT:
+            raise ValidationError(f'领取数量必须在 1 到 {app_config.REVIEW_CLAIM_MAX_COUNT} 之间')
+
+        now = datetime.now()
+        with BaseService.transaction():
+            # 续期已持有的领取
+            held = Content.objects.filter(
+                locker_id=reviewer.id,
+                status='pending',
+                locked_at__gte=ReviewQueueService.claim_expire_before(),
+            ).update(locked_at=now)
+
+            count = min(count, app_config.REVIEW_CLAIM_MAX_ACTIVE - held)
+            if count > 0:
+                if connection.features.has_select_for_update_skip_locked:
+                    claimed_ids = ReviewQueueService._claim_skip_locked(reviewer, count, now)
+                else:
+                    claimed_ids = ReviewQueueService._claim_optimistic(reviewer, count, now)
+            else:
+                claimed_ids = []
+
+        logger.info(
+            f"领取审核任务成功, {user_info}, renewed={held}, claimed={len(claimed_ids)}, "
+            f"content_ids={claimed_ids}"
+        )
+        return ReviewQueueService.get_my_claims(reviewer)
+
+    @staticmethod
+    def _claim_skip_locked(reviewer: User_info, count: int, now: datetime) -> List[int]:
+        """行锁领取：跳过其他事务正在领取的行（需在事务内调用）"""
+        candidate_ids = []
+        for queryset in ReviewQueueService._candidate_querysets(reviewer):
+            remaining = count - len(candidate_ids)
+            if remaining <= 0:
+                break
+            candidate_ids += list(
+                queryset.select_for_update(skip_locked=True).values_list('id', flat=True)[:remaining]
+            )
+        if candidate_ids:
+            # 使用 update() 而不是 save()：领取不是内容变更，不刷新 updated_at、不写变更日志
+            Content.objects.filter(id__in=candidate_ids).update(locker_id=reviewer.id, locked_at=now)
+        return candidate_ids
+
+    @staticmethod
+    def _claim_optimistic(reviewer: User_info, count: int, now: datetime) -> List[int]:
+        """条件更新领取：逐条 UPDATE ... WHERE 可领取，命中才算成功（不支持 SKIP LOCKED 时使用）"""
+        claimable = ReviewQueueService._claimable_filter(reviewer)
+        # 多取一些候选，抵消与其他审核者的竞争
+        candidate_ids = []
+        for queryset in ReviewQueueService._candidate_querysets(reviewer):
+            remaining = count * 3 - len(candidate_ids)
+            if remaining <= 0:
+                break
+            candidate_ids += list(queryset.values_list('id', flat=True)[:remaining])
+        claimed_ids = []
+        for content_id in candidate_ids:
+            if len(claimed_ids) >= count:
+                break
+            updated = Content.objects.filter(claimable, id=content_id).update(
+                locker_id=reviewer.id, locked_at=now
+            )
+            if updated:
+                claimed_ids.append(content_id)
+        return claimed_ids
+
+    @staticmethod
+    def release(content_id: int, reviewer: User_info) -> bool:
+        """
+        释放领取（放回队列）
+
+        Args:
+            content_id: 内容ID
+            reviewer: 审核者用户对象（管理员可释放他人的领取）
+
+        Returns:
+            是否释放了有效领取
+
+        Raises:
+            NotFoundError: 内容不存在
+            ConflictError: 内容被其他审核者领取
+        """
+        user_info = f"user={reviewer.username}, user_id={reviewer.id}"
+        content = ReviewQueueService.get_object_or_404(Content, content_id, '内容不存在')
+
+        if ReviewQueueService.is_claimed_by_other(content, reviewer) and not reviewer.has_admin_perm:
+            logger.warning(
+                f"释放审核任务失败: 已被他人领取, {user_info}, content_id={content_id}, "
+                f"locker_id={content.locker_id}"
+            )
+            raise ConflictError('该内容已被其他审核者领取')
+
+        queryset = Content.objects.filter(id=content_id, locker_id__isnull=False)
+        if not reviewer.has_admin_perm:
+            # 条件更新：检查之后若被他人重新领取，不会误释放
+            queryset = queryset.filter(locker_id=reviewer.id)
+        released = queryset.update(locker_id=None, locked_at=None)
+        logger.info(f"释放审核任务, {user_info}, content_id={content_id}, released={bool(released)}")
+        return bool(released)
+
+    @staticmethod
+    def claim_expires_at(content: Content) -> Optional[datetime]:
+        """领取过期时间"""
+        if content.locked_at is None:
+            return None
+        return content.locked_at + timedelta(seconds=app_config.REVIEW_CLAIM_TTL_SECONDS)
@@ -0,0 +1,119 @@
+"""
+会话清理服务
+django_session 中过期的会话不会自动删除，按主键分批清理，避免一条大 DELETE 长时间锁表
+
+- 命令行：python manage.py purge_sessions
+- 后台：登录时按 SESSION_PURGE_INTERVAL_SECONDS 间隔提交一次清理任务（多个进程经缓存协调，同一时段只有一个进程执行）
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from api.config.app_config import app_config
+from api.services.base_service import BaseService
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# 会话保存在数据库中的存储（签名 Cookie 不需要清理）
+DATABASE_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+PURGE_LOCK_KEY = 'session_purge:lock'
+
+_purge_executor = None
+_executor_lock = threading.Lock()
+
+
+class SessionService(BaseService):
+    """会话清理服务类"""
+
+    @staticmethod
+    def uses_database() -> bool:
+        """当前会话存储是否使用 django_session 表"""
+        return settings.SESSION_ENGINE in DATABASE_SESSION_ENGINES
+
+    @staticmethod
+    def purge_expired(batch_size: Optional[int] = None, max_batches: Optional[int] = None,
+                      pause_seconds: float = 0, dry_run: bool = False) -> int:
+        """
+        分批删除过期会话
+
+        Args:
+            batch_size: 每批删除条数，默认 SESSION_PURGE_BATCH_SIZE
+            max_batches: 最多删除的批数，默认不限
+            pause_seconds: 每批之间的间隔（秒），降低对线上请求的影响
+            dry_run: 只统计过期会话数，不删除
+
+        Returns:
+            删除（或可删除）的会话数
+        """
+        batch_size = batch_size or app_config.SESSION_PURGE_BATCH_SIZE
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now)
+        if dry_run:
+            return expired.count()
+
+        deleted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            # expire_date 有索引；先取主键再按主键删除，每条 DELETE 只锁本批的行
+            keys = list(expired.order_by('expire_date').values_list('session_key', flat=True)[:batch_size])
+            if not keys:
+                break
+            deleted += Session.objects.filter(session_key__in=keys, expire_date__lt=now).delete()[0]
+            batches += 1
+            if len(keys) < batch_size:
+                break
+            if pause_seconds:
+                time.sleep(pause_seconds)
+
+        logger.info(f"清理过期会话, deleted={deleted}, batches={batches}")
+        return deleted
+
+    @staticmethod
+    def schedule_purge() -> bool:
+        """
+        提交后台清理任务（距上次提交不足 SESSION_PURGE_INTERVAL_SECONDS 时跳过）
+
+        Returns:
+            是否提交了任务
+        """
+        if not SessionService.uses_database() or app_config.SESSION_PURGE_INTERVAL_SECONDS <= 0:
+            return False
+        try:
+            # cache.add 只在键不存在时写入：共用缓存时所有进程在一个间隔内只有一个能提交
+            if not cache.add(PURGE_LOCK_KEY, 1, app_config.SESSION_PURGE_INTERVAL_SECONDS):
+                return False
+        except Exception as e:
+            logger.warning(f"会话清理锁获取失败, error={str(e)}")
+            return False
+
+        global _purge_executor
+        if _purge_executor is None:
+            with _executor_lock:
+                if _purge_executor is None:
+                    _purge_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='session-purge')
+
+        def run():
+            try:
+                SessionService.purge_expired(max_batches=app_config.SESSION_PURGE_MAX_BATCHES, pause_seconds=0.1)
+            except Exception as e:
+                logger.error(f"后台清理过期会话失败, error={str(e)}", exc_info=True)
+            finally:
+                # 后台线程不经过请求周期，用完即关闭数据库连接
+                connection.close()
+
+        _purge_executor.submit(run)
+        return True
@@ -0,0 +1,179 @@
+"""
+标签索引服务
+维护 content_management.tag（原始标签字符串）的规范化索引：tag 表 + content_tag 关联表
+
+设计说明：
+- 写入：内容保存时若标签变化由信号重写其 content_tag 行，删除内容时清除；
+  历史数据由 backfill_content_tags 命令分批回填
+- 读取：按标签筛选经 content_tag 的 (tag_id, content_id) 索引查找内容ID；
+  列表序列化时一条查询批量取出本页内容的标签，不再逐条解析 JSON
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from django_models.models import Content, Tag, ContentTag
+from api.services.base_service import BaseService
+from api.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# tag.name 的长度上限
+TAG_MAX_LENGTH = 100
+
+
+def normalize_tags(tag_str: str) -> List[str]:
+    """解析标签字符串，去掉重复和超长部分（保持原顺序）"""
+    names = []
+    for name in Content.parse_tags(tag_str):
+        name = name[:TAG_MAX_LENGTH]
+        if name not in names:
+            names.append(name)
+    return names
+
+
+class TagService(BaseService):
+    """标签索引服务类"""
+
+    @staticmethod
+    def get_tag_ids(names: Iterable[str]) -> Dict[str, int]:
+        """
+        获取标签名对应的ID（不存在的标签先创建）
+
+        Args:
+            names: 标签名
+
+        Returns:
+            {标签名: 标签ID}
+        """
+        names = set(names)
+        if not names:
+            return {}
+        found = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+        missing = names - set(found)
+        if missing:
+            # 并发创建同名标签时忽略冲突，再查回ID
+            Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+            found.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+        # 排序规则不区分大小写时，查回的标签名可能与请求的大小写不同
+        folded = {name.casefold(): tag_id for name, tag_id in found.items()}
+        ids = {}
+        for name in names:
+            tag_id = found.get(name) or folded.get(name.casefold())
+            if tag_id is not None:
+                ids[name] = tag_id
+        return ids
+
+    @staticmethod
+    def _replace(pairs: List[Tuple[int, List[str]]]) -> int:
+        """重写一批内容的 content_tag 行，返回写入的行数"""
+        tag_ids = TagService.get_tag_ids(name for _, names in pairs for name in names)
+        ContentTag.objects.filter(content_id__in=[content_id for content_id, _ in pairs]).delete()
+        rows = []
+        for content_id, names in pairs:
+            seen = set()
+            for name in names:
+                tag_id = tag_ids.get(name)
+                if tag_id is None or tag_id in seen:
+                    continue
+                seen.add(tag_id)
+                rows.append(ContentTag(content_id=content_id, tag_id=tag_id, position=len(seen) - 1))
+        ContentTag.objects.bulk_create(rows)
+        return len(rows)
+
+    @staticmethod
+    def sync_content(content_id: int, tag_str: str) -> None:
+        """
+        根据内容当前的标签字符串重写其标签关联
+
+        Args:
+            content_id: 内容ID
+            tag_str: Content.tag
+        """
+        with BaseService.transaction():
+            TagService._replace([(content_id, normalize_tags(tag_str))])
+
+    @staticmethod
+    def remove_content(content_id: int) -> None:
+        """删除内容的标签关联"""
+        ContentTag.objects.filter(content_id=content_id).delete()
+
+    @staticmethod
+    def tags_for_contents(content_ids: Iterable[int]) -> Dict[int, List[str]]:
+        """
+        批量读取内容的标签（一条查询，按原顺序）
+
+        Args:
+            content_ids: 内容ID
+
+        Returns:
+            {内容ID: [标签名, ...]}；没有标签关联的内容不在结果中
+        """
+        content_ids = list(content_ids)
+        if not content_ids:
+            return {}
+        rows = ContentTag.objects.filter(content_id__in=content_ids).order_by('content_id', 'position').values_list(
+            'content_id', 'tag_id'
+        )
+        rows = list(rows)
+        names = dict(Tag.objects.filter(id__in={tag_id for _, tag_id in rows}).values_list('id', 'name'))
+        result = defaultdict(list)
+        for content_id, tag_id in rows:
+            if tag_id in names:
+                result[content_id].append(names[tag_id])
+        return dict(result)
+
+    @staticmethod
+    def content_ids_with_tags(names: Iterable[str]):
+        """
+        带有任一指定标签的内容ID子查询（用于 id__in，数据库中按索引半连接）
+
+        Args:
+            names: 标签名（精确匹配）
+
+        Returns:
+            content_id 的 QuerySet
+        """
+        return ContentTag.objects.filter(
+            tag_id__in=Tag.objects.filter(name__in=list(names)).values('id')
+        ).values('content_id')
+
+    @staticmethod
+    def backfill(batch_size: int = 500, dry_run: bool = False) -> Dict[str, int]:
+        """
+        按主键分批根据 Content.tag 重建全部标签关联
+
+        Args:
+            batch_size: 每批处理的内容条数
+            dry_run: 只统计，不写库
+
+        Returns:
+            {'scanned', 'tagged', 'rows'}
+        """
+        last_id = 0
+        scanned = tagged = written = 0
+        while True:
+            rows = list(
+                Content.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'tag')[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            scanned += len(rows)
+
+            pairs = [(content_id, normalize_tags(tag_str)) for content_id, tag_str in rows]
+            tagged += sum(1 for _, names in pairs if names)
+            if dry_run:
+                written += sum(len(names) for _, names in pairs)
+            else:
+                with BaseService.transaction():
+                    written += TagService._replace(pairs)
+
+        # 删除已不存在的内容的关联
+        if not dry_run:
+            ContentTag.objects.exclude(content_id__in=Content.objects.values('id')).delete()
+
+        stats = {'scanned': scanned, 'tagged': tagged, 'rows': written}
+        logger.info(f"回填内容标签, dry_run={dry_run}, stats={stats}")
+        return stats
@@ -0,0 +1,427 @@
+"""
+分片上传服务
+大图片分片上传、断点续传：创建会话 → 逐片上传 → 完成（校验摘要后移入图片存储）
+
+设计说明：
+- 每个分片请求先把请求体写入自己的临时文件 UPLOAD_ROOT/.sessions/<会话ID>.<随机串>.chunk，读完整后
+  在会话行锁内确认偏移仍等于已接收字节数，再拼接到暂存文件 <会话ID>.part 的对应偏移并推进 received_size；
+  连接中断或并发重传同一分片只会丢弃自己的临时文件，不会截断其他请求已写入的数据，
+  也不在读取请求体期间持有行锁。整个文件不在内存中拼接
+- 只接受连续的分片：序号对应的偏移必须等于已接收字节数，已接收过的分片重传直接视为成功（幂等）
+- 文件大小在创建会话时检查，分片大小在读取请求体前按 Content-Length 检查
+- 完成时先核对暂存文件大小，再重新计算整个文件的摘要，与客户端声明的摘要比对后原子移动到摘要路径，与普通上传共用去重和衍生图逻辑
+- 暂存文件与上传根目录在同一文件系统，移动不产生额外复制
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, Optional
+
+from django.conf import settings
+
+from django_models.models import User_info, UploadSession
+from api.core.exceptions import (
+    ValidationError, PermissionDeniedError, NotFoundError, BusinessLogicError, ConflictError,
+    PayloadTooLargeError,
+)
+from api.core.media import media_url
+from api.config.app_config import app_config
+from api.config.constants import ALLOWED_IMAGE_EXTENSIONS, MAX_FILE_SIZE
+from api.services.base_service import BaseService
+from api.services.blob_service import BlobService, DIGEST_REGEX
+from api.services.file_service import FileService
+from api.logging import get_logger
+from common.methods.hash_file import hash_file
+from common.methods.save_upload import commit_upload
+
+
+logger = get_logger(__name__)
+
+# 暂存目录（相对上传根目录）
+SESSION_DIR = '.sessions'
+
+# 从请求体读取分片数据的块大小
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class UploadSessionService(BaseService):
+    """分片上传服务类"""
+
+    @staticmethod
+    def spool_path(session_id: str) -> str:
+        """会话暂存文件绝对路径"""
+        return os.path.join(settings.UPLOAD_ROOT, SESSION_DIR, f'{session_id}.part')
+
+    @staticmethod
+    def create_session(user: User_info, filename: str, total_size: int,
+                       digest: Optional[str] = None) -> UploadSession:
+        """
+        创建分片上传会话
+
+        Args:
+            user: 当前用户
+            filename: 原始文件名
+            total_size: 文件总大小（字节）
+            digest: 文件 SHA-256 摘要（可选，完成时用于校验）
+
+        Returns:
+            上传会话对象
+
+        Raises:
+            PermissionDeniedError: 无权限上传
+            ValidationError: 参数不合法
+            PayloadTooLargeError: 文件超过大小限制
+            BusinessLogicError: 进行中的会话过多
+        """
+        user_info = f"user={user.username}, user_id={user.id}"
+
+        if not user.has_editor_perm:
+            raise PermissionDeniedError('需要编辑权限才能上传图片')
+
+        if not filename:
+            raise ValidationError('文件名不能为空')
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in ALLOWED_IMAGE_EXTENSIONS:
+            raise ValidationError(f'不支持的文件类型，允许的类型: {", ".join(ALLOWED_IMAGE_EXTENSIONS)}')
+
+        if not isinstance(total_size, int) or isinstance(total_size, bool) or total_size <= 0:
+            raise ValidationError('文件大小必须是正整数')
+        if total_size > MAX_FILE_SIZE:
+            raise PayloadTooLargeError(f'文件大小超过限制 ({MAX_FILE_SIZE / 1024 / 1024}MB)')
+
+        if digest:
+            digest = digest.lower()
+            if not DIGEST_REGEX.match(digest):
+                raise ValidationError('digest 必须是 SHA-256 十六进制摘要')
+
+        active = UploadSession.objects.filter(user_id=user.id, status=UploadSession.STATUS_UPLOADING).count()
+        if active >= app_config.UPLOAD_SESSION_MAX_ACTIVE:
+            logger.warning(f"创建分片上传会话失败: 进行中的会话过多, {user_info}, active={active}")
+            raise BusinessLogicError('进行中的上传过多，请先完成或取消之前的上传')
+
+        session = UploadSession.objects.create(
+            id=uuid.uuid4().hex,
+            user_id=user.id,
+            filename=filename[:255],
+            extension=ext,
+            total_size=total_size,
+            chunk_size=app_config.UPLOAD_CHUNK_SIZE,
+            expected_digest=digest or None,
+        )
+
+        spool_path = UploadSessionService.spool_path(session.id)
+        os.makedirs(os.path.dirname(spool_path), exist_ok=True)
+        open(spool_path, 'wb').close()
+
+        logger.info(
+            f"创建分片上传会话, {user_info}, session_id={session.id}, filename={filename}, "
+            f"size={total_size}, chunks={session.total_chunks}"
+        )
+        return session
+
+    @staticmethod
+    def get_session(session_id: str, user: User_info) -> UploadSession:
+        """
+        获取当前用户的上传会话
+
+        Raises:
+            NotFoundError: 会话不存在或不属于当前用户
+        """
+        session = UploadSession.objects.filter(id=session_id, user_id=user.id).first()
+        if session is None:
+            raise NotFoundError('上传会话不存在或已过期')
+        return session
+
+    @staticmethod
+    def check_chunk(session: UploadSession, index: int, content_length: Optional[int]) -> int:
+        """
+        在读取请求体之前检查分片序号和 Content-Length
+
+        Args:
+            session: 上传会话
+            index: 分片序号（从 0 开始）
+            content_length: 请求头 Content-Length
+
+        Returns:
+            该分片应有的字节数
+
+        Raises:
+            ValidationError: 序号或长度不合法
+            PayloadTooLargeError: 分片超过应有大小
+            ConflictError: 会话已完成
+        """
+        if session.status != UploadSession.STATUS_UPLOADING:
+            raise ConflictError('上传会话已完成')
+        if index < 0 or index >= session.total_chunks:
+            raise ValidationError(f'分片序号必须在 0 到 {session.total_chunks - 1} 之间')
+
+        expected = min(session.chunk_size, session.total_size - index * session.chunk_size)
+        if content_length is None:
+            raise ValidationError('缺少 Content-Length')
+        if content_length > expected:
+            raise PayloadTooLargeError(f'分片大小超过限制（第 {index} 片应为 {expected} 字节）')
+        if content_length != expected:
+            raise ValidationError(f'分片大小不正确（第 {index} 片应为 {expected} 字节）')
+        return expected
+
+    @staticmethod
+    def write_chunk(session_id: str, user: User_info, index: int, stream: Optional[BinaryIO],
+                    content_length: Optional[int]) -> UploadSession:
+        """
+        写入一个分片
+
+        Args:
+            session_id: 会话ID
+            user: 当前用户
+            index: 分片序号（从 0 开始）
+            stream: 请求体流
+            content_length: 请求头 Content-Length
+
+        Returns:
+            更新后的上传会话
+
+        Raises:
+            NotFoundError: 会话不存在
+            ValidationError: 分片不合法或数据不完整
+            PayloadTooLargeError: 分片超过应有大小
+            ConflictError: 分片不连续或会话已完成
+        """
+        session = UploadSessionService.get_session(session_id, user)
+        expected = UploadSessionService.check_chunk(session, index, content_length)
+        offset = index * session.chunk_size
+
+        if offset + expected <= session.received_size:
+            # 已接收过的分片（客户端超时重传），不再读取请求体
+            logger.debug(f"分片已接收, session_id={session_id}, index={index}")
+            return session
+        if offset != session.received_size:
+            raise ConflictError(f'分片不连续，请从第 {session.received_chunks} 片继续上传')
+        if stream is None:
+            raise ValidationError('分片数据为空')
+
+        spool_path = UploadSessionService.spool_path(session.id)
+        if not os.path.exists(spool_path):
+            raise NotFoundError('上传会话不存在或已过期')
+
+        # 请求体先写入本请求自己的临时文件，读完整之前不触碰暂存文件
+        chunk_path = os.path.join(os.path.dirname(spool_path), f'{session.id}.{uuid.uuid4().hex}.chunk')
+        try:
+            written = 0
+            with open(chunk_path, 'wb') as chunk:
+                while written < expected:
+                    block = stream.read(min(READ_BLOCK_SIZE, expected - written))
+                    if not block:
+                        break
+                    chunk.write(block)
+                    written += len(block)
+            if written != expected:
+                # 连接中断：丢弃不完整的分片，客户端从该分片重传
+                logger.warning(
+                    f"分片数据不完整, session_id={session_id}, index={index}, "
+                    f"expected={expected}, received={written}"
+                )
+                raise ValidationError('分片数据不完整，请重新上传该分片')
+
+            # 行锁内确认偏移仍是已接收字节数（并发重传同一分片时只有一个请求拼接），拼接后推进进度
+            with BaseService.transaction():
+                locked = UploadSession.objects.select_for_update().filter(id=session.id).first()
+                if locked is None or locked.status != UploadSession.STATUS_UPLOADING:
+                    raise ConflictError('上传会话已完成或已取消')
+                if locked.received_size == offset:
+                    UploadSessionService._splice(spool_path, chunk_path, offset)
+                    UploadSession.objects.filter(id=session.id).update(
+                        received_size=offset + expected,
+                        updated_at=datetime.now(),
+                    )
+                elif locked.received_size < offset:
+                    raise ConflictError(f'分片不连续，请从第 {locked.received_chunks} 片继续上传')
+        finally:
+            try:
+                os.remove(chunk_path)
+            except FileNotFoundError:
+                pass
+        session.refresh_from_db()
+
+        logger.debug(
+            f"分片已写入, session_id={session_id}, index={index}, "
+            f"received={session.received_size}/{session.total_size}"
+        )
+        return session
+
+    @staticmethod
+    def _splice(spool_path: str, chunk_path: str, offset: int) -> None:
+        """把分片临时文件写入暂存文件的指定偏移（offset 之后的旧数据先截掉）"""
+        with open(spool_path, 'r+b') as spool, open(chunk_path, 'rb') as chunk:
+            spool.truncate(offset)
+            spool.seek(offset)
+            while True:
+                block = chunk.read(READ_BLOCK_SIZE * 16)
+                if not block:
+                    break
+                spool.write(block)
+
+    @staticmethod
+    def finalize(session_id: str, user: User_info, digest: Optional[str] = None) -> Dict[str, Any]:
+        """
+        完成上传：校验大小和摘要，移入图片存储
+
+        Args:
+            session_id: 会话ID
+            user: 当前用户
+            digest: 文件 SHA-256 摘要（可选，优先于创建会话时声明的摘要）
+
+        Returns:
+            {'name', 'digest', 'size', 'path', 'url'}，与普通上传的单个文件结果一致
+
+        Raises:
+            NotFoundError: 会话不存在
+            ValidationError: 上传未完成或摘要不一致
+        """
+        user_info = f"user={user.username}, user_id={user.id}"
+        session = UploadSessionService.get_session(session_id, user)
+
+        if session.status == UploadSession.STATUS_COMPLETED:
+            # 重复完成（如响应丢失后重试）：返回已存储的图片
+            return UploadSessionService._completed_result(session)
+
+        if session.received_size != session.total_size:
+            raise ValidationError(f'上传未完成，已接收 {session.received_size}/{session.total_size} 字节')
+
+        spool_path = UploadSessionService.spool_path(session.id)
+        try:
+            spool_size = os.path.getsize(spool_path)
+            if spool_size != session.total_size:
+                # 进度与暂存文件不一致时不能提交（否则未声明摘要的不完整文件会被当作有效图片保存）
+                logger.error(
+                    f"分片上传暂存文件大小不一致, {user_info}, session_id={session_id}, "
+                    f"expected={session.total_size}, actual={spool_size}"
+                )
+                UploadSessionService._discard(session)
+                raise ValidationError('上传数据不完整，请重新上传')
+            with open(spool_path, 'rb') as spool:
+                actual = hash_file(spool, algorithm=app_config.UPLOAD_HASH_ALGORITHM,
+                                   chunk_size=READ_BLOCK_SIZE * 16)
+        except FileNotFoundError:
+            session.refresh_from_db()
+            if session.status == UploadSession.STATUS_COMPLETED:
+                return UploadSessionService._completed_result(session)
+            raise NotFoundError('上传会话不存在或已过期')
+
+        expected = (digest or session.expected_digest or '').lower()
+        if expected and expected != actual:
+            logger.warning(
+                f"分片上传摘要校验失败, {user_info}, session_id={session_id}, "
+                f"expected={expected}, actual={actual}"
+            )
+            UploadSessionService._discard(session)
+            raise ValidationError('文件摘要校验失败，请重新上传')
+
+        try:
+            saved = commit_upload(spool_path, settings.UPLOAD_ROOT, session.extension, actual, session.total_size)
+        except FileNotFoundError:
+            # 并发的完成请求已移动暂存文件
+            session.refresh_from_db()
+            if session.status == UploadSession.STATUS_COMPLETED:
+                return UploadSessionService._completed_result(session)
+            raise
+        stored = FileService.register_saved_image(session.filename, saved, owner_id=session.user_id)
+
+        session.status = UploadSession.STATUS_COMPLETED
+        session.digest = actual
+        session.save(update_fields=['status', 'digest', 'updated_at'])
+
+        logger.info(
+            f"分片上传完成, {user_info}, session_id={session_id}, digest={actual}, "
+            f"size={session.total_size}, path={stored['path']}"
+        )
+        return stored
+
+    @staticmethod
+    def _completed_result(session: UploadSession) -> Dict[str, Any]:
+        """已完成会话对应的图片信息"""
+        blob = BlobService.lookup([session.digest]).get(session.digest)
+        if blob is None:
+            raise NotFoundError('图片已被清理，请重新上传')
+        return {
+            'name': session.filename,
+            'digest': blob.digest,
+            'size': blob.size,
+            'path': blob.path,
+            'url': media_url(blob.path),
+        }
+
+    @staticmethod
+    def _discard(session: UploadSession) -> None:
+        """删除会话记录及暂存文件"""
+        try:
+            os.remove(UploadSessionService.spool_path(session.id))
+        except FileNotFoundError:
+            pass
+        UploadSession.objects.filter(id=session.id).delete()
+
+    @staticmethod
+    def abort(session_id: str, user: User_info) -> None:
+        """
+        取消上传
+
+        Raises:
+            NotFoundError: 会话不存在
+        """
+        session = UploadSessionService.get_session(session_id, user)
+        UploadSessionService._discard(session)
+        logger.info(f"取消分片上传, user={user.username}, session_id={session_id}")
+
+    @staticmethod
+    def cleanup(ttl_seconds: Optional[int] = None, dry_run: bool = False) -> Dict[str, int]:
+        """
+        清理长时间无进展的会话及暂存目录中的孤立文件
+
+        Args:
+            ttl_seconds: 无进展时长阈值（默认 UPLOAD_SESSION_TTL_SECONDS）
+            dry_run: 只统计不删除
+
+        Returns:
+            {'sessions': 删除会话数, 'files_removed': 删除暂存文件数, 'bytes_freed': 释放字节数}
+        """
+        if ttl_seconds is None:
+            ttl_seconds = app_config.UPLOAD_SESSION_TTL_SECONDS
+        cutoff = datetime.now() - timedelta(seconds=ttl_seconds)
+
+        stats = {'sessions': 0, 'files_removed': 0, 'bytes_freed': 0}
+        expired = list(UploadSession.objects.filter(updated_at__lt=cutoff).values_list('id', flat=True))
+        stats['sessions'] = len(expired)
+        if not dry_run and expired:
+            UploadSession.objects.filter(id__in=expired).delete()
+
+        # 暂存文件（及中断请求遗留的分片临时文件）：过期会话的文件，以及没有会话记录的孤立文件（按修改时间判断）
+        session_dir = os.path.join(settings.UPLOAD_ROOT, SESSION_DIR)
+        if os.path.isdir(session_dir):
+            expired = set(expired)
+            live = None
+            with os.scandir(session_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(('.part', '.chunk')) or not entry.is_file():
+                        continue
+                    session_id = entry.name.split('.', 1)[0]
+                    stat = entry.stat()
+                    if session_id not in expired:
+                        if datetime.fromtimestamp(stat.st_mtime) >= cutoff:
+                            continue
+                        if live is None:
+                            live = set(UploadSession.objects.values_list('id', flat=True))
+                        if session_id in live:
+                            continue
+                    stats['files_removed'] += 1
+                    stats['bytes_freed'] += stat.st_size
+                    if not dry_run:
+                        try:
+                            os.remove(entry.path)
+                        except OSError as e:
+                            logger.warning(f"删除暂存文件失败, path={entry.path}, error={str(e)}")
+
+        logger.info(
+            f"分片上传会话清理完成, dry_run={dry_run}, sessions={stats['sessions']}, "
+            f"files_removed={stats['files_removed']}, bytes_freed={stats['bytes_freed']}"
+        )
+        return stats
@@ -0,0 +1,292 @@
+"""
+URL 批量导入服务
+一次粘贴多个链接：立即批量创建草稿，标题、描述、规范链接由后台线程获取后分批写回
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List
+
+from django.db import connection, transaction
+
+from django_models.models import User_info, Content, ContentChangeLog
+from api.core.exceptions import ValidationError, PermissionDeniedError
+from api.config.app_config import app_config
+from api.services.analytics_service import AnalyticsService
+from api.services.base_service import BaseService
+from api.services.content_facet_service import ContentFacetService
+from api.services.dashboard_service import DashboardService
+from api.services.duplicate_service import DuplicateService
+from api.logging import get_logger
+from common.methods.canonical_url import link_hash
+from common.methods.fetch_title import fetch_metadata
+from common.methods.is_valid_url import is_valid_url
+
+
+logger = get_logger(__name__)
+
+# 获取网页信息的线程池、写回协调线程池（按需创建）
+_fetch_executor = None
+_import_executor = None
+_executor_lock = threading.Lock()
+
+# 结果攒批的最长等待时间（秒），避免慢页面拖延已完成结果的写回
+FLUSH_INTERVAL_SECONDS = 1.0
+
+
+def placeholder_content(url: str) -> str:
+    """导入时的占位正文（与单条粘贴一致）"""
+    return f'来自URL: {url}'
+
+
+class UrlImportService(BaseService):
+    """URL 批量导入服务类"""
+
+    CONTENT_TYPE = '其他'
+
+    @staticmethod
+    def parse_urls(raw: Any) -> List[str]:
+        """
+        解析请求中的 URL 列表
+
+        Args:
+            raw: 字符串数组，或按行/空白分隔的字符串
+
+        Returns:
+            去除首尾空白后的 URL 列表（保留顺序，可能包含无效项）
+        """
+        if isinstance(raw, str):
+            return raw.split()
+        if isinstance(raw, (list, tuple)):
+            return [str(url).strip() for url in raw if str(url).strip()]
+        return []
+
+    @staticmethod
+    def import_urls(urls: List[str], user: User_info) -> Dict[str, Any]:
+        """
+        批量导入 URL：一次 INSERT 创建草稿并写入变更日志，事务提交后提交后台获取任务
+
+        Args:
+            urls: URL 列表
+            user: 当前用户
+
+        Returns:
+            {'created': [{'id', 'url'}], 'existing': [{'id', 'url'}], 'skipped': [{'url', 'message'}]}
+            existing 为规范化链接已存在的内容（不重复创建）
+
+        Raises:
+            PermissionDeniedError: 无编辑权限
+            ValidationError: 没有 URL 或数量超过上限
+        """
+        if not user.has_editor_perm:
+            raise PermissionDeniedError('需要编辑权限才能粘贴URL')
+        if not urls:
+            raise ValidationError('URL不能为空')
+        if len(urls) > app_config.URL_IMPORT_MAX_URLS:
+            raise ValidationError(f'单次最多导入 {app_config.URL_IMPORT_MAX_URLS} 个URL')
+
+        logger.info(f"开始批量导入URL, user={user.username}, user_id={user.id}, count={len(urls)}")
+
+        valid_urls = []
+        skipped = []
+        seen = set()
+        for url in urls:
+            if not url.startswith('http') or not is_valid_url(url, ('http', 'https')):
+                skipped.append({'url': url, 'message': '无效的URL'})
+            elif link_hash(url) in seen:
+                skipped.append({'url': url, 'message': '重复的URL'})
+            else:
+                valid_urls.append(url)
+                seen.add(link_hash(url))
+
+        # 已存在的链接一次查询（link_hash 索引）
+        from api.services.content_service import ContentService
+        found = ContentService.find_by_links(valid_urls)
+        existing = [{'id': found[link_hash(url)].id, 'url': url} for url in valid_urls if link_hash(url) in found]
+        valid_urls = [url for url in valid_urls if link_hash(url) not in found]
+
+        if not valid_urls:
+            return {'created': [], 'existing': existing, 'skipped': skipped}
+
+        category = Content.derive_category('', UrlImportService.CONTENT_TYPE)
+        with BaseService.transaction():
+            last_id = Content.objects.order_by('-id').values_list('id', flat=True).first() or 0
+            contents = Content.objects.bulk_create([
+                Content(
+                    creator_id=user.id,
+                    describer_id=user.id,
+                    title=url[:200],  # 标题获取前使用URL作为标题
+                    content=placeholder_content(url),
+                    link=url,
+                    link_hash=link_hash(url),  # bulk_create 不调用 save()，需显式计算
+                    type=UrlImportService.CONTENT_TYPE,
+                    category=category,
+                    status='draft',
+                    image_list='[]',
+                )
+                for url in valid_urls
+            ])
+
+            if all(content.id for content in contents):
+                ids = {content.link_hash: content.id for content in contents}
+            else:
+                # MySQL 的批量 INSERT 不返回主键，按本次插入的链接去重键查回
+                ids = dict(
+                    Content.objects.filter(
+                        id__gt=last_id, creator_id=user.id, link_hash__in=[link_hash(url) for url in valid_urls]
+                    )
+                    .order_by('id')
+                    .values_list('link_hash', 'id')
+                )
+            created = [{'id': ids[link_hash(url)], 'url': url} for url in valid_urls if link_hash(url) in ids]
+
+            ContentChangeLog.objects.bulk_create([
+                ContentChangeLog(
+                    content_id=item['id'],
+                    action=ContentChangeLog.ACTION_CREATE,
+                    new_status='draft',
+                    operator_id=user.id,
+                )
+                for item in created
+            ])
+            # bulk_create 不触发信号，显式增加草稿计数
+            DashboardService.on_status_changed(None, 'draft', count=len(contents))
+            AnalyticsService.on_bulk_created(user.id, len(contents))
+            ContentFacetService.invalidate()
+
+            # 事务提交后才能被后台线程读到
+            transaction.on_commit(lambda: UrlImportService.schedule(created, user.id))
+
+        logger.info(
+            f"批量导入URL完成, user={user.username}, created={len(created)}, "
+            f"existing={len(existing)}, skipped={len(skipped)}"
+        )
+        return {'created': created, 'existing': existing, 'skipped': skipped}
+
+    @staticmethod
+    def _get_executors():
+        """获取线程池：获取网页信息（多线程）、攒批写回（每次导入一个协调任务）"""
+        global _fetch_executor, _import_executor
+        if _fetch_executor is None:
+            with _executor_lock:
+                if _fetch_executor is None:
+                    _import_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='url-import')
+                    _fetch_executor = ThreadPoolExecutor(
+                        max_workers=app_config.URL_IMPORT_WORKERS,
+                        thread_name_prefix='url-fetch',
+                    )
+        return _fetch_executor, _import_executor
+
+    @staticmethod
+    def schedule(items: List[Dict[str, Any]], operator_id: int) -> None:
+        """
+        提交后台任务：并发获取网页信息，结果按完成顺序分批写回
+
+        Args:
+            items: [{'id', 'url'}]
+            operator_id: 导入用户ID（写入变更日志）
+        """
+        if not items:
+            return
+        fetch_executor, import_executor = UrlImportService._get_executors()
+
+        def run():
+            futures = {fetch_executor.submit(fetch_metadata, item['url']): item for item in items}
+            remaining = set(futures)
+            pending = []
+            last_flush = time.monotonic()
+            try:
+                while remaining:
+                    done, remaining = wait(remaining, timeout=FLUSH_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        item = futures[future]
+                        try:
+                            metadata = future.result()
+                        except Exception as e:
+                            logger.warning(
+                                f"获取网页信息失败, content_id={item['id']}, url={item['url']}, error={str(e)}"
+                            )
+                            metadata = None
+                        if metadata:
+                            pending.append((item, metadata))
+                    if len(pending) >= app_config.URL_IMPORT_UPDATE_BATCH or \
+                            (pending and time.monotonic() - last_flush >= FLUSH_INTERVAL_SECONDS):
+                        UrlImportService._safe_apply(pending, operator_id)
+                        pending = []
+                        last_flush = time.monotonic()
+                UrlImportService._safe_apply(pending, operator_id)
+            finally:
+                # 后台线程不经过请求周期，用完即关闭数据库连接
+                connection.close()
+
+        import_executor.submit(run)
+        logger.debug(f"已提交URL信息获取任务, count={len(items)}")
+
+    @staticmethod
+    def _safe_apply(results, operator_id: int) -> None:
+        """后台线程中写回，异常只记录日志"""
+        if not results:
+            return
+        try:
+            UrlImportService.apply_metadata(results, operator_id)
+        except Exception as e:
+            logger.error(f"写回网页信息失败, count={len(results)}, error={str(e)}", exc_info=True)
+
+    @staticmethod
+    def apply_metadata(results, operator_id: int) -> int:
+        """
+        将获取到的网页信息批量写回内容
+
+        只覆盖仍是导入时占位值的字段（期间被编辑过的字段保持不变）：
+        标题仍为 URL 时写入网页标题，正文仍为占位文本时写入网页描述，链接仍为原 URL 时写入规范链接。
+
+        Args:
+            results: [({'id', 'url'}, {'title', 'description', 'canonical_url'})]
+            operator_id: 导入用户ID
+
+        Returns:
+            更新的内容数
+        """
+        by_id = {item['id']: (item['url'], metadata) for item, metadata in results}
+        now = datetime.now()
+        changed = []
+        with BaseService.transaction():
+            contents = Content.objects.select_for_update().filter(id__in=list(by_id)).only(
+                'id', 'title', 'content', 'link', 'link_hash', 'status', 'updated_at'
+            )
+            for content in contents:
+                url, metadata = by_id[content.id]
+                updated = False
+                if metadata.get('title') and content.title == url[:200]:
+                    content.title = metadata['title'][:200]
+                    updated = True
+                if metadata.get('description') and content.content == placeholder_content(url):
+                    content.content = metadata['description']
+                    updated = True
+                if metadata.get('canonical_url') and content.link == url and metadata['canonical_url'] != url:
+                    content.link = metadata['canonical_url']
+                    content.link_hash = link_hash(content.link)
+                    updated = True
+                if updated:
+                    content.updated_at = now
+                    changed.append(content)
+
+            if changed:
+                Content.objects.bulk_update(changed, ['title', 'content', 'link', 'link_hash', 'updated_at'])
+                ContentChangeLog.objects.bulk_create([
+                    ContentChangeLog(
+                        content_id=content.id,
+                        action=ContentChangeLog.ACTION_UPDATE,
+                        new_status=content.status,
+                        operator_id=operator_id,
+                    )
+                    for content in changed
+                ])
+                # bulk_update 不触发 post_save 信号，需显式更新近似重复索引和分面计数缓存
+                DuplicateService.index_contents(changed)
+                ContentFacetService.invalidate()
+
+        logger.info(f"网页信息已写回, fetched={len(results)}, updated={len(changed)}")
+        return len(changed)
@@ -3,11 +3,23 @@
 处理用户管理、权限检查、角色管理等功能
 """
 
-from typing import Dict, Any
-from django.db.models import Q, Count
+import base64
+import json
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from django.db.models import Q, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
 from django_models.models import User_info, Content
 from api.core.exceptions import ValidationError, PermissionDeniedError, NotFoundError
+from api.config.constants import CONTENT_STATUS_CHOICES
 from api.services.base_service import BaseService
+from api.services.dashboard_service import DashboardService
+
+
+# 用户列表中按状态统计的内容数
+CONTENT_STATUS_COUNT_FIELDS = [status for status, _ in CONTENT_STATUS_CHOICES]
 
 
 class UserService(BaseService):
@@ -39,6 +51,8 @@ class UserService(BaseService):
         """
         return user.has_admin_perm
 
+    ALLOWED_SORT_FIELDS = ['id', 'username', 'realname', 'student_id', 'created_at', 'role']
+
     @staticmethod
     def get_users_list(
         query: str = '',
@@ -46,47 +60,125 @@ class UserService(BaseService):
         sort_field: str = 'created_at',
         sort_order: str = 'desc',
         page: int = 1,
-        page_size: int = 10
+        page_size: int = 10,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        获取用户列表
+        获取用户列表（含每个用户的内容数）
+
+        - 搜索为用户名/真实姓名/学号的前缀匹配（LIKE 'q%'，可使用各列的索引）
+        - cursor 不为 None 时按游标分页：WHERE (排序字段, id) 在上一页末行之后，不计算总数、不跳过前面的行；
+          空字符串表示第一页
+        - 内容数为关联子查询，与用户列表在同一条查询中，只对本页用户计算
 
         Args:
-            query: 搜索关键词（用户名或真实姓名）
+            query: 搜索关键词（用户名、真实姓名或学号的前缀）
             role_filter: 角色过滤（0=用户, 1=编辑, 2=管理员, 3=超管）
             sort_field: 排序字段
             sort_order: 排序方向（asc/desc）
-            page: 页码
+            page: 页码（页码分页）
             page_size: 每页条数
+            cursor: 上一页返回的 next_cursor（游标分页）
 
         Returns:
-            分页的用户列表
+            页码分页：{'count', 'page', 'page_size', 'total_pages', 'results'}
+            游标分页：{'page_size', 'next_cursor', 'has_more', 'results'}
+
+        Raises:
+            ValidationError: 游标无效或与排序方式不一致
         """
-        # 构建查询
         users = User_info.objects.all()
 
-        # 搜索过滤
+        # 前缀搜索
         if query:
             users = users.filter(
-                Q(username__icontains=query) | Q(realname__icontains=query)
+                Q(username__istartswith=query) | Q(realname__istartswith=query) | Q(student_id__istartswith=query)
             )
 
         # 角色过滤
         if role_filter is not None:
             users = users.filter(role=role_filter)
 
-        # 排序
-        order_prefix = '' if sort_order == 'asc' else '-'
-        allowed_sort_fields = ['id', 'username', 'realname', 'student_id', 'created_at', 'role']
-        if sort_field in allowed_sort_fields:
-            users = users.order_by(f'{order_prefix}{sort_field}')
-        else:
-            users = users.order_by('-created_at')
+        if sort_field not in UserService.ALLOWED_SORT_FIELDS:
+            sort_field = 'created_at'
+        descending = sort_order != 'asc'
+        order_prefix = '-' if descending else ''
+        # id 作为第二排序键，保证顺序稳定（游标分页依赖）
+        order_by = [f'{order_prefix}{sort_field}'] if sort_field == 'id' else [f'{order_prefix}{sort_field}', f'{order_prefix}id']
+
+        if cursor is None:
+            users = UserService.annotate_content_counts(users.order_by(*order_by))
+            return UserService.paginate(users, page, page_size)
+
+        if cursor:
+            value, last_id = UserService._decode_cursor(cursor, sort_field, descending)
+            after = 'lt' if descending else 'gt'
+            if sort_field == 'id':
+                users = users.filter(**{f'id__{after}': last_id})
+            else:
+                users = users.filter(
+                    Q(**{f'{sort_field}__{after}': value}) | Q(**{sort_field: value, f'id__{after}': last_id})
+                )
+
+        # 多取一条用于判断是否还有下一页
+        results = list(UserService.annotate_content_counts(users.order_by(*order_by))[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        return {
+            'page_size': page_size,
+            'next_cursor': UserService._encode_cursor(results[-1], sort_field, descending) if has_more else None,
+            'has_more': has_more,
+            'results': results,
+        }
+
+    @staticmethod
+    def annotate_content_counts(users):
+        """
+        为用户查询集附加内容数（每项一个按 creator_id/describer_id/reviewer_id 索引的关联子查询）
+
+        - created_count / described_count / reviewed_count：创建、描述、审核的内容数
+        - created_<状态>_count：创建的内容中各状态的数量
 
-        # 分页
-        result = UserService.paginate(users, page, page_size)
+        Args:
+            users: User_info 查询集
 
-        return result
+        Returns:
+            附加了计数字段的查询集
+        """
+        def count_subquery(field: str, **filters):
+            contents = Content.objects.filter(**{field: OuterRef('id')}, **filters).order_by()
+            return Coalesce(Subquery(contents.values(field).annotate(total=Count('id')).values('total')), 0)
+
+        annotations = {
+            'created_count': count_subquery('creator_id'),
+            'described_count': count_subquery('describer_id'),
+            'reviewed_count': count_subquery('reviewer_id'),
+        }
+        for status in CONTENT_STATUS_COUNT_FIELDS:
+            annotations[f'created_{status}_count'] = count_subquery('creator_id', status=status)
+        return users.annotate(**annotations)
+
+    @staticmethod
+    def _encode_cursor(user: User_info, sort_field: str, descending: bool) -> str:
+        value = getattr(user, sort_field)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps([sort_field, descending, value, user.id], ensure_ascii=False)
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort_field: str, descending: bool):
+        try:
+            field, cursor_descending, value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            if sort_field == 'created_at':
+                value = datetime.fromisoformat(value)
+            last_id = int(last_id)
+        except (ValueError, TypeError, UnicodeError):
+            raise ValidationError('无效的分页游标')
+        if field != sort_field or cursor_descending != descending:
+            raise ValidationError('分页游标与排序方式不一致，请从第一页重新获取')
+        return value, last_id
 
     @staticmethod
     def update_user_role(user: User_info, new_role: int, operator: User_info) -> User_info:
@@ -167,47 +259,9 @@ class UserService(BaseService):
     @staticmethod
     def get_dashboard_stats() -> Dict[str, Any]:
         """
-        获取管理面板统计数据
+        获取管理面板统计数据（见 DashboardService.get_stats）
 
         Returns:
             统计数据字典
         """
-        from django.db.models import Count
-        from django.utils import timezone
-        from datetime import timedelta
-
-        # 用户统计
-        total_users = User_info.objects.count()
-
-        # 内容统计
-        total_contents = Content.objects.count()
-
-        # 状态统计
-        draft_contents = Content.objects.filter(status='draft').count()
-        pending_contents = Content.objects.filter(status='pending').count()
-        reviewed_contents = Content.objects.filter(status='reviewed').count()
-        rejected_contents = Content.objects.filter(status='rejected').count()
-        published_contents = Content.objects.filter(status='published').count()
-        terminated_contents = Content.objects.filter(status='terminated').count()
-
-        # 今日发布统计
-        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        published_today = Content.objects.filter(
-            status='published',
-            publish_at__gte=today_start
-        ).count()
-
-        return {
-            'total_users': total_users,
-            'total_contents': total_contents,
-            'pending_reviews': pending_contents,
-            'published_today': published_today,
-            'status_counts': {
-                'draft': draft_contents,
-                'pending': pending_contents,
-                'reviewed': reviewed_contents,
-                'rejected': rejected_contents,
-                'published': published_contents,
-                'terminated': terminated_contents
-            }
-        }
+        return DashboardService.get_stats()
@@ -0,0 +1,145 @@
+"""
+模型信号处理
+
+在 ApiConfig.ready() 中注册（Django API 与 Flask 应用调用 django.setup() 时都会加载）
+"""
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from django_models.models import Content, User_info
+from api.config.app_config import app_config
+from api.core import user_cache
+from api.services.analytics_service import AnalyticsService
+from api.services.blob_service import BlobService
+from api.services.content_facet_service import ContentFacetService
+from api.services.dashboard_service import DashboardService
+from api.services.duplicate_service import DuplicateService
+from api.services.file_index_service import FileIndexService
+from api.services.tag_service import TagService
+
+
+@receiver(pre_save, sender=Content)
+def remember_old_image_list(sender, instance, update_fields=None, **kwargs):
+    """保存前记录原 image_list（依赖 DirtyFieldsMixin 的加载快照）"""
+    if update_fields is not None and 'image_list' not in update_fields:
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+    if instance._state.adding:
+        instance._old_image_list = None
+    elif loaded is not None and 'image_list' in loaded:
+        instance._old_image_list = loaded['image_list']
+
+
+@receiver(post_save, sender=Content)
+def update_image_refs_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """image_list 变化时更新图片引用计数和文件索引中的引用内容"""
+    if not hasattr(instance, '_old_image_list'):
+        # 未写入 image_list，或无法得知原值（未从数据库加载的实例）
+        return
+    old_image_list = instance.__dict__.pop('_old_image_list')
+    if old_image_list != instance.image_list:
+        BlobService.on_image_list_changed(old_image_list, instance.image_list)
+        FileIndexService.on_image_list_changed(instance.id, old_image_list, instance.image_list)
+
+
+@receiver(post_delete, sender=Content)
+def release_image_refs_on_delete(sender, instance, **kwargs):
+    """删除内容时释放其图片引用"""
+    BlobService.on_image_list_changed(instance.image_list, None)
+    FileIndexService.on_image_list_changed(instance.id, instance.image_list, None)
+
+
+@receiver(post_save, sender=Content)
+def update_fingerprint_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """标题或正文可能变化时更新近似重复索引"""
+    if update_fields is not None and not {'title', 'content'} & set(update_fields):
+        return
+    DuplicateService.index_contents([instance])
+
+
+@receiver(post_delete, sender=Content)
+def remove_fingerprint_on_delete(sender, instance, **kwargs):
+    """删除内容时移除其近似重复索引"""
+    DuplicateService.remove(instance.id)
+
+
+@receiver(post_save, sender=Content)
+def sync_tags_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """新建内容或标签可能变化时重写其标签关联"""
+    if not created:
+        if update_fields is not None and 'tag' not in update_fields:
+            return
+        # post_save 时 DirtyFieldsMixin 的加载快照尚未刷新，仍是保存前的值
+        loaded = getattr(instance, '_loaded_values', None)
+        if loaded is not None and 'tag' in loaded and loaded['tag'] == instance.tag:
+            return
+    TagService.sync_content(instance.id, instance.tag)
+
+
+@receiver(post_delete, sender=Content)
+def remove_tags_on_delete(sender, instance, **kwargs):
+    """删除内容时移除其标签关联"""
+    TagService.remove_content(instance.id)
+
+
+@receiver(post_save, sender=User_info)
+def invalidate_user_cache_on_save(sender, instance, created, **kwargs):
+    """用户信息（角色、密码等）修改后删除认证用户缓存"""
+    if not created:
+        user_cache.invalidate(instance.id)
+
+
+@receiver(post_delete, sender=User_info)
+def invalidate_user_cache_on_delete(sender, instance, **kwargs):
+    """删除用户后删除认证用户缓存"""
+    user_cache.invalidate(instance.id)
+
+
+# 保存前无法得知原状态（实例不是从数据库加载的）
+_UNKNOWN_STATUS = object()
+
+
+@receiver(pre_save, sender=Content)
+def remember_old_status(sender, instance, update_fields=None, **kwargs):
+    """保存前记录原状态（用于增减状态计数和发布审核统计）"""
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+    if instance._state.adding:
+        instance._old_status = None
+    elif loaded is not None and 'status' in loaded:
+        instance._old_status = loaded['status']
+        instance._old_updated_at = loaded.get('updated_at')
+    else:
+        instance._old_status = _UNKNOWN_STATUS
+
+
+@receiver(post_save, sender=Content)
+def update_status_count_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """新建内容或状态变化时增减状态计数，并累加当天的发布审核统计"""
+    if not hasattr(instance, '_old_status'):
+        return
+    old_status = instance.__dict__.pop('_old_status')
+    old_updated_at = instance.__dict__.pop('_old_updated_at', None)
+    if old_status is _UNKNOWN_STATUS:
+        if app_config.DASHBOARD_STATUS_COUNTERS:
+            transaction.on_commit(DashboardService.rebuild_counters)
+        return
+    DashboardService.on_status_changed(old_status, instance.status)
+    if created or old_status != instance.status:
+        AnalyticsService.on_status_changed(instance, old_status, old_updated_at)
+
+
+@receiver(post_delete, sender=Content)
+def update_status_count_on_delete(sender, instance, **kwargs):
+    """删除内容时减少状态计数"""
+    DashboardService.on_status_changed(instance.status, None)
+
+
+@receiver(post_save, sender=Content)
+@receiver(post_delete, sender=Content)
+def invalidate_content_facets(sender, instance, **kwargs):
+    """内容写入后使分面计数缓存失效"""
+    ContentFacetService.invalidate()
@@ -0,0 +1,303 @@
+"""
+API 限流与准入控制
+
+- 令牌桶限流：按用户和全局两级，容量为允许的突发请求数，令牌按周期匀速补充（THROTTLE_RATES）
+- 准入控制：Typst 编译同时进行的数量受限，等待队列有上限，超出或等待超时立即拒绝
+- 超限返回 429 和 Retry-After 响应头
+
+限流状态保存在可替换的后端中（settings.THROTTLE_BACKEND，见 config/django_config.py）：
+- memory：进程内，用于测试和单进程部署
+- file：状态文件 + 文件锁，同一主机的多个进程共用；进程退出时文件锁自动释放，不会遗留占用的编译名额
+"""
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.throttling import BaseThrottle
+from rest_framework.views import exception_handler as drf_exception_handler
+
+from api.config.app_config import app_config
+from api.core.exceptions import TooManyRequestsError
+from api.logging import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+logger = get_logger(__name__)
+
+
+def take_tokens(state: Optional[Tuple[float, float]], capacity: int, period: float, cost: float,
+                now: float) -> Tuple[Tuple[float, float], float]:
+    """
+    令牌桶计算
+
+    Args:
+        state: (剩余令牌, 上次更新时间)，None 表示新桶（满）
+        capacity: 桶容量
+        period: 从空到满的时间（秒）
+        cost: 消耗的令牌数（负数为退还）
+        now: 当前时间戳
+
+    Returns:
+        (新状态, 需要等待的秒数)；等待为 0 表示已扣除令牌
+    """
+    rate = capacity / period
+    tokens, updated_at = state if state else (capacity, now)
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+    if tokens >= cost:
+        return (min(capacity, tokens - cost), now), 0.0
+    return (tokens, now), (cost - tokens) / rate
+
+
+class MemoryBackend:
+    """进程内限流状态"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._semaphores = {}
+
+    def consume(self, key: str, capacity: int, period: float, cost: float = 1) -> float:
+        """扣除令牌，返回需要等待的秒数（0 表示允许）"""
+        with self._lock:
+            self._buckets[key], wait = take_tokens(self._buckets.get(key), capacity, period, cost, time.time())
+            return wait
+
+    def acquire_slot(self, name: str, slots: int, timeout: float):
+        """获取并发名额，超时返回 None"""
+        with self._lock:
+            semaphore = self._semaphores.setdefault((name, slots), threading.BoundedSemaphore(slots))
+        return semaphore if semaphore.acquire(timeout=timeout) else None
+
+    def release_slot(self, handle) -> None:
+        handle.release()
+
+
+def _lock_file(f, blocking: bool = True) -> bool:
+    """对整个文件加排他锁，非阻塞模式下已被占用时返回 False"""
+    try:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        if blocking:
+            raise
+        return False
+
+
+def _unlock_file(f) -> None:
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FileBackend:
+    """文件限流状态：每个令牌桶一个状态文件，读改写期间持有文件锁"""
+
+    # 等待编译名额时的轮询间隔（秒）
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest()[:20] + suffix)
+
+    def consume(self, key: str, capacity: int, period: float, cost: float = 1) -> float:
+        """扣除令牌，返回需要等待的秒数（0 表示允许）"""
+        with open(self._path(key, '.bucket'), 'a+b') as f:
+            _lock_file(f)
+            try:
+                f.seek(0)
+                try:
+                    tokens, updated_at = f.read().decode('ascii').split()
+                    state = (float(tokens), float(updated_at))
+                except ValueError:
+                    state = None
+                state, wait = take_tokens(state, capacity, period, cost, time.time())
+                f.seek(0)
+                f.truncate()
+                f.write(f'{state[0]:.6f} {state[1]:.6f}'.encode('ascii'))
+                f.flush()
+            finally:
+                _unlock_file(f)
+        return wait
+
+    def acquire_slot(self, name: str, slots: int, timeout: float):
+        """获取并发名额（对名额文件之一加非阻塞锁），超时返回 None"""
+        deadline = time.monotonic() + timeout
+        while True:
+            for index in range(slots):
+                f = open(self._path(f'{name}:{index}', '.slot'), 'a+b')
+                if _lock_file(f, blocking=False):
+                    return f
+                f.close()
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.POLL_INTERVAL)
+
+    def release_slot(self, handle) -> None:
+        try:
+            _unlock_file(handle)
+        finally:
+            handle.close()
+
+
+BACKENDS = {
+    'memory': lambda location: MemoryBackend(),
+    'file': lambda location: FileBackend(location),
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """获取限流状态后端（首次使用时按 settings.THROTTLE_BACKEND 创建）"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = getattr(settings, 'THROTTLE_BACKEND', None) or {'ENGINE': 'memory'}
+                _backend = BACKENDS[config['ENGINE']](config.get('LOCATION'))
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """替换限流状态后端（测试使用）"""
+    global _backend
+    _backend = backend
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    令牌桶限流：先扣用户桶，再扣全局桶；全局桶不足时退还用户桶的令牌
+
+    子类设置 scope，对应 THROTTLE_RATES 中的配置
+    """
+    scope = None
+
+    def __init__(self):
+        self._wait = None
+
+    def get_user_key(self, request) -> str:
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.id}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        rates = app_config.THROTTLE_RATES[self.scope]
+        backend = get_backend()
+        user_key = f'{self.scope}:{self.get_user_key(request)}'
+
+        try:
+            wait = backend.consume(user_key, *rates['user'])
+            if not wait:
+                wait = backend.consume(f'{self.scope}:global', *rates['global'])
+                if wait:
+                    backend.consume(user_key, *rates['user'], cost=-1)
+        except OSError as e:
+            # 限流状态不可用时放行，不影响正常请求
+            logger.error(f"限流状态读写失败, scope={self.scope}, error={str(e)}")
+            return True
+
+        if wait:
+            self._wait = wait
+            logger.warning(f"请求被限流, scope={self.scope}, key={user_key}, wait={wait:.1f}s")
+            return False
+        return True
+
+    def wait(self):
+        return self._wait
+
+
+class ExportThrottle(TokenBucketThrottle):
+    scope = 'export'
+
+
+class SearchThrottle(TokenBucketThrottle):
+    scope = 'search'
+
+
+class UploadThrottle(TokenBucketThrottle):
+    scope = 'upload'
+
+
+class UploadChunkThrottle(TokenBucketThrottle):
+    scope = 'upload_chunk'
+
+
+class AdmissionGate:
+    """
+    并发准入控制：最多 slots 个同时执行，最多 max_waiting 个等待（每个进程），
+    等待超过 timeout 秒或队列已满时抛出 TooManyRequestsError
+    """
+
+    def __init__(self, name: str, slots: int, max_waiting: int, timeout: float):
+        self.name = name
+        self.slots = slots
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def admit(self):
+        with self._lock:
+            if self._waiting >= self.max_waiting:
+                logger.warning(f"准入队列已满, gate={self.name}, waiting={self._waiting}")
+                raise TooManyRequestsError('服务器繁忙，请稍后重试', retry_after=self.timeout)
+            self._waiting += 1
+        try:
+            handle = get_backend().acquire_slot(self.name, self.slots, self.timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if handle is None:
+            logger.warning(f"等待准入超时, gate={self.name}, timeout={self.timeout}s")
+            raise TooManyRequestsError('服务器繁忙，请稍后重试', retry_after=self.timeout)
+
+        try:
+            yield
+        finally:
+            get_backend().release_slot(handle)
+
+
+# Typst 编译（同一时刻写入 latest.json / latest.pdf 的只能有一个）
+typst_gate = AdmissionGate(
+    'typst',
+    slots=app_config.TYPST_MAX_CONCURRENT,
+    max_waiting=app_config.TYPST_MAX_WAITING,
+    timeout=app_config.TYPST_WAIT_TIMEOUT_SECONDS,
+)
+
+
+def exception_handler(exc, context):
+    """
+    DRF 异常处理：限流（429）响应使用统一的 {'success', 'message'} 格式，并带 Retry-After 头
+    """
+    response = drf_exception_handler(exc, context)
+    if isinstance(exc, exceptions.Throttled) and response is not None:
+        retry_after = exc.wait  # DRF 已向上取整，并据此设置 Retry-After 头
+        response.data = {
+            'success': False,
+            'message': f'请求过于频繁，请 {retry_after} 秒后重试' if retry_after else '请求过于频繁，请稍后重试',
+            'retry_after': retry_after,
+        }
+    return response
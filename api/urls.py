@@ -6,7 +6,7 @@ API URL 配置
 RESTful 设计说明：
 - CRUD 操作使用标准 REST 方法（GET/POST/PUT/PATCH/DELETE）
 - 特殊操作使用 POST 到资源子路径（如 /modify/, /review/, /recall/, /cancel/）
-- 文件上传统一到 /upload/ 端点，通过 upload_type 参数区分类型（text/url/image）
+- 文件上传统一到 /upload/ 端点，通过 upload_type 参数区分类型（text/url/urls/image）
 """
 
 from django.urls import path
@@ -19,22 +19,36 @@ from api.views import (
     CurrentUserAPIView,
     ChangePasswordAPIView,
     ContentListAPIView,
+    ContentFacetsAPIView,
+    ContentChangesAPIView,
     ContentCreateAPIView,
     ContentDetailAPIView,
+    ContentSimilarAPIView,
     ContentModifyAPIView,
     ContentSubmitAPIView,
     ContentReviewAPIView,
+    ReviewQueueAPIView,
+    ContentReleaseAPIView,
     ContentRecallAPIView,
     ContentCancelAPIView,
     ContentAdminStatusAPIView,
     PublishAPIView,
     UnifiedUploadAPIView,
+    UploadCheckAPIView,
+    UploadSessionAPIView,
+    UploadSessionDetailAPIView,
+    UploadChunkAPIView,
+    UploadSessionFinalizeAPIView,
     SearchAPIView,
     PreviewAPIView,
+    EventStreamAPIView,
     UserAdminListAPIView,
     UserRoleEditAPIView,
     UserEditAPIView,
     AdminDashboardAPIView,
+    AdminAnalyticsAPIView,
+    FileAdminListAPIView,
+    FileAdminDetailAPIView,
 )
 from api.views.export import (
     ExportPDFAPIView,
@@ -55,21 +69,34 @@ urlpatterns = [
 
     # ==================== 内容管理 ====================
     # 内容列表：GET /api/contents/ - 获取内容列表（复数形式）
+    # 增量变更：GET /api/contents/changes/?since=<cursor> - 前端增量同步
     # 内容创建：POST /api/content/create/ - 创建内容
     # 内容详情/更新：GET /api/content/<id>/ - 详情, PATCH /api/content/<id>/modify/ - 更新
     # 内容状态操作：提交审核、审核、撤回、取消
+    # 审核队列：GET/POST /api/review/queue/ - 查看/领取待审核内容
     path('contents/', ContentListAPIView.as_view(), name='api_content_list'),  # 列表 - 所有用户
+    path('contents/facets/', ContentFacetsAPIView.as_view(), name='api_content_facets'),  # 分面计数
+    path('contents/changes/', ContentChangesAPIView.as_view(), name='api_content_changes'),  # 增量变更
+    path('review/queue/', csrf_exempt(ReviewQueueAPIView.as_view()), name='api_review_queue'),  # 审核队列
     path('content/create/', csrf_exempt(ContentCreateAPIView.as_view()), name='api_content_create'),  # 创建(POST)
     path('content/<int:pk>/', ContentDetailAPIView.as_view(), name='api_content_detail'),  # 详情
+    path('content/<int:pk>/similar/', ContentSimilarAPIView.as_view(), name='api_content_similar'),  # 疑似重复内容
     path('content/<int:pk>/modify/', csrf_exempt(ContentModifyAPIView.as_view()), name='api_content_modify'),  # 更新(PATCH)
     path('content/<int:pk>/submit/', csrf_exempt(ContentSubmitAPIView.as_view()), name='api_content_submit'),  # 提交审核
     path('content/<int:pk>/review/', csrf_exempt(ContentReviewAPIView.as_view()), name='api_content_review'),
+    path('content/<int:pk>/release/', csrf_exempt(ContentReleaseAPIView.as_view()), name='api_content_release'),  # 释放审核领取
     path('content/<int:pk>/recall/', csrf_exempt(ContentRecallAPIView.as_view()), name='api_content_recall'),
     path('content/<int:pk>/cancel/', csrf_exempt(ContentCancelAPIView.as_view()), name='api_content_cancel'),  # 取消
     path('content/<int:pk>/admin_status/', csrf_exempt(ContentAdminStatusAPIView.as_view()), name='api_content_admin_status'),  # 管理员强制修改状态
 
     # 文件上传（统一上传 API）
     path('upload/', csrf_exempt(UnifiedUploadAPIView.as_view()), name='api_upload'),
+    path('upload/check/', csrf_exempt(UploadCheckAPIView.as_view()), name='api_upload_check'),  # 图片预检（按摘要去重）
+    # 分片上传（断点续传）：创建会话 → PUT 分片 → 完成
+    path('upload/sessions/', csrf_exempt(UploadSessionAPIView.as_view()), name='api_upload_session_create'),
+    path('upload/sessions/<str:session_id>/', csrf_exempt(UploadSessionDetailAPIView.as_view()), name='api_upload_session_detail'),  # 查询进度/取消
+    path('upload/sessions/<str:session_id>/chunks/<int:index>/', csrf_exempt(UploadChunkAPIView.as_view()), name='api_upload_chunk'),
+    path('upload/sessions/<str:session_id>/finalize/', csrf_exempt(UploadSessionFinalizeAPIView.as_view()), name='api_upload_session_finalize'),
 
     # 搜索
     path('search/', csrf_exempt(SearchAPIView.as_view()), name='api_search'),
@@ -77,6 +104,9 @@ urlpatterns = [
     # 预览
     path('preview/', csrf_exempt(PreviewAPIView.as_view()), name='api_preview'),  # 预览（新增）
 
+    # 事件推送（SSE）
+    path('events/stream/', EventStreamAPIView.as_view(), name='api_event_stream'),
+
     # 发布相关
     path('publish/', csrf_exempt(PublishAPIView.as_view()), name='api_publish'),
 
@@ -91,5 +121,10 @@ urlpatterns = [
     path('admin/users/<int:user_id>/role/', csrf_exempt(UserRoleEditAPIView.as_view()), name='api_user_role_edit'),  # 角色编辑（新增）
     path('admin/users/<int:user_id>/info/', csrf_exempt(UserEditAPIView.as_view()), name='api_user_info_edit'),  # 用户信息编辑（新增）
     path('admin/dashboard/', AdminDashboardAPIView.as_view(), name='api_admin_dashboard'),  # 管理面板（新增）
+    path('admin/analytics/', AdminAnalyticsAPIView.as_view(), name='api_admin_analytics'),  # 发布审核统计
     path('admin/users/<int:user_id>/', csrf_exempt(UserEditAPIView.as_view()), name='api_user_edit'),  # 用户编辑（新增）
+
+    # 上传文件浏览（只查询文件索引）
+    path('admin/files/', FileAdminListAPIView.as_view(), name='api_admin_files'),
+    path('admin/files/<int:file_id>/', csrf_exempt(FileAdminDetailAPIView.as_view()), name='api_admin_file_detail'),  # 删除文件
 ]
@@ -81,14 +81,17 @@ def sort_content_by_category(content_items, is_deadline_content=False):
     返回:
         dict: 分类后的内容字典
     """
-    college, club, lecture, other = [], [], [], []
+    categorized = {
+        Content.CATEGORY_COLLEGE: [],
+        Content.CATEGORY_CLUB: [],
+        Content.CATEGORY_LECTURE: [],
+        Content.CATEGORY_OTHER: [],
+    }
 
     for content_item in content_items:
         # 提取通用字段
         title = content_item.short_title if content_item.short_title else content_item.title
         link = content_item.link
-        tag = content_item.tag
-        type_ = content_item.type
         id = content_item.id
 
         # 构造内容项
@@ -121,21 +124,14 @@ def sort_content_by_category(content_items, is_deadline_content=False):
                 "id": id
             }
 
-        # 根据标签或类型分类
-        if (tag == "讲座" or type_ == "讲座"):
-            lecture.append(item)
-        elif tag == "院级活动":
-            college.append(item)
-        elif tag == "社团活动":
-            club.append(item)
-        else:
-            other.append(item)
+        # 分类已在保存时由标签/类型计算（Content.category）
+        categorized.get(content_item.category, categorized[Content.CATEGORY_OTHER]).append(item)
 
     return {
-        "college": college,
-        "club": club,
-        "lecture": lecture,
-        "other": other
+        "college": categorized[Content.CATEGORY_COLLEGE],
+        "club": categorized[Content.CATEGORY_CLUB],
+        "lecture": categorized[Content.CATEGORY_LECTURE],
+        "other": categorized[Content.CATEGORY_OTHER]
     }
 
 
@@ -13,11 +13,16 @@ from .auth import (
 )
 from .content import (
     ContentListAPIView,
+    ContentFacetsAPIView,
+    ContentChangesAPIView,
     ContentCreateAPIView,
     ContentDetailAPIView,
+    ContentSimilarAPIView,
     ContentModifyAPIView,
     ContentSubmitAPIView,
     ContentReviewAPIView,
+    ReviewQueueAPIView,
+    ContentReleaseAPIView,
     ContentRecallAPIView,
     ContentCancelAPIView,
     ContentAdminStatusAPIView,
@@ -27,6 +32,9 @@ from .admin import (
     UserRoleEditAPIView,
     UserEditAPIView,
     AdminDashboardAPIView,
+    AdminAnalyticsAPIView,
+    FileAdminListAPIView,
+    FileAdminDetailAPIView,
 )
 from .publish import (
     PublishAPIView,
@@ -37,8 +45,19 @@ from .export import (
     ExportLatexAPIView,
     ExportDataAPIView,
 )
+from .events import (
+    EventStreamAPIView,
+)
+from .media import (
+    MediaFileView,
+)
 from .utility import (
     UnifiedUploadAPIView,
+    UploadCheckAPIView,
+    UploadSessionAPIView,
+    UploadSessionDetailAPIView,
+    UploadChunkAPIView,
+    UploadSessionFinalizeAPIView,
     SearchAPIView,
     PreviewAPIView,
 )
@@ -52,11 +71,16 @@ __all__ = [
     'ChangePasswordAPIView',
     # Content views
     'ContentListAPIView',
+    'ContentFacetsAPIView',
+    'ContentChangesAPIView',
     'ContentCreateAPIView',
     'ContentDetailAPIView',
+    'ContentSimilarAPIView',
     'ContentModifyAPIView',  # POST: 描述(已废弃), PATCH: 更新
     'ContentSubmitAPIView',
     'ContentReviewAPIView',
+    'ReviewQueueAPIView',
+    'ContentReleaseAPIView',
     'ContentRecallAPIView',
     'ContentCancelAPIView',
     'ContentAdminStatusAPIView',
@@ -65,6 +89,9 @@ __all__ = [
     'UserRoleEditAPIView',
     'UserEditAPIView',
     'AdminDashboardAPIView',
+    'AdminAnalyticsAPIView',
+    'FileAdminListAPIView',
+    'FileAdminDetailAPIView',
     # Publish views
     'PublishAPIView',
     # Export views
@@ -72,8 +99,17 @@ __all__ = [
     'ExportTypstAPIView',
     'ExportLatexAPIView',
     'ExportDataAPIView',
+    # Event views
+    'EventStreamAPIView',
+    # Media views
+    'MediaFileView',
     # Utility views
     'UnifiedUploadAPIView',
+    'UploadCheckAPIView',
+    'UploadSessionAPIView',
+    'UploadSessionDetailAPIView',
+    'UploadChunkAPIView',
+    'UploadSessionFinalizeAPIView',
     'SearchAPIView',
     'PreviewAPIView',
 ]
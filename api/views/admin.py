@@ -1,7 +1,7 @@
 """
 管理员视图
 
-包含：用户列表、用户角色编辑、用户编辑、管理面板数据
+包含：用户列表、用户角色编辑、用户编辑、管理面板数据、发布审核统计、上传文件浏览
 """
 
 import logging
@@ -16,9 +16,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from django_models.models import User_info, Content
-from api.serializers import UserSerializer
+from api.serializers import UserSerializer, UserListSerializer, UploadFileSerializer
 from api.permissions import IsAdmin
 from api.services.user_service import UserService
+from api.services.analytics_service import AnalyticsService
+from api.services.file_index_service import FileIndexService
 from api.services.content_service import ContentService
 from api.core.exceptions import APIException
 
@@ -28,7 +30,9 @@ logger = logging.getLogger(__name__)
 class UserAdminListAPIView(APIView):
     """
     用户列表 API
-    GET: 获取用户列表（支持分页、排序、搜索、权限筛选）
+    GET: 获取用户列表（支持页码/游标分页、排序、前缀搜索、权限筛选，附带每个用户的内容数）
+
+    传入 cursor 参数（第一页为空字符串，之后为上一页的 next_cursor）时使用游标分页
     """
     permission_classes = [IsAuthenticated, IsAdmin]
 
@@ -41,6 +45,7 @@ class UserAdminListAPIView(APIView):
             sort_order = request.query_params.get('order', 'desc')
             query = request.query_params.get('q', '')
             role_filter_str = request.query_params.get('role', '')
+            cursor = request.query_params.get('cursor')
 
             # 验证分页大小
             legal_sizes = [10, 20, 50, 100, 1000]
@@ -64,11 +69,20 @@ class UserAdminListAPIView(APIView):
                 sort_field=sort_field,
                 sort_order=sort_order,
                 query=query,
-                role_filter=role_filter
+                role_filter=role_filter,
+                cursor=cursor
             )
 
             # 序列化结果
-            serializer = UserSerializer(result['results'], many=True, context={'request': request})
+            serializer = UserListSerializer(result['results'], many=True, context={'request': request})
+
+            if cursor is not None:
+                return Response({
+                    'page_size': page_size,
+                    'next_cursor': result['next_cursor'],
+                    'has_more': result['has_more'],
+                    'results': serializer.data
+                })
 
             return Response({
                 'count': result['count'],
@@ -234,3 +248,109 @@ class AdminDashboardAPIView(APIView):
                 {'success': False, 'message': e.message},
                 status=e.status
             )
+
+
+class AdminAnalyticsAPIView(APIView):
+    """
+    发布审核统计（只读每日汇总表）
+
+    GET /api/admin/analytics/?start=2026-09-01&end=2026-09-30&users=20
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        try:
+            users_str = request.query_params.get('users', '')
+            report = AnalyticsService.get_report(
+                start=request.query_params.get('start'),
+                end=request.query_params.get('end'),
+                user_limit=int(users_str) if users_str.isdigit() else None,
+            )
+
+            return Response({
+                'success': True,
+                **report
+            })
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
+
+class FileAdminListAPIView(APIView):
+    """
+    上传文件列表（只查询文件索引，不扫描目录）
+
+    GET /api/admin/files/?page=1&page_size=20&sort=modified_at&order=desc&q=&owner_id=&referenced=&ext=
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        try:
+            try:
+                page = int(request.query_params.get('page', 1))
+                page_size = int(request.query_params.get('page_size', 20))
+            except ValueError:
+                page, page_size = 1, 20
+            if page_size not in [20, 50, 100, 200]:
+                page_size = 20
+
+            owner_id_str = request.query_params.get('owner_id', '')
+            owner_id = int(owner_id_str) if owner_id_str.isdigit() else None
+
+            referenced_str = request.query_params.get('referenced', '').lower()
+            referenced = {'true': True, 'false': False}.get(referenced_str)
+
+            result = FileIndexService.list_files(
+                query=request.query_params.get('q', ''),
+                owner_id=owner_id,
+                referenced=referenced,
+                extension=request.query_params.get('ext', ''),
+                sort_field=request.query_params.get('sort', 'modified_at'),
+                sort_order=request.query_params.get('order', 'desc'),
+                page=page,
+                page_size=page_size,
+            )
+
+            serializer = UploadFileSerializer(result['results'], many=True)
+
+            return Response({
+                'count': result['count'],
+                'page': page,
+                'page_size': page_size,
+                'total_pages': result['total_pages'],
+                'results': serializer.data
+            })
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class FileAdminDetailAPIView(APIView):
+    """
+    删除上传文件
+
+    DELETE /api/admin/files/<file_id>/?force=true
+    文件仍被内容引用时返回 409，force=true 强制删除
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def delete(self, request, file_id):
+        try:
+            force = request.query_params.get('force', 'false').lower() == 'true'
+            entry = FileIndexService.delete_file(file_id, request.user, force=force)
+
+            return Response({
+                'success': True,
+                'message': '文件已删除',
+                'path': entry.path
+            })
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
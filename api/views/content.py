@@ -1,13 +1,12 @@
 """
 内容管理视图
 
-包含：内容列表/创建、详情/更新/删除、描述、审核、撤回、取消
+包含：内容列表/创建、分面计数、增量变更、详情/更新/删除、描述、审核、审核队列、撤回、取消
 """
 
 import logging
 
 import logging
-from datetime import datetime
 
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -24,10 +23,13 @@ from api.serializers import (
     ContentUpdateSerializer,
 )
 from api.permissions import IsEditorOrAdmin, IsOwnerOrAdmin, IsCreatorOrAdmin, IsAdmin
-from api.services import ContentService
+from api.services import ContentService, DuplicateService
+from api.services.content_facet_service import ContentFacetService
 from api.services.base_service import BaseService
-from api.core.exceptions import APIException
-from api.config.constants import ALLOWED_CONTENT_STATUSES
+from api.services.change_feed_service import ChangeFeedService
+from api.services.review_queue_service import ReviewQueueService
+from api.core.exceptions import APIException, ValidationError
+from api.config.app_config import app_config
 
 
 logger = logging.getLogger(__name__)
@@ -50,68 +52,14 @@ class ContentListAPIView(generics.ListAPIView):
         - 管理员：可以看到所有状态（包括 terminated）
         - 普通用户：只能看到活跃状态（排除 terminated）
         """
-        # 管理员可以看到所有状态
-        if self.request.user.has_admin_perm:
-            return Content.objects.all().order_by('-updated_at')
-
-        # 普通用户只能看到活跃状态（排除 terminated）
-        return Content.objects.filter(status__in=ALLOWED_CONTENT_STATUSES).order_by('-updated_at')
+        return ContentFacetService.visible_contents(self.request.user).order_by('-updated_at')
 
     def list(self, request, *args, **kwargs):
         """使用服务层分页"""
         queryset = self.filter_queryset(self.get_queryset())
 
-        # 状态过滤（支持多值）
-        status_param = request.query_params.get('status')
-        if status_param:
-            # 支持逗号分隔的多值: ?status=draft,pending
-            status_values = [s.strip() for s in status_param.split(',')]
-            queryset = queryset.filter(status__in=status_values)
-
-        # 类型过滤（支持多值）
-        type_param = request.query_params.get('type')
-        if type_param:
-            # 支持逗号分隔的多值: ?type=教务,竞赛
-            type_values = [t.strip() for t in type_param.split(',')]
-            queryset = queryset.filter(type__in=type_values)
-
-        # 搜索
-        query = request.query_params.get('q', '')
-        if query:
-            queryset = queryset.filter(title__icontains=query)
-
-        # ==================== 发布相关查询参数 ====================
-
-        # 发布日期范围过滤
-        publish_start_date = request.query_params.get('publish_start_date')
-        publish_end_date = request.query_params.get('publish_end_date')
-        if publish_start_date and publish_end_date:
-            try:
-                start = datetime.strptime(publish_start_date, '%Y-%m-%d')
-                end = datetime.strptime(publish_end_date, '%Y-%m-%d')
-                start_of_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
-                end_of_day = end.replace(hour=23, minute=59, second=59, microsecond=999999)
-                queryset = queryset.filter(
-                    publish_at__gte=start_of_day,
-                    publish_at__lte=end_of_day
-                )
-            except ValueError:
-                logger.warning(f"无效的发布日期格式: start={publish_start_date}, end={publish_end_date}")
-
-        # 截止日期过滤（DDL 查询）
-        deadline_end_date = request.query_params.get('deadline_end_date')
-        if deadline_end_date:
-            try:
-                end_of_day = datetime.strptime(deadline_end_date, '%Y-%m-%d')
-                end_of_day = end_of_day.replace(hour=23, minute=59, second=59, microsecond=999999)
-                queryset = queryset.filter(deadline__gt=end_of_day)
-            except ValueError:
-                logger.warning(f"无效的截止日期格式: {deadline_end_date}")
-
-        # 只返回已发布内容
-        only_published = request.query_params.get('only_published', 'false').lower() == 'true'
-        if only_published:
-            queryset = queryset.filter(status='published')
+        # 筛选（状态、类型、分类、搜索、发布日期、截止日期、只看已发布；与分面计数共用）
+        queryset = ContentFacetService.apply_filters(queryset, request.query_params)
 
         # 排序
         sort_field = request.query_params.get('sort', 'updated_at')
@@ -139,6 +87,77 @@ class ContentListAPIView(generics.ListAPIView):
         return Response(result)
 
 
+class ContentFacetsAPIView(APIView):
+    """
+    内容分面计数 API
+    GET: 当前筛选条件下各状态、类型、标签的内容数（筛选参数与可见性同内容列表）
+
+    GET /api/contents/facets/?status=draft,pending&type=讲座&q=
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            result = ContentFacetService.get_facets(request.user, request.query_params)
+
+            return Response({
+                'success': True,
+                **result
+            })
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
+
+class ContentChangesAPIView(APIView):
+    """
+    内容增量变更 API
+    GET: 获取游标之后创建、更新、删除（含状态变更）的内容
+
+    GET /api/contents/changes/?since=<cursor>&limit=200
+    - 不带 since：只返回当前最新游标，客户端应先拉取全量列表再开始增量同步
+    - contents：需要新增/覆盖到本地的内容（已按当前用户可见性过滤）
+    - deleted_ids：需要从本地移除的内容 ID
+    - has_more 为 true 时应立即用新游标继续拉取
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            since = self._parse_int(request.query_params.get('since'), 'since')
+            limit = self._parse_int(request.query_params.get('limit'), 'limit')
+            if limit is None:
+                limit = ChangeFeedService.DEFAULT_LIMIT
+
+            result = ChangeFeedService.get_changes(request.user, since=since, limit=limit)
+
+            serializer = ContentSerializer(result['contents'], many=True, context={'request': request})
+            return Response({
+                'success': True,
+                'cursor': result['cursor'],
+                'has_more': result['has_more'],
+                'contents': serializer.data,
+                'deleted_ids': result['deleted_ids'],
+                'changes': result['changes'],
+            })
+        except APIException as e:
+            return Response({
+                'success': False,
+                'message': e.message
+            }, status=e.status)
+
+    @staticmethod
+    def _parse_int(value, name):
+        """解析非负整数查询参数"""
+        if value in (None, ''):
+            return None
+        if not str(value).isdigit():
+            raise ValidationError(f'参数 {name} 必须是非负整数')
+        return int(value)
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ContentCreateAPIView(APIView):
     """
@@ -150,10 +169,15 @@ class ContentCreateAPIView(APIView):
     def post(self, request):
         """使用服务层创建内容"""
         try:
-            content = ContentService.create_content(request.user, request.data)
+            content, created = ContentService.create_content(request.user, request.data)
             serializer = ContentSerializer(content, context={'request': request})
+            if not created:
+                return Response({**serializer.data, 'duplicate': True}, status=status.HTTP_200_OK)
             logger.info(f"创建内容成功: id={content.id}, title={content.title}")
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response({
+                **serializer.data,
+                'likely_duplicates': DuplicateService.likely_duplicates(content),
+            }, status=status.HTTP_201_CREATED)
         except APIException as e:
             logger.error(f"创建内容失败: {e.message}")
             return Response({
@@ -189,6 +213,27 @@ class ContentDetailAPIView(generics.RetrieveAPIView):
             }, status=e.status)
 
 
+class ContentSimilarAPIView(APIView):
+    """
+    疑似重复内容 API
+    GET: 获取与指定内容标题、正文相近的其他内容（需要 Editor 权限）
+    """
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+
+    def get(self, request, pk):
+        try:
+            content = BaseService.get_object_or_404(Content, pk, '内容不存在')
+            return Response({
+                'success': True,
+                'data': DuplicateService.find_similar_to(content),
+            })
+        except APIException as e:
+            return Response({
+                'success': False,
+                'message': e.message
+            }, status=e.status)
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ContentModifyAPIView(APIView):
     """
@@ -273,6 +318,85 @@ class ContentReviewAPIView(APIView):
             }, status=e.status)
 
 
+@method_decorator(csrf_exempt, name='dispatch')
+class ReviewQueueAPIView(APIView):
+    """
+    审核队列 API（需要 Editor 权限）
+    GET: 获取自己当前持有的领取
+    POST: 领取下一批待审核内容（按截止时间、创建时间优先），同时续期已持有的领取
+
+    POST 请求参数：
+    - count (可选): 本次新领取条数，默认 1，最大 REVIEW_CLAIM_MAX_COUNT
+    """
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+
+    def get(self, request):
+        try:
+            contents = ReviewQueueService.get_my_claims(request.user)
+            return self._queue_response(request, contents)
+        except APIException as e:
+            return Response({
+                'success': False,
+                'message': e.message
+            }, status=e.status)
+
+    def post(self, request):
+        try:
+            count = request.data.get('count', 1)
+            try:
+                count = int(count)
+            except (TypeError, ValueError):
+                raise ValidationError('参数 count 必须是整数')
+
+            contents = ReviewQueueService.claim_next(request.user, count)
+            logger.info(f"领取审核任务: user={request.user.username}, held={len(contents)}")
+            return self._queue_response(request, contents)
+        except APIException as e:
+            logger.error(f"领取审核任务失败: user={request.user.username} - {e.message}")
+            return Response({
+                'success': False,
+                'message': e.message
+            }, status=e.status)
+
+    @staticmethod
+    def _queue_response(request, contents):
+        """审核队列响应（附带领取过期时间和疑似重复内容）"""
+        serializer = ContentSerializer(contents, many=True, context={'request': request})
+        data = serializer.data
+        duplicates = DuplicateService.find_similar_for_contents(contents)
+        for item, content in zip(data, contents):
+            item['claim_expires_at'] = ReviewQueueService.claim_expires_at(content)
+            item['likely_duplicates'] = duplicates.get(content.id, [])
+        return Response({
+            'success': True,
+            'claim_ttl_seconds': app_config.REVIEW_CLAIM_TTL_SECONDS,
+            'data': data,
+        })
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ContentReleaseAPIView(APIView):
+    """
+    释放审核领取 API
+    POST: 将已领取的内容放回审核队列（需要 Editor 权限，管理员可释放他人的领取）
+    """
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+
+    def post(self, request, pk):
+        try:
+            released = ReviewQueueService.release(pk, request.user)
+            return Response({
+                'success': True,
+                'message': '已放回审核队列' if released else '内容未被领取',
+            })
+        except APIException as e:
+            logger.error(f"释放审核领取失败: {pk} - {e.message}")
+            return Response({
+                'success': False,
+                'message': e.message
+            }, status=e.status)
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ContentRecallAPIView(APIView):
     """
@@ -0,0 +1,149 @@
+"""
+事件推送视图
+
+包含：Server-Sent Events 推送通道（审核/发布面板实时更新）
+"""
+
+import json
+import logging
+import time
+
+from django.http import StreamingHttpResponse
+
+from rest_framework import renderers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.config.app_config import app_config
+from api.permissions import IsEditorOrAdmin
+from api.services.event_service import broadcaster, change_log_poller, EVENT_TYPES, EVENT_RESYNC
+
+
+logger = logging.getLogger(__name__)
+
+
+class EventStreamRenderer(renderers.BaseRenderer):
+    """
+    text/event-stream 渲染器
+
+    EventSource 请求头为 Accept: text/event-stream，需要声明该媒体类型才能通过 DRF 内容协商；
+    正常情况下视图直接返回 StreamingHttpResponse，此渲染器只用于渲染错误响应（401/403）。
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return f'event: error\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'.encode('utf-8')
+
+
+class Subscription:
+    """
+    SSE 响应体：迭代事件流，响应关闭时注销订阅者
+
+    StreamingHttpResponse 会在响应结束时调用 close()；生成器尚未开始迭代就被关闭时不会执行其 finally，
+    因此注销放在这里而不是生成器中。
+    """
+
+    def __init__(self, iterator):
+        self._iterator = iterator
+        self._closed = False
+
+    def __iter__(self):
+        return self._iterator
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._iterator.close()
+            broadcaster.unsubscribe()
+
+
+class EventStreamAPIView(APIView):
+    """
+    事件推送 API（SSE）
+
+    GET /api/events/stream/?types=content.status,export.completed&mine=true
+
+    查询参数：
+    - types: 订阅的事件类型（逗号分隔，默认全部）
+    - mine: 为 true 时只推送与自己相关的事件（自己创建/描述/操作的内容、自己触发的导出）
+    - last_event_id: 断线重连时的最后事件 ID（EventSource 会自动通过 Last-Event-ID 请求头携带）
+
+    连接保持 SSE_MAX_STREAM_SECONDS 秒后由服务端关闭，客户端按 retry 间隔自动重连。
+    每个进程同时保持的连接不超过 SSE_MAX_SUBSCRIBERS，超出返回 503（带 Retry-After）。
+    """
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+    renderer_classes = [renderers.JSONRenderer, EventStreamRenderer]
+
+    def get(self, request):
+        types_param = request.query_params.get('types', '')
+        types = {t.strip() for t in types_param.split(',') if t.strip() in EVENT_TYPES} or set(EVENT_TYPES)
+        only_mine = request.query_params.get('mine', 'false').lower() == 'true'
+        user_id = request.user.id
+
+        last_event_id = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('last_event_id')
+        after_seq = broadcaster.parse_id(last_event_id)
+
+        # 每个连接占用一个工作线程，连接数有上限，避免占满线程池
+        if not broadcaster.subscribe():
+            retry_after = app_config.SSE_BUSY_RETRY_SECONDS
+            logger.warning(f"SSE 连接数已达上限, user={request.user.username}, limit={broadcaster.max_subscribers}")
+            return Response(
+                {'success': False, 'message': '实时推送连接数已满，请稍后重试', 'retry_after': retry_after},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(retry_after)},
+            )
+        change_log_poller.ensure_running()
+
+        logger.info(
+            f"SSE 连接建立, user={request.user.username}, types={sorted(types)}, "
+            f"mine={only_mine}, last_event_id={last_event_id}"
+        )
+
+        def stream():
+            seq = after_seq
+            yield f'retry: {app_config.SSE_RETRY_MILLISECONDS}\n\n'
+
+            if seq is None:
+                # 新连接：只推送此后的事件
+                seq = broadcaster.last_seq
+            elif seq < 0:
+                # 进程已重启或 ID 来自其他进程：无法回放，通知客户端重新同步
+                seq = broadcaster.last_seq
+                yield self._format(EVENT_RESYNC, broadcaster.format_id(seq), {'reason': 'unknown_event_id'})
+
+            deadline = time.monotonic() + app_config.SSE_MAX_STREAM_SECONDS
+            last_write = time.monotonic()
+            while time.monotonic() < deadline:
+                events, overflowed = broadcaster.wait_for_events(seq, app_config.SSE_HEARTBEAT_SECONDS)
+                if overflowed:
+                    yield self._format(EVENT_RESYNC, broadcaster.format_id(seq), {'reason': 'buffer_overflow'})
+                    last_write = time.monotonic()
+
+                for event in events:
+                    seq = event.seq
+                    if event.type not in types:
+                        continue
+                    if only_mine and user_id not in event.user_ids:
+                        continue
+                    yield self._format(event.type, broadcaster.format_id(event.seq), event.data)
+                    last_write = time.monotonic()
+
+                # 长时间没有写出（无事件或事件均被过滤）时发送心跳
+                if time.monotonic() - last_write >= app_config.SSE_HEARTBEAT_SECONDS:
+                    yield ': heartbeat\n\n'
+                    last_write = time.monotonic()
+
+        response = StreamingHttpResponse(Subscription(stream()), content_type='text/event-stream; charset=utf-8')
+        response['Cache-Control'] = 'no-cache'
+        # 禁止 Nginx 缓冲，保证事件即时送达
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    def _format(event_type: str, event_id: str, data) -> str:
+        """格式化为 SSE 报文"""
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        return f'id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n'
@@ -17,7 +17,8 @@ from rest_framework.views import APIView
 
 from api.permissions import IsEditorOrAdmin
 from api.services.export_service import ExportService
-from api.core.exceptions import APIException
+from api.core.exceptions import APIException, TooManyRequestsError
+from api.throttling import ExportThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +33,11 @@ class ExportPDFAPIView(APIView):
     支持两种模式：
     1. 按日期生成：{"date": "2026-02-11"}
     2. 按选中内容生成：{"content_ids": [1, 2, 3]}
+
+    按用户和全局限流，编译同时只进行 TYPST_MAX_CONCURRENT 个，超出返回 429（带 Retry-After）
     """
     permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+    throttle_classes = [ExportThrottle]
 
     @method_decorator(csrf_exempt)
     def post(self, request):
@@ -60,7 +64,7 @@ class ExportPDFAPIView(APIView):
                     )
 
             # 调用导出服务
-            result = ExportService.generate_pdf(date_str=date_str, content_ids=content_ids)
+            result = ExportService.generate_pdf(date_str=date_str, content_ids=content_ids, user=request.user)
 
             if not result['success']:
                 return Response(
@@ -72,10 +76,17 @@ class ExportPDFAPIView(APIView):
                 'success': True,
                 'message': 'PDF 生成成功',
                 'pdf_url': result['pdf_url'],
+                'latest_url': result.get('latest_url'),
                 'pdf_path': result['pdf_path'],
                 'count': result.get('count', 0),
                 'due_contents': result.get('due_contents', {})
             })
+        except TooManyRequestsError as e:
+            return Response(
+                {'success': False, 'message': e.message, 'retry_after': e.retry_after},
+                status=e.status,
+                headers={'Retry-After': str(e.retry_after)}
+            )
         except APIException as e:
             logger.error(f"PDF 生成失败: {e.message}")
             return Response(
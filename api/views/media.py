@@ -0,0 +1,162 @@
+"""
+媒体文件视图
+
+包含：上传图片、衍生图、导出 PDF 的下载（/media/<path>）
+
+- 文件名带内容摘要的文件返回一年有效期的 immutable 缓存头，其余文件每次使用 ETag/Last-Modified 协商
+- 配置 MEDIA_ACCEL_REDIRECT（Nginx）或 MEDIA_SENDFILE（Apache/lighttpd）时只返回响应头，
+  由前端 Web 服务器发送文件内容（Range 请求也由其处理），Python 进程不再逐块传输
+- 未配置时使用 FileResponse（WSGI 服务器支持 wsgi.file_wrapper 时走 sendfile），并支持单段 Range 请求
+"""
+
+import logging
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+from django.views import View
+
+from api.config.app_config import app_config
+from api.core.media import is_immutable, resolve_media_path
+
+
+logger = logging.getLogger(__name__)
+
+RANGE_REGEX = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Range 响应读取块大小
+RANGE_BLOCK_SIZE = 64 * 1024
+
+
+class MediaFileView(View):
+    """
+    媒体文件下载
+
+    GET/HEAD /media/<path>
+    """
+
+    def get(self, request, path):
+        absolute = resolve_media_path(path)
+        if absolute is None:
+            raise Http404('文件不存在')
+
+        stat = os.stat(absolute)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        last_modified = int(stat.st_mtime)
+
+        if self._not_modified(request, etag, last_modified):
+            response = HttpResponseNotModified()
+            self._set_cache_headers(response, path, etag, last_modified)
+            return response
+
+        content_type, encoding = mimetypes.guess_type(absolute)
+        content_type = content_type or 'application/octet-stream'
+
+        if settings.MEDIA_ACCEL_REDIRECT:
+            # Nginx internal location，例如 location /_media/ { internal; alias /path/to/static/; }
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = f"{settings.MEDIA_ACCEL_REDIRECT.rstrip('/')}/{quote(path)}"
+        elif settings.MEDIA_SENDFILE:
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = absolute
+        else:
+            response = self._file_response(request, absolute, stat.st_size, content_type, etag, last_modified)
+
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Accept-Ranges'] = 'bytes'
+        self._set_cache_headers(response, path, etag, last_modified)
+        return response
+
+    @staticmethod
+    def _not_modified(request, etag: str, last_modified: int) -> bool:
+        """条件请求：客户端缓存仍有效"""
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return if_modified_since is not None and last_modified <= if_modified_since
+
+    @staticmethod
+    def _set_cache_headers(response, path: str, etag: str, last_modified: int) -> None:
+        """设置缓存相关响应头"""
+        if is_immutable(path):
+            response['Cache-Control'] = f'public, max-age={app_config.MEDIA_IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = 'public, no-cache'
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+
+    @staticmethod
+    def _parse_range(request, size: int, etag: str, last_modified: int):
+        """
+        解析单段 Range 请求头
+
+        Returns:
+            None 表示返回完整文件；(start, end) 为闭区间；False 表示范围无法满足
+        """
+        header = request.META.get('HTTP_RANGE')
+        if not header:
+            return None
+
+        # If-Range 与当前版本不一致时忽略 Range，返回完整文件
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if if_range and if_range != etag and parse_http_date_safe(if_range) != last_modified:
+            return None
+
+        match = RANGE_REGEX.match(header.strip())
+        if not match:
+            # 多段或格式不支持：返回完整文件
+            return None
+
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            # bytes=-N：最后 N 个字节
+            length = int(last)
+            if length == 0:
+                return False
+            return max(0, size - length), size - 1
+
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            return False
+        return start, end
+
+    @staticmethod
+    def _file_response(request, absolute: str, size: int, content_type: str, etag: str, last_modified: int):
+        """由 Django 发送文件内容（开发环境或未配置前端服务器转发时）"""
+        byte_range = MediaFileView._parse_range(request, size, etag, last_modified)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        if byte_range is None:
+            return FileResponse(open(absolute, 'rb'), content_type=content_type)
+
+        start, end = byte_range
+        length = end - start + 1
+
+        def stream():
+            with open(absolute, 'rb') as f:
+                f.seek(start)
+                remaining = length
+                while remaining > 0:
+                    block = f.read(min(RANGE_BLOCK_SIZE, remaining))
+                    if not block:
+                        break
+                    remaining -= len(block)
+                    yield block
+
+        response = StreamingHttpResponse(stream(), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(length)
+        return response
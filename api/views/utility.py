@@ -1,7 +1,7 @@
 """
 工具视图
 
-包含：统一上传、搜索、预览
+包含：统一上传、图片预检、分片上传、搜索、预览
 """
 
 import logging
@@ -24,7 +24,14 @@ from api.permissions import IsEditorOrAdmin
 from api.services.file_service import FileService
 from api.services.content_service import ContentService
 from api.services.pdf_service import PDFService
-from api.core.exceptions import APIException
+from api.services.blob_service import BlobService
+from api.services.upload_session_service import UploadSessionService
+from api.services.url_import_service import UrlImportService
+from api.services.duplicate_service import DuplicateService
+from api.config.app_config import app_config
+from api.core.exceptions import APIException, ValidationError, PayloadTooLargeError
+from api.core.media import media_url
+from api.throttling import SearchThrottle, UploadChunkThrottle, UploadThrottle
 
 
 logger = logging.getLogger(__name__)
@@ -36,16 +43,26 @@ class UnifiedUploadAPIView(APIView):
     支持：纯文本消息、URL 粘贴、图片上传（多图）
     """
     permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+    throttle_classes = [UploadThrottle]
 
     @method_decorator(csrf_exempt)
     def post(self, request):
         try:
+            # 解析 multipart 之前按 Content-Length 拒绝过大的请求，避免先把请求体读完
+            content_length = _content_length(request)
+            if content_length and content_length > app_config.UPLOAD_MAX_REQUEST_SIZE:
+                raise PayloadTooLargeError(
+                    f'请求体超过限制 ({app_config.UPLOAD_MAX_REQUEST_SIZE / 1024 / 1024}MB)，大文件请使用分片上传'
+                )
+
             upload_type = request.data.get('upload_type')
 
             if upload_type == 'text':
                 return self._handle_text_upload(request)
             elif upload_type == 'url':
                 return self._handle_url_upload(request)
+            elif upload_type == 'urls':
+                return self._handle_urls_upload(request)
             elif upload_type == 'image':
                 return self._handle_image_upload(request)
             else:
@@ -62,11 +79,16 @@ class UnifiedUploadAPIView(APIView):
     def _handle_text_upload(self, request):
         """处理纯文本消息上传"""
         try:
-            # 使用服务层创建内容
-            content = ContentService.create_content(request.user, request.data)
+            # 使用服务层创建内容（链接已存在时返回已有内容）
+            content, created = ContentService.create_content(request.user, request.data)
 
             content_serializer = ContentSerializer(content, context={'request': request})
-            return Response(content_serializer.data, status=status.HTTP_201_CREATED)
+            if not created:
+                return Response({**content_serializer.data, 'duplicate': True}, status=status.HTTP_200_OK)
+            return Response({
+                **content_serializer.data,
+                'likely_duplicates': DuplicateService.likely_duplicates(content),
+            }, status=status.HTTP_201_CREATED)
         except APIException as e:
             return Response(
                 {'success': False, 'message': e.message},
@@ -83,10 +105,12 @@ class UnifiedUploadAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # 使用服务层创建内容
-            content = FileService.create_content_from_url(url, request.user)
+            # 使用服务层创建内容（链接已存在时返回已有内容）
+            content, created = FileService.create_content_from_url(url, request.user)
 
             content_serializer = ContentSerializer(content, context={'request': request})
+            if not created:
+                return Response({**content_serializer.data, 'duplicate': True}, status=status.HTTP_200_OK)
             return Response(content_serializer.data, status=status.HTTP_201_CREATED)
         except APIException as e:
             return Response(
@@ -94,22 +118,67 @@ class UnifiedUploadAPIView(APIView):
                 status=e.status
             )
 
+    def _handle_urls_upload(self, request):
+        """处理 URL 批量导入（标题等信息由后台获取后写回）"""
+        try:
+            if hasattr(request.data, 'getlist') and len(request.data.getlist('urls')) > 1:
+                raw = request.data.getlist('urls')
+            else:
+                raw = request.data.get('urls')
+            urls = UrlImportService.parse_urls(raw)
+
+            result = UrlImportService.import_urls(urls, request.user)
+
+            return Response({
+                'success': True,
+                'message': f"已导入 {len(result['created'])} 个链接，标题将在后台获取",
+                'created': result['created'],
+                'existing': result['existing'],
+                'skipped': result['skipped']
+            }, status=status.HTTP_201_CREATED)
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
     def _handle_image_upload(self, request):
         """处理图片上传（支持多图）"""
         try:
             images = request.FILES.getlist('images')
-            if not images:
+            # 已存储图片只需提交摘要（见 /api/upload/check/），无需重复上传文件内容
+            if hasattr(request.data, 'getlist'):
+                digests = request.data.getlist('digests')
+            else:
+                digests = request.data.get('digests', [])
+            if not images and not digests:
                 return Response(
                     {'success': False, 'message': '未找到图片文件'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # 使用服务层上传图片
-            result = FileService.upload_multiple_images(images, request.user)
+            # 使用服务层上传图片（逐个文件返回结果，部分失败不影响其他文件）
+            results = []
+            if digests:
+                results.extend(FileService.reference_existing_images(digests, request.user))
+            if images:
+                results.extend(FileService.upload_multiple_images(images, request.user))
+            image_urls = [result['url'] for result in results if result['success']]
+            failed_count = len(results) - len(image_urls)
+
+            if not image_urls:
+                return Response({
+                    'success': False,
+                    'message': '图片上传失败',
+                    'results': results
+                }, status=status.HTTP_400_BAD_REQUEST)
 
             return Response({
                 'success': True,
-                'image_urls': result
+                'message': f'{failed_count} 个文件上传失败' if failed_count else '上传成功',
+                'image_urls': image_urls,
+                'failed_count': failed_count,
+                'results': results
             }, status=status.HTTP_201_CREATED)
         except APIException as e:
             return Response(
@@ -118,6 +187,185 @@ class UnifiedUploadAPIView(APIView):
             )
 
 
+@method_decorator(csrf_exempt, name='dispatch')
+class UploadCheckAPIView(APIView):
+    """
+    图片预检 API
+
+    POST /api/upload/check/
+    请求体: {"digests": ["<sha256>", ...]}
+
+    返回已存储的图片，客户端只需上传 missing 中的文件，其余通过 digests 参数引用
+    """
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+
+    def post(self, request):
+        try:
+            digests = request.data.get('digests', [])
+            if not isinstance(digests, list):
+                raise ValidationError('digests 必须是数组')
+
+            blobs = BlobService.lookup(digests)
+            existing = {digest: media_url(blob.path) for digest, blob in blobs.items()}
+            missing = [digest for digest in digests if (digest or '').lower() not in existing]
+
+            return Response({
+                'success': True,
+                'existing': existing,
+                'missing': missing
+            })
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
+
+def _content_length(request):
+    """读取请求头 Content-Length（缺失或非法时返回 None）"""
+    try:
+        return int(request.META.get('CONTENT_LENGTH') or '')
+    except ValueError:
+        return None
+
+
+def _session_data(session):
+    """分片上传会话的响应数据"""
+    return {
+        'session_id': session.id,
+        'filename': session.filename,
+        'status': session.status,
+        'total_size': session.total_size,
+        'chunk_size': session.chunk_size,
+        'total_chunks': session.total_chunks,
+        'received_size': session.received_size,
+        'next_chunk': session.received_chunks,
+    }
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class UploadSessionAPIView(APIView):
+    """
+    创建分片上传会话
+
+    POST /api/upload/sessions/
+    请求体: {"filename": "a.jpg", "size": 8388608, "digest": "<sha256，可选>"}
+    """
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+    throttle_classes = [UploadThrottle]
+
+    def post(self, request):
+        try:
+            size = request.data.get('size')
+            try:
+                size = int(size)
+            except (TypeError, ValueError):
+                raise ValidationError('size 必须是整数')
+
+            session = UploadSessionService.create_session(
+                request.user,
+                request.data.get('filename', ''),
+                size,
+                digest=request.data.get('digest') or None,
+            )
+            return Response({'success': True, **_session_data(session)}, status=status.HTTP_201_CREATED)
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class UploadSessionDetailAPIView(APIView):
+    """
+    分片上传会话
+
+    GET /api/upload/sessions/<session_id>/ - 查询进度（断点续传时从 next_chunk 继续）
+    DELETE /api/upload/sessions/<session_id>/ - 取消上传
+    """
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+    throttle_classes = [UploadChunkThrottle]
+
+    def get(self, request, session_id):
+        try:
+            session = UploadSessionService.get_session(session_id, request.user)
+            return Response({'success': True, **_session_data(session)})
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
+    def delete(self, request, session_id):
+        try:
+            UploadSessionService.abort(session_id, request.user)
+            return Response({'success': True, 'message': '已取消上传'})
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class UploadChunkAPIView(APIView):
+    """
+    上传分片
+
+    PUT /api/upload/sessions/<session_id>/chunks/<index>/
+    请求体: 分片原始字节（Content-Type: application/octet-stream）
+
+    分片数据直接从请求流写入暂存文件，不经过 DRF 解析器。
+    """
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+    throttle_classes = [UploadChunkThrottle]
+
+    def put(self, request, session_id, index):
+        try:
+            session = UploadSessionService.write_chunk(
+                session_id,
+                request.user,
+                index,
+                request.stream,
+                _content_length(request),
+            )
+            return Response({'success': True, **_session_data(session)})
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class UploadSessionFinalizeAPIView(APIView):
+    """
+    完成分片上传
+
+    POST /api/upload/sessions/<session_id>/finalize/
+    请求体: {"digest": "<sha256，可选>"}
+
+    返回与 /api/upload/ 单个文件相同的结果，之后通过 digests 参数引用该图片
+    """
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+    throttle_classes = [UploadThrottle]
+
+    def post(self, request, session_id):
+        try:
+            stored = UploadSessionService.finalize(
+                session_id,
+                request.user,
+                digest=request.data.get('digest') or None,
+            )
+            return Response({'success': True, **stored})
+        except APIException as e:
+            return Response(
+                {'success': False, 'message': e.message},
+                status=e.status
+            )
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class SearchAPIView(APIView):
     """
@@ -127,6 +375,7 @@ class SearchAPIView(APIView):
     请求体: {"q": "搜索关键词"}
     """
     permission_classes = [IsAuthenticated]
+    throttle_classes = [SearchThrottle]
 
     def post(self, request):
         try:
@@ -2,11 +2,12 @@ import logging
 from datetime import datetime
 
 
-from flask import render_template, request, session, flash, redirect, url_for
+from flask import render_template, request, flash, redirect, url_for
 from flask.views import MethodView
 
+from api.services.change_feed_service import ChangeFeedService
 from common.decorator.permission_required import PermissionDecorators
-from django_models.models import User_info, Content
+from django_models.models import Content, ContentChangeLog
 
 
 class AddDeadlineView(MethodView):
@@ -43,7 +44,7 @@ class AddDeadlineView(MethodView):
         publish_time = request.form.get('publish_time', today)
         due_time = request.form.get('due_time', today)
 
-        user = User_info.objects.get(username=session['username'])
+        user = PermissionDecorators.require_current_user()
 
         publish_datetime = datetime.strptime(publish_time, '%Y-%m-%d') if publish_time else None
         deadline_datetime = datetime.strptime(due_time, '%Y-%m-%d') if due_time else None
@@ -67,6 +68,7 @@ class AddDeadlineView(MethodView):
             tag=tag,
             type="DDLOnly",
         )
+        ChangeFeedService.record_content(news, ContentChangeLog.ACTION_CREATE, user)
         logging.info(f"用户 {user.username} 添加了截止日期条目: {short_title}")
         flash("Deadline entry added successfully")
         return redirect(url_for('main'))
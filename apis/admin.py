@@ -1,6 +1,6 @@
 import logging
 
-from flask import session, render_template, request
+from flask import render_template, request
 from flask.views import MethodView
 
 from common.content_status import STATUS_TERMINATED
@@ -85,7 +85,7 @@ class AdminView(MethodView):
         }
 
         try:
-            current_user = User_info.objects.get(username=session['username'])
+            current_user = PermissionDecorators.require_current_user()
             current_user_id = current_user.id
         except User_info.DoesNotExist:
             current_user_id = None
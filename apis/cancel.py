@@ -3,10 +3,11 @@ from flask import redirect, url_for, flash, request, session
 from flask.views import MethodView
 from django.db import transaction
 
+from api.services.change_feed_service import ChangeFeedService
 from common.methods.save_context import get_main_page_context
 from common.decorator.permission_required import PermissionDecorators
 from common.content_status import STATUS_DRAFT
-from django_models.models import Content, User_info
+from django_models.models import Content, ContentChangeLog, User_info
 
 
 class CancelView(MethodView):
@@ -37,15 +38,17 @@ class CancelView(MethodView):
         try:
             with transaction.atomic():
                 content = Content.objects.select_for_update().get(id=entry_id)
-                current_user = User_info.objects.get(username=session['username'])
+                current_user = PermissionDecorators.require_current_user()
 
                 self.logger.info(
                     f"用户 {current_user.username}(ID:{current_user.id}) 开始取消内容(ID:{content.id})，原状态: {content.status}")
 
                 # 将条目状态设置为草稿状态
+                old_status = content.status
                 content.status = STATUS_DRAFT
                 content.reviewer_id = current_user.id
                 content.save(update_fields=['status', 'reviewer_id'])
+                ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, current_user, old_status)
 
                 self.logger.info(
                     f"取消完成，内容ID: {content.id}，新状态: {content.status}，操作者: {current_user.username}")
@@ -3,9 +3,10 @@ import logging
 from flask import session, flash, redirect, url_for, request
 from flask.views import MethodView
 
+from api.services.change_feed_service import ChangeFeedService
 from common.content_status import ContentStatus,STATUS_TERMINATED
 from common.decorator.permission_required import PermissionDecorators
-from django_models.models import Content, User_info
+from django_models.models import Content, ContentChangeLog, User_info
 
 class DeleteEntryView(MethodView):
     """
@@ -39,7 +40,7 @@ class DeleteEntryView(MethodView):
             return redirect(url_for('login'))
 
         try:
-            current_user = User_info.objects.get(username=session['username'])
+            current_user = PermissionDecorators.require_current_user()
             # 检查是否有编辑或管理员权限
             if not (current_user.has_editor_permission() or current_user.has_admin_permission()):
                 self.logger.warning(f"用户 {current_user.username} 尝试删除内容但没有足够权限")
@@ -52,7 +53,8 @@ class DeleteEntryView(MethodView):
 
         try:
             content = Content.objects.get(id=entry_id)
-            current_user = User_info.objects.get(username=session['username'])
+            current_user = PermissionDecorators.require_current_user()
+            old_status = content.status
             # 使用ContentStatus类处理状态转换
             if current_user.has_admin_permission():
                 content.status = STATUS_TERMINATED
@@ -67,6 +69,7 @@ class DeleteEntryView(MethodView):
             # 应用状态转换结果
                 content.status = content_status.string_en()
                 content.save(update_fields=['status', 'updated_at'])
+            ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, current_user, old_status)
 
             self.logger.info(
                 f"用户 {current_user.username} 将内容 '{content.title}' (ID: {entry_id}) 状态设置为terminated")
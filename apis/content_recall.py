@@ -3,9 +3,10 @@ import logging
 from flask import session, flash, redirect, url_for
 from flask.views import MethodView
 
+from api.services.change_feed_service import ChangeFeedService
 from common.content_status import STATUS_DRAFT
 from common.decorator.permission_required import PermissionDecorators
-from django_models.models import Content, User_info
+from django_models.models import Content, ContentChangeLog, User_info
 
 class RecallEntryView(MethodView):
     """
@@ -38,7 +39,7 @@ class RecallEntryView(MethodView):
             return redirect(url_for('login'))
 
         try:
-            current_user = User_info.objects.get(username=session['username'])
+            current_user = PermissionDecorators.require_current_user()
             # 检查是否有管理员权限
             if not current_user.has_admin_permission():
                 self.logger.warning(f"用户 {current_user.username} 尝试删除内容但没有足够权限")
@@ -51,10 +52,12 @@ class RecallEntryView(MethodView):
 
         try:
             content = Content.objects.get(id=entry_id)
-            current_user = User_info.objects.get(username=session['username'])
+            current_user = PermissionDecorators.require_current_user()
             if current_user.has_admin_permission():
+                old_status = content.status
                 content.status = STATUS_DRAFT
                 content.save(update_fields=['status', 'updated_at'])
+                ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, current_user, old_status)
             self.logger.info(
                 f"用户 {current_user.username} 将内容 '{content.title}' (ID: {entry_id}) 状态设置为draft")
             flash("条目已召回")
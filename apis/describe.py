@@ -5,10 +5,11 @@ from django.db import transaction
 from flask import render_template, request, session, redirect, url_for, flash
 from flask.views import MethodView
 
+from api.services.change_feed_service import ChangeFeedService
 from common.methods.save_context import get_main_page_context
 from common.content_status import ContentStatus
 from common.decorator.permission_required import PermissionDecorators
-from django_models.models import Content, User_info
+from django_models.models import Content, ContentChangeLog, User_info
 
 
 class DescribeView(MethodView):
@@ -69,7 +70,7 @@ class DescribeView(MethodView):
         try:
             with transaction.atomic():
                 content = Content.objects.select_for_update().get(id=entry_id)
-                current_user = User_info.objects.get(username=session['username'])
+                current_user = PermissionDecorators.require_current_user()
 
                 self.logger.info(
                     f"用户 {current_user.username}(ID:{current_user.id}) 开始描述内容(ID:{content.id})，原状态: {content.status}")
@@ -104,11 +105,13 @@ class DescribeView(MethodView):
                 content.deadline = deadline_value
 
                 # 使用ContentStatus控制状态转移: draft->pending
+                old_status = content.status
                 status_manager = ContentStatus(content.status)
                 if status_manager.submit():
                     content.status = status_manager.string_en()
                     content.save(update_fields=['describer_id', 'title', 'short_title', 'content',
                                               'type', 'tag', 'deadline', 'status', 'updated_at'])
+                    ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, current_user, old_status)
                     self.logger.info(
                         f"描述完成，内容ID: {content.id}，新状态: {content.status}，操作者: {current_user.username}")
                     flash("内容已更新并提交审核")
@@ -59,7 +59,8 @@ class LatexView(MethodView):
             title = escape_latex(title)
             title = title.rstrip('\r\n')
             description = escape_latex(description).replace('\n', r'\\')
-            if tag in ["讲座", "院级活动", "社团活动"]:
+            # 与旧版一致只按标签判断（不看类型）；标签按 JSON 数组/逗号分隔解析
+            if Content.category_for_tags(Content.parse_tags(tag), None) != Content.CATEGORY_OTHER:
                 latex_output += r"\subsection{" + title + "} % " + tag + " describer: " + str(describer) + "\n"
             else:
                 latex_output += r"\section{" + title + "} % " + tag + " describer: " + str(describer) + "\n"
@@ -1,6 +1,6 @@
 import logging
 
-from flask import session, render_template, request
+from flask import render_template, request
 from flask.views import MethodView
 
 from common.content_status import STATUS_TERMINATED
@@ -91,7 +91,7 @@ class MainView(MethodView):
         }
 
         try:
-            current_user = User_info.objects.get(username=session['username'])
+            current_user = PermissionDecorators.require_current_user()
             current_user_id = current_user.id
             admin_flag = current_user.has_admin_permission()
             editor_flag = current_user.has_editor_permission()
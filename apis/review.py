@@ -7,10 +7,11 @@ from django.db import transaction
 from flask import render_template, flash, redirect, url_for, request, session
 from flask.views import MethodView
 
+from api.services.change_feed_service import ChangeFeedService
 from common.content_status import STATUS_REVIEWED, STATUS_PUBLISHED, STATUS_DRAFT, STATUS_PENDING
 from common.decorator.permission_required import PermissionDecorators
 from common.methods.save_context import get_main_page_context
-from django_models.models import Content, User_info
+from django_models.models import Content, ContentChangeLog, User_info
 
 
 class ReviewView(MethodView):
@@ -157,12 +158,15 @@ class ReviewView(MethodView):
             content.tag = tag
             content.short_title = short_title
             content.save()
+            ChangeFeedService.record_content(content, ContentChangeLog.ACTION_UPDATE, current_user)
             return "内容已修改"
 
-        elif action == 'approve':
+        old_status = content.status
+        if action == 'approve':
             content.status = STATUS_REVIEWED
             update_fields.append('status')
             content.save(update_fields=update_fields)
+            ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, current_user, old_status)
             return "内容已批准"
 
         elif action == 'publish':
@@ -172,12 +176,14 @@ class ReviewView(MethodView):
             content.publish_at = datetime.now()
             update_fields.append('publish_at')
             content.save(update_fields=update_fields)
+            ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, current_user, old_status)
             return "内容已发布"
 
         elif action == 'reject':
             content.status = STATUS_DRAFT
             update_fields.append('status')
             content.save(update_fields=update_fields)
+            ChangeFeedService.record_content(content, ContentChangeLog.ACTION_STATUS, current_user, old_status)
             return "内容已拒绝并转为草稿"
 
     def post(self, entry_id):
@@ -213,7 +219,7 @@ class ReviewView(MethodView):
 
             with transaction.atomic():
                 content = Content.objects.select_for_update().get(id=entry_id)
-                current_user = User_info.objects.get(username=session['username'])
+                current_user = PermissionDecorators.require_current_user()
 
                 # 检查内容状态是否允许审核
                 if content.status not in [STATUS_DRAFT, STATUS_PENDING, STATUS_REVIEWED]:
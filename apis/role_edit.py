@@ -39,7 +39,7 @@ class EditRoleView(MethodView):
             return redirect(url_for('login'))
 
         try:
-            current_user = User_info.objects.get(username=session['username'])
+            current_user = PermissionDecorators.require_current_user()
             # 检查是否有管理员权限
             if not current_user.has_admin_permission():
                 self.logger.warning(f"用户 {current_user.username} 尝试更改权限位没有足够权限")
@@ -52,7 +52,7 @@ class EditRoleView(MethodView):
 
         try:
             user = User_info.objects.get(id=user_id)
-            current_user =  User_info.objects.get(username=session['username'])
+            current_user =  PermissionDecorators.require_current_user()
             # 定义权限位
             if permission == 'editor':
                 if action == 'grant':
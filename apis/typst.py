@@ -80,8 +80,6 @@ class TypstView(MethodView):
             # 提取通用字段
             title = content_item.short_title if content_item.short_title else content_item.title
             link = content_item.link
-            tag = content_item.tag
-            type = content_item.type
             id = content_item.id
             
             # 构造内容项
@@ -110,12 +108,12 @@ class TypstView(MethodView):
                     "id": id
                 }
             
-            # 根据标签或类型分类
-            if (tag == "讲座" or type == "讲座"):
+            # 分类已在保存时由标签/类型计算（Content.category）
+            if content_item.category == Content.CATEGORY_LECTURE:
                 lecture.append(item)
-            elif tag == "院级活动":
+            elif content_item.category == Content.CATEGORY_COLLEGE:
                 college.append(item)
-            elif tag == "社团活动":
+            elif content_item.category == Content.CATEGORY_CLUB:
                 club.append(item)
             else:
                 other.append(item)
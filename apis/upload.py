@@ -5,9 +5,10 @@ from datetime import datetime
 from flask import render_template, request, session, flash, redirect, url_for
 from flask.views import MethodView
 
+from api.services.change_feed_service import ChangeFeedService
 from common.content_status import STATUS_PENDING
 from common.decorator.permission_required import PermissionDecorators
-from django_models.models import User_info, Content
+from django_models.models import User_info, Content, ContentChangeLog
 from common.methods.save_context import get_main_page_context
 
 
@@ -55,7 +56,7 @@ class UploadView(MethodView):
 
         # 获取当前登录用户信息
         try:
-            user = User_info.objects.get(username=username)
+            user = PermissionDecorators.require_current_user()
         except User_info.DoesNotExist:
             self.logger.error(f"用户 {username} 不存在，请重新登录")
             flash('User not found. Please log in again.')
@@ -92,6 +93,7 @@ class UploadView(MethodView):
                 tag=tag,
                 deadline=deadline,
             )
+            ChangeFeedService.record_content(content, ContentChangeLog.ACTION_CREATE, user)
 
             # 记录内容创建操作的日志
             self.logger.info(f"用户 {user.username} 创建了新内容 ID: {content.id} {title}")
@@ -1,5 +1,3 @@
-import datetime
-import hashlib
 import logging
 import os
 
@@ -7,11 +5,14 @@ import os
 from flask import request, flash, redirect, url_for, session, current_app
 from flask.views import MethodView
 
+from api.services.change_feed_service import ChangeFeedService
 from common.content_status import STATUS_DRAFT
 from common.decorator.permission_required import PermissionDecorators
 from common.global_static import UPLOAD_FILE_PATH
 from common.methods.allowed_file import allowed_image
-from django_models.models import User_info, Content
+from common.methods.hash_file import iter_file_chunks
+from common.methods.save_upload import save_upload
+from django_models.models import Content, ContentChangeLog
 from common.methods.save_context import get_main_page_context
 
 class UploadImageView(MethodView):
@@ -50,32 +51,21 @@ class UploadImageView(MethodView):
         if file and allowed_image(file.filename):
             filename = file.filename
 
-            # 检查是否已存在相同文件名的内容
-            user = User_info.objects.get(username)
+            user = PermissionDecorators.require_current_user()
 
             # 使用文件名作为标题
             title = os.path.splitext(filename)[0]
 
-            # 生成基于文件名和文件内容的hash值，用于创建新的唯一文件名
-            file_content = file.read()
-            file_hash = hashlib.md5(filename.encode('utf-8') + file_content).hexdigest()
-
-            # 重置文件指针到开始位置，以便后续保存文件
-            file.seek(0)
-
-            # 获取文件扩展名并创建新的文件名
+            # 流式写盘的同时计算摘要（不把整个文件读入内存），按摘要命名保存
             _, extension = os.path.splitext(filename)
-            new_filename = f"{file_hash}{extension}"
-
-            # 创建当月的文件夹
-            now = datetime.now()
-            month_folder = now.strftime("%Y-%m")
-            upload_folder = os.path.join(current_app.root_path, UPLOAD_FILE_PATH, month_folder)
-            os.makedirs(upload_folder, exist_ok=True)
-
-            # 保存文件到服务器
-            file_path = os.path.join(upload_folder, new_filename)
-            file.save(file_path)
+            upload_root = os.path.join(current_app.root_path, UPLOAD_FILE_PATH)
+            try:
+                saved = save_upload(iter_file_chunks(file.stream), upload_root, extension)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"保存图片文件失败: {filename}, {str(e)}")
+                flash(f"保存失败: {str(e)}")
+                return redirect(url_for('main'))
+            file_path = saved['absolute_path']
 
             try:
                 # 创建新的Content对象
@@ -92,8 +82,9 @@ class UploadImageView(MethodView):
                 # 添加图片到image_list
                 if content.add_image(file_path):
                     content.save()
+                    ChangeFeedService.record_content(content, ContentChangeLog.ACTION_CREATE, user)
                     self.logger.info(
-                        f"用户 {user.username} 上传了图片: {filename}，保存为: {os.path.join(month_folder, new_filename)}")
+                        f"用户 {user.username} 上传了图片: {filename}，保存为: {saved['relative_path']}")
                     flash("图片上传成功，并已添加到数据库")
                 else:
                     self.logger.error(f"图片处理失败: {filename}")
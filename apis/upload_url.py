@@ -1,15 +1,16 @@
 import logging
-from urllib.parse import urlparse
 
 from flask import request, flash, redirect, url_for, session
 from flask.views import MethodView
 
-from common.content_status import STATUS_DRAFT
+from api.services.change_feed_service import ChangeFeedService
+from common.content_status import STATUS_DRAFT, STATUS_TERMINATED
+from common.methods.canonical_url import canonical_url, link_hash
 from common.decorator.permission_required import PermissionDecorators
 from common.methods.fetch_title import fetch_title
 from common.methods.is_valid_url import is_valid_url
 from common.methods.save_context import get_main_page_context
-from django_models.models import Content, User_info
+from django_models.models import Content, ContentChangeLog, User_info
 
 
 class UploadUrlView(MethodView):
@@ -49,15 +50,30 @@ class UploadUrlView(MethodView):
                 sort_order=page_params['sort_order']
             ))
 
-        parsed = urlparse(link)
-        canonical_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        # 规范化链接相同的内容已存在时不重复创建（按 link_hash 索引查找，无需先获取标题）
+        existing = Content.objects.filter(link_hash=link_hash(link)).exclude(
+            status=STATUS_TERMINATED
+        ).order_by('id').first()
+        if existing is not None:
+            self.logger.info(f"链接已存在: {link}, content_id={existing.id}")
+            flash(f'该链接已存在：{existing.title}')
+            context_id = request.args.get('context_id')
+            page_params = get_main_page_context(context_id)
+            return redirect(url_for(
+                'main',
+                page=page_params['page'],
+                page_size=page_params['page_size'],
+                q=page_params['q'],
+                sort_field=page_params['sort_field'],
+                sort_order=page_params['sort_order']
+            ))
 
         title = fetch_title(link)
         self.logger.info(f"获取链接标题: {title} from {link}")
 
         # Get user ID
         try:
-            user = User_info.objects.get(username=session['username'])
+            user = PermissionDecorators.require_current_user()
         except User_info.DoesNotExist:
             self.logger.error(f"用户 {session['username']} 不存在")
             flash('用户不存在，请重新登录')
@@ -73,16 +89,17 @@ class UploadUrlView(MethodView):
             ))
 
         try:
-            Content.objects.create(
+            content = Content.objects.create(
                 creator_id=user.id,
                 describer_id=user.id,
                 title=title,
                 short_title=title,
                 content='',
-                link=canonical_url,
+                link=canonical_url(link),
                 status=STATUS_DRAFT,
                 type='新建URL',
             )
+            ChangeFeedService.record_content(content, ContentChangeLog.ACTION_CREATE, user)
             self.logger.info(f"用户 {user.username} 通过链接创建了内容: {title}")
             flash('地址添加成功')
         except Exception as e:
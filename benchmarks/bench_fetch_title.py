@@ -0,0 +1,117 @@
+"""
+网页标题获取性能测试
+
+在本机启动一个模拟网页服务器（每个请求固定延迟），对比：
+1. 旧实现：每次 requests.get 新建连接、串行请求、字符串累加后整体 lower()
+2. 新实现：共用连接池 + 并发（冷缓存）
+3. 新实现：缓存命中
+
+用法:
+    python -m benchmarks.bench_fetch_title
+    python -m benchmarks.bench_fetch_title --urls 64 --latency 0.05 --head-kb 256
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from bs4 import BeautifulSoup
+
+from common.methods import fetch_title as fetch_title_module
+
+
+def make_page(index: int, head_kb: int) -> bytes:
+    """生成测试页面：<head> 中填充 head_kb KB 的内联脚本，标题在填充之后"""
+    filler = ('<script>var x = "' + 'a' * 1000 + '";</script>\n') * head_kb
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">\n'
+        f'{filler}'
+        f'<title>测试页面 {index}</title></head>'
+        '<body>' + '<p>正文</p>' * 1000 + '</body></html>'
+    ).encode('utf-8')
+
+
+def start_server(latency: float, head_kb: int):
+    """启动模拟网页服务器，返回 (server, 端口)"""
+    pages = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(latency)
+            index = int(self.path.strip('/').split('/')[-1] or 0)
+            body = pages.setdefault(index, make_page(index, head_kb))
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def handle_error(self, request, client_address):
+            # 客户端读到</head>后提前断开连接属于正常情况
+            pass
+
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+def legacy_fetch_title(url):
+    """旧实现（用于对比）：每次新建连接，字符串累加并对整个字符串 lower()"""
+    headers = {'User-Agent': fetch_title_module.REQUEST_HEADERS['User-Agent']}
+    with requests.get(url, headers=headers, stream=True, timeout=5) as response:
+        response.raise_for_status()
+        partial_content = ""
+        for chunk in response.iter_content(chunk_size=4096):
+            partial_content += chunk.decode('utf-8', errors='replace')
+            if "</head>" in partial_content.lower():
+                soup = BeautifulSoup(partial_content, 'html.parser')
+                title_tag = soup.find("title")
+                if title_tag and title_tag.string:
+                    return title_tag.string.strip()
+    return fetch_title_module.FETCH_FAILED_TITLE
+
+
+def timed(label: str, func, count: int) -> float:
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for title in result if title == fetch_title_module.FETCH_FAILED_TITLE)
+    print(f"{label:<24} {elapsed * 1000:>10.1f} ms  {count / elapsed:>10.1f} 个/秒  失败 {failed}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='网页标题获取性能测试')
+    parser.add_argument('--urls', type=int, default=32, help='URL 数量')
+    parser.add_argument('--latency', type=float, default=0.05, help='模拟服务器每个请求的延迟（秒）')
+    parser.add_argument('--head-kb', type=int, default=64, help='<head> 中标题之前的填充大小（KB）')
+    args = parser.parse_args()
+
+    server, port = start_server(args.latency, args.head_kb)
+    urls = [f'http://127.0.0.1:{port}/page/{i}' for i in range(args.urls)]
+    print(f"URL 数 {args.urls}，服务器延迟 {args.latency * 1000:.0f} ms，<head> 填充 {args.head_kb} KB")
+
+    try:
+        legacy = timed('旧实现（串行、新连接）', lambda: [legacy_fetch_title(url) for url in urls], len(urls))
+
+        fetch_title_module.clear_title_cache()
+        pooled = timed('连接池 + 并发', lambda: list(fetch_title_module.fetch_titles(urls).values()), len(urls))
+        cached = timed('缓存命中', lambda: list(fetch_title_module.fetch_titles(urls).values()), len(urls))
+
+        print(f"\n连接池 + 并发加速 {legacy / pooled:.1f}x，缓存命中加速 {legacy / cached:.0f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+会话存储每请求开销基准测试
+
+模拟已登录的 API 请求：SessionMiddleware 读取 Cookie → 读取会话中的用户ID → 响应（会话未修改，不写入），
+比较各会话存储每个请求的数据库查询数与耗时：
+1. db：原配置，每个请求查询 django_session
+2. cached_db + 文件缓存（默认配置）：读缓存，未命中才查数据库
+3. cached_db + 进程内缓存
+4. signed_cookies：只校验签名
+
+使用临时 SQLite 数据库代替 MySQL（MySQL 每次查询还有网络/套接字往返，实际差距更大），不需要配置文件。
+
+用法:
+    python -m benchmarks.bench_session
+    python -m benchmarks.bench_session --requests 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import django
+from django.conf import settings
+
+
+ENGINES = [
+    ('db', 'django.contrib.sessions.backends.db', 'file'),
+    ('cached_db + 文件缓存', 'django.contrib.sessions.backends.cached_db', 'file'),
+    ('cached_db + 进程内缓存', 'django.contrib.sessions.backends.cached_db', 'locmem'),
+    ('signed_cookies', 'django.contrib.sessions.backends.signed_cookies', 'file'),
+]
+
+
+def configure(workdir: str) -> None:
+    settings.configure(
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(workdir, 'db.sqlite3')}},
+        CACHES={
+            'file': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                     'LOCATION': os.path.join(workdir, 'cache')},
+            'locmem': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        },
+        INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.sessions'],
+        SECRET_KEY='benchmark',
+        USE_TZ=False,
+        DEFAULT_AUTO_FIELD='django.db.models.BigAutoField',
+    )
+    django.setup()
+
+
+def bench(engine: str, cache_alias: str, requests: int):
+    from django.conf import settings as live_settings
+    from django.contrib.sessions.middleware import SessionMiddleware
+    from django.db import connection
+    from django.http import HttpResponse
+    from django.test.client import RequestFactory
+    from django.test.utils import CaptureQueriesContext, override_settings
+
+    with override_settings(SESSION_ENGINE=engine, SESSION_CACHE_ALIAS=cache_alias):
+        from importlib import import_module
+        store = import_module(engine).SessionStore()
+        store['_auth_user_id'] = '1'
+        store['_auth_user_backend'] = 'api.authentication.User_infoBackend'
+        store.save()
+        session_key = store.session_key
+
+        def view(request):
+            request.session.get('_auth_user_id')
+            return HttpResponse('ok')
+
+        middleware = SessionMiddleware(view)
+        factory = RequestFactory()
+        cookie_name = live_settings.SESSION_COOKIE_NAME
+
+        # 预热（cached_db 首次读取会写入缓存）
+        request = factory.get('/api/contents/')
+        request.COOKIES[cookie_name] = session_key
+        middleware(request)
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(requests):
+                request = factory.get('/api/contents/')
+                request.COOKIES[cookie_name] = session_key
+                middleware(request)
+            elapsed = time.perf_counter() - start
+
+    return len(queries) / requests, elapsed / requests * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='会话存储每请求开销')
+    parser.add_argument('--requests', type=int, default=2000, help='每种存储模拟的请求数')
+    parser.add_argument('--sessions', type=int, default=50000, help='django_session 表中预先写入的会话数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        configure(workdir)
+        from datetime import datetime, timedelta
+        from django.contrib.sessions.models import Session
+        from django.core.management import call_command
+
+        call_command('migrate', 'sessions', verbosity=0)
+        expire = datetime.now() + timedelta(days=14)
+        Session.objects.bulk_create(
+            [Session(session_key=f'{i:032x}', session_data='', expire_date=expire) for i in range(args.sessions)],
+            batch_size=1000,
+        )
+
+        print(f"django_session 行数: {args.sessions}，每种存储 {args.requests} 个请求\n")
+        print(f"{'会话存储':<24}{'查询/请求':>10}{'耗时/请求':>14}")
+        baseline = None
+        for name, engine, cache_alias in ENGINES:
+            queries, micros = bench(engine, cache_alias, args.requests)
+            baseline = baseline or micros
+            print(f"{name:<24}{queries:>10.2f}{micros:>11.1f} µs   ({baseline / micros:.1f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,58 @@
 from functools import wraps
 
-from flask import session, redirect, url_for, abort
+from flask import session, redirect, url_for, abort, g
 
+from config.load_config import GLOBAL_CONFIG
 from django_models.models import User_info
 
 
+# 是否跨请求缓存当前用户（使用 Django 缓存，见 api/core/user_cache.py；修改用户时自动失效）
+USER_CACHE_ENABLED = GLOBAL_CONFIG.get_config_value("FLASK_user_cache", "false").lower() == "true"
+
+_NOT_LOADED = object()
+
+
+def _load_user(username):
+    """按用户名查询用户（启用缓存时优先读取缓存）"""
+    if USER_CACHE_ENABLED:
+        from api.core import user_cache
+        return user_cache.get_user_by_username(username)
+    return User_info.objects.filter(username=username).first()
+
+
 class PermissionDecorators:
     """权限装饰器类，包含常用的权限控制装饰器"""
 
+    @staticmethod
+    def current_user():
+        """
+        获取当前登录用户
+
+        每个请求只查询一次，结果保存在 flask.g 中，供各装饰器和视图共用
+
+        返回:
+            User_info: 当前用户；未登录或用户不存在时返回 None
+        """
+        user = g.get('current_user', _NOT_LOADED)
+        if user is _NOT_LOADED:
+            username = session.get('username')
+            user = _load_user(username) if username else None
+            g.current_user = user
+        return user
+
+    @staticmethod
+    def require_current_user():
+        """
+        获取当前登录用户，不存在时抛出 User_info.DoesNotExist（与直接查询的行为一致）
+
+        返回:
+            User_info: 当前用户
+        """
+        user = PermissionDecorators.current_user()
+        if user is None:
+            raise User_info.DoesNotExist(f"用户不存在: {session.get('username')}")
+        return user
+
     @staticmethod
     def login_required(f):
         """
@@ -17,13 +62,11 @@ class PermissionDecorators:
 
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            username = session.get('username')
             # 检查用户是否已登录
-            if not username:
+            if not session.get('username'):
                 return redirect(url_for('login'))
 
-            user = User_info.objects.filter(username=username).first()
-            if not user:
+            if not PermissionDecorators.current_user():
                 return redirect(url_for('login'))
 
             return f(*args, **kwargs)
@@ -39,13 +82,11 @@ class PermissionDecorators:
 
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            username = session.get('username')
-
             # 检查用户是否已登录
-            if not username:
+            if not session.get('username'):
                 abort(401)
 
-            user = User_info.objects.filter(username=username).first()
+            user = PermissionDecorators.current_user()
 
             # 检查用户是否存在以及是否有管理员权限
             if not user or not user.has_admin_permission():
@@ -64,13 +105,11 @@ class PermissionDecorators:
 
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            username = session.get('username')
-
             # 检查用户是否已登录
-            if not username:
+            if not session.get('username'):
                 abort(401)
 
-            user = User_info.objects.filter(username=username).first()
+            user = PermissionDecorators.current_user()
 
             # 检查用户是否存在以及是否有编辑权限
             if not user or not user.has_editor_permission():
@@ -78,4 +117,4 @@ class PermissionDecorators:
 
             return f(*args, **kwargs)
 
-        return decorated_function
\ No newline at end of file
+        return decorated_function
@@ -0,0 +1,85 @@
+import hashlib
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+
+# 不影响页面内容的跟踪参数（分享、统计来源等）
+TRACKING_PARAMS = {
+    'from', 'isappinstalled', 'spm', 'share_token', 'sharer_shareid', 'sharer_sharetime',
+    'scene', 'clicktime', 'enterid', 'subscene', 'ascene', 'devicetype', 'nettype',
+    'abtest_cookie', 'exportkey', 'pass_ticket', 'wx_header', 'chksm',
+    'fbclid', 'gclid', 'yclid', 'mc_cid', 'mc_eid',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# 路径中保留原样的字符（其余按 UTF-8 百分号编码，统一编码形式）
+PATH_SAFE_CHARS = "/:@!$&'()*+,;=-._~"
+
+
+def canonical_url(url: str) -> str:
+    """
+    规范化 URL，使同一页面的不同写法得到相同的字符串
+
+    - 协议、主机名小写，去掉默认端口和主机名末尾的点
+    - 去掉片段（#...）、跟踪参数（utm_*、微信分享参数等），其余查询参数按名称排序
+    - 路径统一百分号编码形式，合并重复的 /，去掉末尾的 /（根路径除外）
+    - 保留原协议和 www. 前缀（部分校内站点只支持 http），规范化结果仍可直接访问
+
+    参数:
+        url (str): 原始 URL
+
+    返回值:
+        str: 规范化后的 URL；无法解析时返回去除首尾空白的原字符串
+    """
+    url = (url or '').strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower().rstrip('.')
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = quote(unquote(parts.path), safe=PATH_SAFE_CHARS)
+    while '//' in path:
+        path = path.replace('//', '/')
+    if len(path) > 1:
+        path = path.rstrip('/')
+    path = path or '/'
+
+    params = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query = urlencode(sorted(params), doseq=True)
+
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def link_hash(url: str) -> str:
+    """
+    链接去重键：规范化 URL 去掉协议和 www. 前缀后的 SHA-1 摘要
+    （http 与 https、有无 www. 视为同一页面）
+
+    参数:
+        url (str): 原始 URL
+
+    返回值:
+        str: 40 位十六进制摘要；空链接返回空字符串
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    key = canonical_url(url)
+    if '://' in key:
+        key = key.split('://', 1)[1]
+    if key.startswith('www.'):
+        key = key[4:]
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
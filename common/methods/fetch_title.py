@@ -1,15 +1,163 @@
+"""
+网页标题获取
+
+- 网页头部按字节流增量解析（见 html_head.py），找到标题即停止读取
+- 所有请求共用一个 requests.Session，按主机复用 HTTP 连接（连接池），不再每次新建连接
+- 进程内同时进行的请求数由信号量限制，批量获取时并发执行
+- 结果按规范化 URL 缓存（LRU + TTL），获取失败的结果也缓存一段较短的时间，避免反复请求不可用的页面
+"""
+
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from common.methods.canonical_url import canonical_url
+from common.methods.html_head import extract_metadata, extract_title
+
+
+logger = logging.getLogger(__name__)
+
+# 获取失败时返回的标题
+FETCH_FAILED_TITLE = '标题获取失败'
+
+# 设置请求头，模拟浏览器访问
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+REQUEST_TIMEOUT = 5  # 连接/读取超时（秒）
+REQUEST_RETRIES = 1  # 连接失败、读取超时、502/503/504 时的重试次数
+CHUNK_SIZE = 4096
+
+MAX_CONCURRENCY = 8  # 进程内同时进行的标题请求数
+POOL_CONNECTIONS = 16  # 连接池缓存的主机数
+POOL_MAXSIZE = MAX_CONCURRENCY  # 每个主机保持的连接数
+
+CACHE_MAX_ENTRIES = 1024
+CACHE_TTL_SECONDS = 6 * 60 * 60  # 成功结果缓存时长
+NEGATIVE_CACHE_TTL_SECONDS = 5 * 60  # 失败结果缓存时长
+
+
+class TTLCache:
+    """线程安全的 LRU 缓存，每个条目有独立的过期时间"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Tuple[bool, Any]:
+        """
+        Returns:
+            (是否命中, 缓存值)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = TTLCache(CACHE_MAX_ENTRIES)
+_semaphore = threading.BoundedSemaphore(MAX_CONCURRENCY)
+_session_lock = threading.Lock()
+_session = None
+
+
+def _get_session() -> requests.Session:
+    """获取共用的 Session（首次使用时创建）"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=REQUEST_RETRIES,
+                    connect=REQUEST_RETRIES,
+                    read=REQUEST_RETRIES,
+                    status=REQUEST_RETRIES,
+                    status_forcelist=(502, 503, 504),
+                    backoff_factor=0.2,
+                    allowed_methods=frozenset(['GET']),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+                session = requests.Session()
+                session.headers.update(REQUEST_HEADERS)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def cache_key(url: str) -> str:
+    """缓存键：规范化 URL（同一页面的不同写法共用缓存）"""
+    return canonical_url(url)
+
+
+def _download_title(url: str) -> Optional[str]:
+    """
+    请求网页并提取标题（不使用缓存）
+
+    Returns:
+        标题；请求失败或页面没有标题时返回 None
+    """
+    with _semaphore:
+        with _get_session().get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            # 分块读取并增量解析，找到标题即停止读取
+            return extract_title(response.iter_content(chunk_size=CHUNK_SIZE), response.headers.get('Content-Type'))
+
+
+def _fetch_cached(url: str) -> Optional[str]:
+    """获取标题（使用缓存），失败返回 None"""
+    key = cache_key(url)
+    hit, title = _cache.get(key)
+    if hit:
+        return title
+
+    try:
+        title = _download_title(url)
+    except Exception as e:
+        # 记录获取标题失败的日志信息
+        logger.warning(f"获取标题失败，URL: {url}, 错误: {str(e)}")
+        title = None
+
+    _cache.set(key, title, CACHE_TTL_SECONDS if title else NEGATIVE_CACHE_TTL_SECONDS)
+    return title
 
 
 def fetch_title(url):
     """
     从指定URL获取网页标题
 
-    该函数通过发送HTTP请求获取网页内容，解析HTML中的<title>标签或og:title元标签来提取网页标题。
-    采用流式下载和部分解析的方式，提高效率并减少内存占用。
+    该函数通过共用连接池发送HTTP请求，解析HTML中的og:title元标签或<title>标签来提取网页标题。
+    采用流式下载和增量解析，找到标题即停止读取；结果（包括失败）按规范化URL缓存。
 
     参数:
         url (str): 目标网页的URL地址
@@ -17,37 +165,80 @@ def fetch_title(url):
     返回值:
         str: 成功时返回网页标题，失败时返回"标题获取失败"
     """
-    # 最多尝试2次获取标题
-    for _ in range(2):
-        try:
-            # 设置请求头，模拟浏览器访问
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            # 发送GET请求，启用流式下载以支持大文件处理
-            with requests.get(url, headers=headers, stream=True, timeout=5) as response:
-                response.raise_for_status()
-                partial_content = ""
-                # 分块读取响应内容，提高处理效率
-                for chunk in response.iter_content(chunk_size=4096):
-                    partial_content += chunk.decode('utf-8', errors='replace')
-                    # 当读取到</head>标签时，解析已获取的内容提取标题
-                    if "</head>" in partial_content.lower():
-                        soup = BeautifulSoup(partial_content, 'html.parser')
-                        # 优先查找Open Graph标题元标签
-                        meta_tag = soup.find("meta", property="og:title")
-                        if meta_tag and meta_tag.get("content"):
-                            return meta_tag.get("content")
-                        # 查找传统的<title>标签
-                        title_tag = soup.find("title")
-                        if title_tag and title_tag.string:
-                            return title_tag.string.strip()
-            # 如果未在<head>内找到标题，则解析完整内容
-            soup = BeautifulSoup(partial_content, 'html.parser')
-            meta_tag = soup.find("meta", property="og:title")
-            if meta_tag and meta_tag.get("content"):
-                return meta_tag.get("content")
-        except Exception as e:
-            # 记录获取标题失败的日志信息
-            logging.warning(f"获取标题失败，URL: {url}, 错误: {str(e)}")
-    return "标题获取失败"
+    return _fetch_cached(url) or FETCH_FAILED_TITLE
+
+
+def fetch_titles(urls: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    并发获取多个网页标题
+
+    参数:
+        urls: URL 列表（重复的 URL 只请求一次）
+        max_workers: 并发线程数，默认 MAX_CONCURRENCY（所有调用共同受信号量限制）
+
+    返回值:
+        dict: {url: 标题}，失败的 URL 对应"标题获取失败"
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+    if len(unique_urls) == 1:
+        return {unique_urls[0]: fetch_title(unique_urls[0])}
+
+    workers = min(max_workers or MAX_CONCURRENCY, len(unique_urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        titles = executor.map(fetch_title, unique_urls)
+        return dict(zip(unique_urls, titles))
+
+
+def _download_metadata(url: str) -> Dict[str, Any]:
+    """
+    请求网页并提取标题、描述和规范链接（不使用缓存）
+
+    Returns:
+        {'title', 'description', 'canonical_url'}；canonical_url 为绝对地址，页面未声明或声明了其他站点时
+        使用跳转后的最终地址
+    """
+    with _semaphore:
+        with _get_session().get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            metadata = extract_metadata(response.iter_content(chunk_size=CHUNK_SIZE), response.headers.get('Content-Type'))
+            final_url = response.url
+
+    canonical_url = urljoin(final_url, metadata['canonical_url']) if metadata['canonical_url'] else None
+    if not canonical_url or urlsplit(canonical_url).scheme not in ('http', 'https') \
+            or urlsplit(canonical_url).hostname != urlsplit(final_url).hostname:
+        canonical_url = final_url
+    metadata['canonical_url'] = canonical_url
+    return metadata
+
+
+def fetch_metadata(url: str) -> Optional[Dict[str, Any]]:
+    """
+    获取网页标题、描述和规范链接（结果与标题分开缓存，失败同样缓存）
+
+    参数:
+        url (str): 目标网页的URL地址
+
+    返回值:
+        dict: {'title', 'description', 'canonical_url'}，缺少的项为 None；请求失败时返回 None
+    """
+    key = ('metadata', cache_key(url))
+    hit, metadata = _cache.get(key)
+    if hit:
+        return metadata
+
+    try:
+        metadata = _download_metadata(url)
+    except Exception as e:
+        logger.warning(f"获取网页信息失败，URL: {url}, 错误: {str(e)}")
+        metadata = None
+
+    succeeded = metadata is not None and metadata['title']
+    _cache.set(key, metadata, CACHE_TTL_SECONDS if succeeded else NEGATIVE_CACHE_TTL_SECONDS)
+    return metadata
+
+
+def clear_title_cache() -> None:
+    """清空标题缓存"""
+    _cache.clear()
@@ -1,5 +1,5 @@
 import hashlib
-from typing import BinaryIO
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
 
 
 def hash_file(file_obj: BinaryIO, algorithm: str = 'md5', chunk_size: int = 8192) -> str:
@@ -32,3 +32,51 @@ def hash_file(file_obj: BinaryIO, algorithm: str = 'md5', chunk_size: int = 8192
 
     except (ValueError, AttributeError) as e:
         raise ValueError(f"不支持的哈希算法: {algorithm}") from e
+
+
+def hash_stream_to_file(chunks: Iterable[bytes], dest_file: BinaryIO, algorithm: str = 'sha256',
+                        max_size: Optional[int] = None) -> Tuple[str, int]:
+    """
+    将数据块写入目标文件，同时计算哈希（单次遍历，不把整个文件读入内存）
+
+    Args:
+        chunks: 数据块迭代器（如 Django UploadedFile.chunks()、Werkzeug FileStorage.stream）
+        dest_file: 二进制写模式打开的目标文件
+        algorithm: 哈希算法，默认为'sha256'
+        max_size: 最大允许字节数，超过时中止写入
+
+    Returns:
+        tuple: (十六进制哈希值, 写入字节数)
+
+    Raises:
+        ValueError: 不支持的哈希算法或超过大小限制
+    """
+    try:
+        hash_func = hashlib.new(algorithm)
+    except ValueError as e:
+        raise ValueError(f"不支持的哈希算法: {algorithm}") from e
+
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise ValueError(f"文件大小超过限制 ({max_size} 字节)")
+        hash_func.update(chunk)
+        dest_file.write(chunk)
+
+    return hash_func.hexdigest(), size
+
+
+def iter_file_chunks(file_obj: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    按块读取文件对象
+
+    Args:
+        file_obj: 二进制模式打开的文件对象
+        chunk_size: 分块大小，默认为64KB
+
+    Yields:
+        bytes: 数据块
+    """
+    while chunk := file_obj.read(chunk_size):
+        yield chunk
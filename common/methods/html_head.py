@@ -0,0 +1,333 @@
+"""
+网页 <head> 增量解析
+
+按字节流逐块解析网页头部并提取标题，找到结果即停止读取：
+- 编码按 BOM > HTTP 响应头 > 前 1024 字节中的 <meta> 声明 的顺序确定，均未声明时
+  按 UTF-8 解码，遇到不合法的字节后改按 GB18030 解码（兼容未声明编码的 GBK 页面）
+- 使用增量解码器，多字节字符跨数据块也能正确解码
+- 读取字节数有上限，页面头部异常巨大时放弃
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, Optional
+
+
+# 最多读取的字节数
+MAX_HEAD_BYTES = 256 * 1024
+
+# 查找 <meta> 编码声明的字节数（与 HTML 标准的预扫描长度一致）
+PRESCAN_BYTES = 1024
+
+META_CHARSET_REGEX = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([a-zA-Z0-9_\-:.]+)', re.IGNORECASE)
+HEADER_CHARSET_REGEX = re.compile(r'charset\s*=\s*["\']?\s*([a-zA-Z0-9_\-:.]+)', re.IGNORECASE)
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+# 页面声明的编码按超集解码（GBK 页面常混入 GB2312 之外的字符）
+ENCODING_ALIASES = {
+    'gb2312': 'gb18030',
+    'gbk': 'gb18030',
+    'x-gbk': 'gb18030',
+    'iso-8859-1': 'cp1252',
+    'latin-1': 'cp1252',
+    'ascii': 'cp1252',
+    'us-ascii': 'cp1252',
+}
+
+# <head> 中允许出现的元素，遇到其他开始标签说明头部已结束
+HEAD_ELEMENTS = {'title', 'meta', 'link', 'script', 'style', 'base', 'noscript', 'template', 'html', 'head'}
+
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """
+    规范化编码名称
+
+    Args:
+        name: 声明的编码名称
+
+    Returns:
+        Python 可用的编码名称；无法识别时返回 None
+    """
+    if not name:
+        return None
+    name = name.strip().lower()
+    name = ENCODING_ALIASES.get(name, name)
+    try:
+        codecs.lookup(name)
+    except LookupError:
+        return None
+    return name
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """从 Content-Type 响应头中取出编码"""
+    if not content_type:
+        return None
+    match = HEADER_CHARSET_REGEX.search(content_type)
+    return normalize_encoding(match.group(1)) if match else None
+
+
+def sniff_encoding(prefix: bytes, header_encoding: Optional[str] = None) -> Optional[str]:
+    """
+    确定页面编码
+
+    Args:
+        prefix: 页面开头的字节（至少 PRESCAN_BYTES 字节，页面更短时为全部内容）
+        header_encoding: Content-Type 响应头声明的编码（已规范化）
+
+    Returns:
+        编码名称；页面未声明编码时返回 None
+    """
+    for bom, encoding in BOMS:
+        if prefix.startswith(bom):
+            return encoding
+    if header_encoding:
+        return header_encoding
+
+    match = META_CHARSET_REGEX.search(prefix[:PRESCAN_BYTES])
+    if match:
+        encoding = normalize_encoding(match.group(1).decode('ascii', errors='ignore'))
+        # 以 ASCII 兼容方式读到的 UTF-16 声明不可信
+        if encoding and not encoding.startswith('utf-16'):
+            return encoding
+    return None
+
+
+class HeadTitleParser(HTMLParser):
+    """
+    从 <head> 中提取标题：优先 og:title，其次 <title>
+
+    找到 og:title 或头部结束（</head>、<body> 或其他正文元素）即完成。
+    <title> 通常写在 og:title 之前，找到 <title> 后继续读到头部结束，以保证 og:title 优先。
+    <head> 中的内联 <svg>（如图标）不表示头部结束；与完整解析页面时一样，取第一个 <title>（包括 SVG 中的）。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.og_title: Optional[str] = None
+        self.title: Optional[str] = None
+        self.done = False
+        self._title_parts = None
+        self._svg_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'meta':
+            attrs = dict(attrs)
+            if (attrs.get('property') or '').lower() == 'og:title' and attrs.get('content'):
+                self.og_title = attrs['content'].strip()
+                self.done = True
+        elif tag == 'title':
+            if self.title is None:
+                self._title_parts = []
+        elif tag == 'svg':
+            self._svg_depth += 1
+        elif tag not in HEAD_ELEMENTS and not self._svg_depth:
+            self.done = True
+
+    def handle_startendtag(self, tag, attrs):
+        # 自闭合的 <svg/> 没有内容，也没有对应的结束标签
+        if tag != 'svg':
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == 'title' and self._title_parts is not None:
+            self.title = ''.join(self._title_parts).strip()
+            self._title_parts = None
+        elif tag == 'svg' and self._svg_depth:
+            self._svg_depth -= 1
+        elif tag == 'head':
+            self.done = True
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+    @property
+    def result(self) -> Optional[str]:
+        """提取到的标题；没有标题时返回 None"""
+        return self.og_title or self.title or None
+
+
+class HeadMetadataParser(HeadTitleParser):
+    """
+    读完整个 <head>，提取标题、描述和规范链接
+
+    标题规则与 HeadTitleParser 相同；描述优先 og:description，其次 <meta name="description">；
+    规范链接优先 <link rel="canonical">，其次 og:url（均为页面中的原始值，可能是相对地址）
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.og_description: Optional[str] = None
+        self.description: Optional[str] = None
+        self.canonical_url: Optional[str] = None
+        self.og_url: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'meta':
+            attrs = dict(attrs)
+            key = (attrs.get('property') or attrs.get('name') or '').lower()
+            content = (attrs.get('content') or '').strip()
+            if not content:
+                return
+            if key == 'og:title' and self.og_title is None:
+                self.og_title = content
+            elif key == 'og:description' and self.og_description is None:
+                self.og_description = content
+            elif key == 'description' and self.description is None:
+                self.description = content
+            elif key == 'og:url' and self.og_url is None:
+                self.og_url = content
+        elif tag == 'link':
+            attrs = dict(attrs)
+            rel = (attrs.get('rel') or '').lower().split()
+            if 'canonical' in rel and attrs.get('href') and self.canonical_url is None:
+                self.canonical_url = attrs['href'].strip()
+        else:
+            super().handle_starttag(tag, attrs)
+
+    @property
+    def result(self) -> Dict[str, Any]:
+        """{'title', 'description', 'canonical_url'}，缺少的项为 None"""
+        return {
+            'title': self.og_title or self.title or None,
+            'description': self.og_description or self.description,
+            'canonical_url': self.canonical_url or self.og_url,
+        }
+
+
+class HeadTitleExtractor:
+    """
+    按字节块增量提取网页标题（parser_class 为 HeadMetadataParser 时提取标题、描述和规范链接）
+
+    用法：
+        extractor = HeadTitleExtractor(content_type)
+        for chunk in chunks:
+            if extractor.feed(chunk):
+                break
+        title = extractor.close()
+    """
+
+    def __init__(self, content_type: Optional[str] = None, max_bytes: int = MAX_HEAD_BYTES,
+                 parser_class=HeadTitleParser):
+        self.header_encoding = charset_from_content_type(content_type)
+        self.max_bytes = max_bytes
+        self.encoding: Optional[str] = None
+        self.bytes_read = 0
+        self._pending = bytearray()
+        self._decoder = None
+        self._parser = parser_class()
+
+    @property
+    def done(self) -> bool:
+        return self._parser.done or self.bytes_read >= self.max_bytes
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        输入一块数据
+
+        Returns:
+            是否已完成（无需继续读取）
+        """
+        if self.done or not chunk:
+            return self.done
+        chunk = chunk[:self.max_bytes - self.bytes_read]
+        self.bytes_read += len(chunk)
+
+        if self._decoder is None:
+            # 编码未确定前先缓存，凑够预扫描长度（或已读到上限）再确定编码
+            self._pending.extend(chunk)
+            if len(self._pending) < PRESCAN_BYTES and not self.done:
+                return False
+            self._start_decoding()
+            return self._parser.done
+
+        self._parser.feed(self._decode(chunk))
+        return self.done
+
+    def close(self):
+        """
+        结束输入
+
+        Returns:
+            解析结果（HeadTitleParser 为标题，没有找到时为 None）
+        """
+        if self._decoder is None:
+            self._start_decoding()
+        if not self._parser.done:
+            self._parser.feed(self._decode(b'', final=True))
+        return self._parser.result
+
+    def _start_decoding(self) -> None:
+        prefix = bytes(self._pending)
+        self._pending = bytearray()
+        self.encoding = sniff_encoding(prefix, self.header_encoding)
+        if self.encoding is None:
+            # 未声明编码：先按 UTF-8 严格解码，出错时在 _decode 中切换为 GB18030
+            self.encoding = 'utf-8'
+            self._decoder = codecs.getincrementaldecoder('utf-8')(errors='strict')
+        else:
+            self._decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        if self.encoding == 'utf-8' and prefix.startswith(codecs.BOM_UTF8):
+            prefix = prefix[len(codecs.BOM_UTF8):]
+        self._parser.feed(self._decode(prefix))
+
+    def _decode(self, data: bytes, final: bool = False) -> str:
+        try:
+            return self._decoder.decode(data, final)
+        except UnicodeDecodeError:
+            # 只有未声明编码时使用严格解码；之前的内容都是合法 UTF-8，从当前块（含解码器中未完成的字节）起改用 GB18030
+            pending, _ = self._decoder.getstate()
+            self.encoding = 'gb18030'
+            self._decoder = codecs.getincrementaldecoder('gb18030')(errors='replace')
+            return self._decoder.decode(pending + data, final)
+
+
+def extract_title(chunks: Iterable[bytes], content_type: Optional[str] = None,
+                  max_bytes: int = MAX_HEAD_BYTES) -> Optional[str]:
+    """
+    从字节块迭代器中提取网页标题，找到后立即停止迭代（不再读取后续数据）
+
+    Args:
+        chunks: 数据块迭代器（如 response.iter_content()）
+        content_type: Content-Type 响应头
+        max_bytes: 最多读取的字节数
+
+    Returns:
+        标题；没有找到时返回 None
+    """
+    extractor = HeadTitleExtractor(content_type, max_bytes)
+    for chunk in chunks:
+        if extractor.feed(chunk):
+            break
+    return extractor.close()
+
+
+def extract_metadata(chunks: Iterable[bytes], content_type: Optional[str] = None,
+                     max_bytes: int = MAX_HEAD_BYTES) -> Dict[str, Any]:
+    """
+    从字节块迭代器中提取网页标题、描述和规范链接，读到 <head> 结束即停止迭代
+
+    Args:
+        chunks: 数据块迭代器（如 response.iter_content()）
+        content_type: Content-Type 响应头
+        max_bytes: 最多读取的字节数
+
+    Returns:
+        {'title', 'description', 'canonical_url'}，缺少的项为 None
+    """
+    extractor = HeadTitleExtractor(content_type, max_bytes, parser_class=HeadMetadataParser)
+    for chunk in chunks:
+        if extractor.feed(chunk):
+            break
+    return extractor.close()
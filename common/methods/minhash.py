@@ -0,0 +1,123 @@
+"""
+MinHash 文本签名与 LSH 分段（近似重复检测）
+
+- 文本切分为特征集合：中文取相邻两字（bigram），英文/数字取单词，标点和空白忽略
+- 64 个哈希函数的最小值组成签名，两个签名相同位置相等的比例即特征集合 Jaccard 相似度的估计
+- 签名分为 16 段、每段 4 个值，每段哈希为一个段键：相似度为 s 的两段文本至少有一段键相同的概率为
+  1 - (1 - s^4)^16（s=0.8 时约 0.9998，s=0.3 时约 0.12），查找时按段键精确匹配（可建索引）得到候选，
+  再用签名估计相似度过滤，无需与全表逐条比较
+"""
+
+import hashlib
+import random
+import re
+import struct
+import unicodedata
+from typing import List, Optional, Set
+
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# 参与计算的最大文本长度（超长正文只取开头，控制保存时的计算量）
+MAX_TEXT_LENGTH = 1000
+
+# 特征数少于该值的文本（如只有"通知"两字）不计算签名，避免大量误判
+MIN_FEATURES = 8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# 哈希函数参数固定（签名会持久化，参数变化后需重建索引）
+_random = random.Random(20250301)
+_PERMUTATIONS = [
+    (_random.randrange(1, _MERSENNE_PRIME), _random.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+CJK_RUN_REGEX = re.compile(r'[㐀-䶿一-鿿豈-﫿]+')
+WORD_REGEX = re.compile(r'[a-z0-9]+')
+
+
+def shingles(text: str) -> Set[str]:
+    """
+    文本特征集合
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        特征集合
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    result = set()
+    for run in CJK_RUN_REGEX.findall(text):
+        if len(run) == 1:
+            result.add(run)
+        else:
+            result.update(run[i:i + 2] for i in range(len(run) - 1))
+    result.update(WORD_REGEX.findall(CJK_RUN_REGEX.sub(' ', text)))
+    return result
+
+
+def _base_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def signature(features: Set[str]) -> Optional[List[int]]:
+    """
+    计算 MinHash 签名
+
+    Args:
+        features: 特征集合
+
+    Returns:
+        NUM_PERM 个 32 位整数；特征过少时返回 None
+    """
+    if len(features) < MIN_FEATURES:
+        return None
+    hashes = [_base_hash(feature) for feature in features]
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def text_signature(title: str, content: str) -> Optional[List[int]]:
+    """
+    内容签名（标题 + 正文开头）
+
+    Returns:
+        签名；文本过短时返回 None
+    """
+    return signature(shingles(f"{title or ''}\n{(content or '')[:MAX_TEXT_LENGTH]}"))
+
+
+def band_keys(sig: List[int]) -> List[int]:
+    """
+    签名的 LSH 段键：高 4 位为段号，低 59 位为该段的哈希（可存入有符号 BIGINT）
+
+    Returns:
+        BANDS 个段键
+    """
+    keys = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f'>{ROWS}I', *rows), digest_size=8).digest()
+        keys.append((band << 59) | (int.from_bytes(digest, 'big') >> 5))
+    return keys
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """两个签名估计的 Jaccard 相似度"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def encode_signature(sig: List[int]) -> str:
+    """签名编码为十六进制字符串（NUM_PERM * 8 个字符）"""
+    return struct.pack(f'>{NUM_PERM}I', *sig).hex()
+
+
+def decode_signature(value: str) -> List[int]:
+    """解码 encode_signature 的结果"""
+    return list(struct.unpack(f'>{NUM_PERM}I', bytes.fromhex(value)))
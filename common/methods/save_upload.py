@@ -0,0 +1,93 @@
+import os
+import tempfile
+from typing import Iterable, Optional
+
+from common.methods.hash_file import hash_stream_to_file
+
+
+def digest_relative_path(digest: str, extension: str) -> str:
+    """
+    根据摘要生成存储相对路径：<摘要前两位>/<摘要><扩展名>
+
+    Args:
+        digest: 文件摘要（十六进制）
+        extension: 扩展名（含点，如 '.png'）
+
+    Returns:
+        str: 相对于上传根目录的路径（使用 '/' 分隔）
+    """
+    return f"{digest[:2]}/{digest}{extension.lower()}"
+
+
+def save_upload(chunks: Iterable[bytes], upload_root: str, extension: str,
+                algorithm: str = 'sha256', max_size: Optional[int] = None) -> dict:
+    """
+    流式保存上传文件，并以内容摘要命名
+
+    数据块边写入上传根目录下的临时文件边计算摘要，完成后原子重命名为
+    <upload_root>/<摘要前两位>/<摘要><扩展名>。相同内容得到相同路径，
+    不同内容不会互相覆盖（不再依赖时间戳或原始文件名）。
+
+    Args:
+        chunks: 数据块迭代器
+        upload_root: 上传根目录（绝对路径）
+        extension: 扩展名（含点）
+        algorithm: 摘要算法，默认为'sha256'
+        max_size: 最大允许字节数
+
+    Returns:
+        dict: {'digest': 摘要, 'size': 字节数, 'relative_path': 相对上传根目录的路径,
+               'absolute_path': 绝对路径, 'existed': 相同内容是否已存在}
+
+    Raises:
+        ValueError: 超过大小限制或不支持的摘要算法
+        OSError: 写入失败
+    """
+    os.makedirs(upload_root, exist_ok=True)
+
+    # 临时文件与目标在同一文件系统，保证 os.replace 为原子操作
+    fd, temp_path = tempfile.mkstemp(prefix='.upload-', suffix='.part', dir=upload_root)
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            digest, size = hash_stream_to_file(chunks, temp_file, algorithm=algorithm, max_size=max_size)
+        return commit_upload(temp_path, upload_root, extension, digest, size)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def commit_upload(temp_path: str, upload_root: str, extension: str, digest: str, size: int) -> dict:
+    """
+    将已写完并算好摘要的临时文件移动到摘要路径
+
+    临时文件须位于上传根目录所在的文件系统（如分片上传的暂存目录），移动为原子操作；
+    相同内容已存在时直接删除临时文件。
+
+    Args:
+        temp_path: 临时文件路径
+        upload_root: 上传根目录（绝对路径）
+        extension: 扩展名（含点）
+        digest: 文件摘要
+        size: 文件字节数
+
+    Returns:
+        dict: 同 save_upload
+    """
+    relative_path = digest_relative_path(digest, extension)
+    absolute_path = os.path.join(upload_root, *relative_path.split('/'))
+    os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
+
+    existed = os.path.exists(absolute_path)
+    if existed:
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, absolute_path)
+
+    return {
+        'digest': digest,
+        'size': size,
+        'relative_path': relative_path,
+        'absolute_path': absolute_path,
+        'existed': existed,
+    }
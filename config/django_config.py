@@ -10,6 +10,73 @@ from config.load_config import GLOBAL_CONFIG
 from api.logging import setup_logging
 
 
+# 缓存后端（config.txt 中 CACHE_backend 取值）
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',  # 进程内，各进程不共享
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',  # 同一主机的进程共享
+    'redis': 'django.core.cache.backends.redis.RedisCache',  # 需要安装 redis
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',  # 需要安装 pymemcache
+}
+
+
+def cache_settings():
+    """
+    根据配置文件生成 CACHES 设置
+
+    默认使用文件缓存：Django API 与 Flask 应用是不同的进程，用户缓存等需要失效的数据必须共用同一个缓存，
+    否则一个进程中的修改（如撤销角色）只能等另一个进程的缓存过期后才生效。
+    """
+    backend = GLOBAL_CONFIG.get_config_value("CACHE_backend", "file").strip().lower()
+    location = GLOBAL_CONFIG.get_config_value("CACHE_location")
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"未知的缓存后端: {backend}，可选: {', '.join(CACHE_BACKENDS)}")
+    if backend == 'file' and not location:
+        location = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache')
+    return {
+        'default': {
+            'BACKEND': CACHE_BACKENDS[backend],
+            'LOCATION': location or '',
+            'KEY_PREFIX': 'seu_news',
+        }
+    }
+
+
+# 会话存储（config.txt 中 SESSION_engine 取值）
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',  # 每个请求查询 django_session
+    'cached_db': 'django.contrib.sessions.backends.cached_db',  # 先读缓存，写入时同时写数据库（默认）
+    'cookie': 'django.contrib.sessions.backends.signed_cookies',  # 签名 Cookie，不访问服务器端存储
+}
+
+
+def session_engine():
+    """
+    根据配置文件选择会话存储
+
+    cached_db 依赖 CACHES 的 default 缓存，缓存未命中时退回数据库，缓存丢失不会使用户掉线；
+    cookie 不需要服务器端存储，但会话无法在服务器端注销（登出只清除本机 Cookie），且数据对客户端可见（不可篡改）。
+    """
+    engine = GLOBAL_CONFIG.get_config_value("SESSION_engine", "cached_db").strip().lower()
+    if engine not in SESSION_ENGINES:
+        raise ValueError(f"未知的会话存储: {engine}，可选: {', '.join(SESSION_ENGINES)}")
+    return SESSION_ENGINES[engine]
+
+
+def throttle_backend():
+    """
+    根据配置文件选择限流状态后端（api/throttling.py）
+
+    THROTTLE_backend 取 memory（进程内）或 file（默认，同一主机的进程共用，THROTTLE_location 默认为项目下的 cache/throttle/）
+    """
+    engine = GLOBAL_CONFIG.get_config_value("THROTTLE_backend", "file").strip().lower()
+    location = GLOBAL_CONFIG.get_config_value("THROTTLE_location")
+    if engine not in ('memory', 'file'):
+        raise ValueError(f"未知的限流状态后端: {engine}，可选: memory, file")
+    if engine == 'file' and not location:
+        location = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache', 'throttle')
+    return {'ENGINE': engine, 'LOCATION': location}
+
+
 def configure_django():
     """
     配置Django运行环境和数据库连接参数
@@ -95,8 +162,13 @@ def configure_django():
                     ],
                     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
                     'PAGE_SIZE': 10,
+                    # 限流（429）响应使用统一格式并带 Retry-After 头
+                    'EXCEPTION_HANDLER': 'api.throttling.exception_handler',
                 },
 
+                # 限流状态后端（见 api/throttling.py）
+                THROTTLE_BACKEND=throttle_backend(),
+
                 # CORS 配置
                 CORS_ALLOWED_ORIGINS=[
                     "http://localhost:24610",  # Vue 开发服务器
@@ -114,7 +186,11 @@ def configure_django():
                 CSRF_USE_SESSIONS=True,
                 CSRF_COOKIE_HTTPONLY=False,
 
+                # 缓存配置（用户缓存等，见 cache_settings）
+                CACHES=cache_settings(),
+
                 # Session 配置
+                SESSION_ENGINE=session_engine(),
                 SESSION_COOKIE_NAME='sessionid',
                 SESSION_COOKIE_HTTPONLY=True,
                 SESSION_COOKIE_SAMESITE='Lax',
@@ -136,6 +212,19 @@ def configure_django():
                     os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static'),
                 ],
 
+                # 上传文件根目录（对应 URL /static/uploads/）
+                UPLOAD_ROOT=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'uploads'),
+
+                # multipart 上传中超过该大小的文件写入临时文件，而不是整个留在进程内存中
+                FILE_UPLOAD_MAX_MEMORY_SIZE=256 * 1024,
+
+                # 媒体文件下载（/media/uploads/...、/media/pdfs/...，文件位于 static 目录）
+                MEDIA_URL='/media/',
+                MEDIA_ROOT=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static'),
+                # 由前端 Web 服务器发送文件：Nginx internal location 前缀（如 /_media/），或启用 X-Sendfile
+                MEDIA_ACCEL_REDIRECT=GLOBAL_CONFIG.get_config_value("MEDIA_accel_redirect"),
+                MEDIA_SENDFILE=GLOBAL_CONFIG.get_config_value("MEDIA_sendfile", "false").lower() == "true",
+
                 # 发布相关配置
                 PUBLISH_CONFIG={
                     'pdf_output_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static/pdfs'),
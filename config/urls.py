@@ -8,8 +8,12 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path, include
 
+from api.views.media import MediaFileView
+
 urlpatterns = [
     path('api/', include('api.urls')),
+    # 上传图片/导出 PDF 下载（带摘要的文件名长期缓存，可由 Nginx X-Accel-Redirect 发送）
+    path('media/<path:path>', MediaFileView.as_view(), name='media_file'),
 ]
 
 # 在开发环境下提供静态文件服务
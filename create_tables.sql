@@ -5,6 +5,7 @@
 --   - 手动创建表，不使用 Django migrate
 --   - 表名与 Django models.db_table 对应
 --   - 字段名与 Django models 定义保持一致
+--   - 已有数据库升级：先执行 upgrade_tables.sql 补齐已有表的新列和索引，再执行本脚本创建新增的表
 -- ===================================================================
 -- 数据库: seu_news
 -- 字符集: utf8mb4
@@ -79,9 +80,11 @@ CREATE TABLE IF NOT EXISTS `content_management` (
     `title` VARCHAR(200) NOT NULL COMMENT '内容标题',
     `short_title` VARCHAR(100) DEFAULT NULL COMMENT '短标题（用于展示）',
     `link` TEXT NOT NULL COMMENT '内容链接地址',
+    `link_hash` CHAR(40) NOT NULL DEFAULT '' COMMENT '链接去重键（规范化链接的 SHA-1 摘要）',
     `content` TEXT NOT NULL COMMENT '详细内容',
     `type` VARCHAR(50) NOT NULL COMMENT '内容类型（教务/竞赛/活动等）',
     `tag` TEXT DEFAULT NULL COMMENT '内容标签（自由文本）',
+    `category` VARCHAR(20) NOT NULL DEFAULT 'other' COMMENT '导出分类（college/club/lecture/other，由标签和类型派生）',
 
     -- 时间相关
     `deadline` DATETIME DEFAULT NULL COMMENT '截止时间（DDL）',
@@ -102,8 +105,8 @@ CREATE TABLE IF NOT EXISTS `content_management` (
     `status` VARCHAR(50) NOT NULL DEFAULT 'draft' COMMENT '内容状态',
 
     -- 并发控制
-    `locker_id` INT DEFAULT NULL COMMENT '当前锁定者用户ID（防止并发编辑）',
-    `locked_at` DATETIME DEFAULT NULL COMMENT '锁定时间戳',
+    `locker_id` INT DEFAULT NULL COMMENT '当前锁定者用户ID（防止并发编辑；审核队列领取者）',
+    `locked_at` DATETIME DEFAULT NULL COMMENT '锁定时间戳（超过 REVIEW_CLAIM_TTL_SECONDS 视为过期）',
 
     -- 索引
     PRIMARY KEY (`id`),
@@ -112,7 +115,11 @@ CREATE TABLE IF NOT EXISTS `content_management` (
     KEY `idx_reviewer_id` (`reviewer_id`),
     KEY `idx_status` (`status`),
     KEY `idx_type` (`type`),
+    KEY `idx_category` (`category`, `publish_at`),
+    KEY `idx_link_hash` (`link_hash`),
     KEY `idx_deadline` (`deadline`),
+    KEY `idx_status_deadline` (`status`, `locker_id`, `deadline`, `created_at`),
+    KEY `idx_locker_id` (`locker_id`),
     KEY `idx_publish_at` (`publish_at`),
     KEY `idx_created_at` (`created_at`),
     KEY `idx_updated_at` (`updated_at`)
@@ -183,6 +190,309 @@ CREATE TABLE IF NOT EXISTS `django_session` (
   COMMENT = 'Django 会话表：存储用户登录状态和会话数据';
 
 
+-- ===================================================================
+-- Table 5: content_change_log
+-- ===================================================================
+-- 说明: 内容变更日志表，服务层在内容创建/更新/状态变更/删除时写入
+--       自增 id 即增量同步游标（GET /api/contents/changes/?since=<id>）
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `content_change_log` (
+    -- 主键（单调递增游标）
+    `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '变更游标',
+
+    -- 变更信息
+    `content_id` INT NOT NULL COMMENT '内容ID',
+    `action` VARCHAR(20) NOT NULL COMMENT '变更类型（create/update/status/delete）',
+    `old_status` VARCHAR(50) DEFAULT NULL COMMENT '变更前状态',
+    `new_status` VARCHAR(50) DEFAULT NULL COMMENT '变更后状态',
+    `operator_id` INT DEFAULT NULL COMMENT '操作者用户ID',
+
+    -- 时间戳
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '变更时间',
+
+    -- 索引
+    PRIMARY KEY (`id`),
+    KEY `idx_change_content_id` (`content_id`, `id`),
+    KEY `idx_change_created_at` (`created_at`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '内容变更日志表：记录内容的创建、更新、状态变更和删除，供前端增量同步';
+
+
+-- ===================================================================
+-- Table 6: image_blob
+-- ===================================================================
+-- 说明: 内容寻址图片存储，相同内容的图片只保存一份
+--       ref_count 由 Content.image_list 变化维护，降为 0 时记录 released_at，
+--       超过保留期的记录由 python manage.py gc_image_blobs 分批清理
+--       （从未被引用过的图片 released_at 为空，不会被清理）
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `image_blob` (
+    -- 主键
+    `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '唯一主键',
+
+    -- 文件信息
+    `digest` VARCHAR(64) NOT NULL COMMENT '内容摘要（SHA-256 十六进制）',
+    `path` VARCHAR(255) NOT NULL COMMENT '存储路径（相对 static 目录）',
+    `size` BIGINT NOT NULL DEFAULT 0 COMMENT '文件大小（字节）',
+
+    -- 引用计数
+    `ref_count` INT NOT NULL DEFAULT 0 COMMENT '被 content_management.image_list 引用的次数',
+
+    -- 时间戳
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '首次上传时间',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '最后上传/引用变化时间',
+    `released_at` DATETIME NULL COMMENT '引用计数降为 0 的时间（为空表示未被释放）',
+    `variants` VARCHAR(100) NULL COMMENT '已生成的衍生图规格（逗号分隔；空字符串表示生成失败，NULL 表示尚未生成）',
+
+    -- 索引
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_blob_digest` (`digest`),
+    KEY `idx_blob_gc` (`ref_count`, `released_at`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '图片存储表：按内容摘要去重的图片文件及引用计数';
+
+
+-- ===================================================================
+-- Table 7: upload_session
+-- ===================================================================
+-- 说明: 分片上传会话，分片直接写入 static/uploads/.sessions/<会话ID>.part
+--       超过 UPLOAD_SESSION_TTL_SECONDS 无进展的会话由
+--       python manage.py cleanup_upload_sessions 清理
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `upload_session` (
+    -- 主键
+    `id` VARCHAR(32) NOT NULL COMMENT '会话ID（UUID 十六进制）',
+
+    -- 上传信息
+    `user_id` INT NOT NULL COMMENT '上传用户ID',
+    `filename` VARCHAR(255) NOT NULL COMMENT '原始文件名',
+    `extension` VARCHAR(10) NOT NULL COMMENT '扩展名（含点）',
+    `total_size` BIGINT NOT NULL COMMENT '文件总大小（字节）',
+    `chunk_size` INT NOT NULL COMMENT '分片大小（字节）',
+    `received_size` BIGINT NOT NULL DEFAULT 0 COMMENT '已连续接收的字节数',
+    `expected_digest` VARCHAR(64) NULL COMMENT '客户端声明的 SHA-256 摘要',
+    `digest` VARCHAR(64) NULL COMMENT '完成后的内容摘要',
+    `status` VARCHAR(20) NOT NULL DEFAULT 'uploading' COMMENT '状态: uploading/completed',
+
+    -- 时间戳
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '最后活动时间',
+
+    -- 索引
+    PRIMARY KEY (`id`),
+    KEY `idx_upload_session_user` (`user_id`, `status`),
+    KEY `idx_upload_session_updated` (`updated_at`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '分片上传会话表：断点续传进度';
+
+
+-- ===================================================================
+-- Table 8: upload_file
+-- ===================================================================
+-- 说明: static/uploads 文件索引（管理员文件浏览），上传时写入，
+--       内容 image_list 变化时更新引用；可用
+--       python manage.py rebuild_file_index 按目录全量重建
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `upload_file` (
+    -- 主键
+    `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '唯一主键',
+
+    -- 文件信息
+    `path` VARCHAR(255) NOT NULL COMMENT '文件路径（相对 static 目录）',
+    `size` BIGINT NOT NULL DEFAULT 0 COMMENT '文件大小（字节）',
+    `digest` VARCHAR(64) NULL COMMENT '内容摘要（SHA-256，旧格式文件可能为空）',
+    `owner_id` INT NULL COMMENT '上传用户ID（来源不明时为空）',
+
+    -- 引用信息
+    `content_ids` TEXT NOT NULL COMMENT '引用该文件的内容ID（JSON 数组）',
+    `ref_count` INT NOT NULL DEFAULT 0 COMMENT '引用内容数',
+
+    -- 时间戳
+    `modified_at` DATETIME NOT NULL COMMENT '文件修改时间',
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '索引创建时间',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '索引更新时间',
+
+    -- 索引
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_upload_file_path` (`path`),
+    KEY `idx_upload_file_modified` (`modified_at`),
+    KEY `idx_upload_file_size` (`size`),
+    KEY `idx_upload_file_refs` (`ref_count`, `modified_at`),
+    KEY `idx_upload_file_owner` (`owner_id`, `modified_at`),
+    KEY `idx_upload_file_digest` (`digest`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '上传文件索引表：管理员文件浏览（不扫描目录）';
+
+
+-- ===================================================================
+-- Table 9: content_fingerprint
+-- ===================================================================
+-- 说明: 内容的 MinHash 签名（近似重复检测），内容保存时由信号更新；
+--       已有数据可用 python manage.py rebuild_duplicate_index 重建
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `content_fingerprint` (
+    `content_id` INT NOT NULL COMMENT '内容ID',
+    `signature` CHAR(512) NOT NULL COMMENT 'MinHash 签名（64 个 32 位整数的十六进制）',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+
+    PRIMARY KEY (`content_id`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '内容指纹表：近似重复检测的 MinHash 签名';
+
+
+-- ===================================================================
+-- Table 10: content_lsh_band
+-- ===================================================================
+-- 说明: MinHash 签名的 LSH 段键（每条内容 16 行），
+--       任一段键相同的内容为疑似重复候选
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `content_lsh_band` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '唯一主键',
+    `content_id` INT NOT NULL COMMENT '内容ID',
+    `band_key` BIGINT NOT NULL COMMENT '段键（高 4 位为段号，低 59 位为该段签名的哈希）',
+
+    PRIMARY KEY (`id`),
+    KEY `idx_content_lsh_band_key` (`band_key`),
+    KEY `idx_content_lsh_content` (`content_id`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '内容 LSH 段键表：近似重复候选查找';
+
+
+-- ===================================================================
+-- Table 11: content_status_count
+-- ===================================================================
+-- 说明: 各状态的内容数（管理面板统计），内容状态变化时由信号增减；
+--       开启 DASHBOARD_STATUS_COUNTERS 前用 python manage.py rebuild_status_counts 初始化
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `content_status_count` (
+    `status` VARCHAR(50) NOT NULL COMMENT '内容状态',
+    `count` INT NOT NULL DEFAULT 0 COMMENT '内容数',
+    `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+
+    PRIMARY KEY (`status`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '内容状态计数表：管理面板统计';
+
+
+-- ===================================================================
+-- Table 12: content_daily_stat
+-- ===================================================================
+-- 说明: 每天、每个状态、每个责任人的状态流转次数（发布/审核趋势统计），
+--       内容新建或状态变化时由信号累加；用 python manage.py backfill_content_analytics 回填历史
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `content_daily_stat` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '唯一主键',
+    `day` DATE NOT NULL COMMENT '日期',
+    `status` VARCHAR(50) NOT NULL COMMENT '进入的状态（created 表示新建）',
+    `user_id` INT NOT NULL DEFAULT 0 COMMENT '责任人ID（0 表示未知）',
+    `count` INT NOT NULL DEFAULT 0 COMMENT '次数',
+
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_content_daily_stat` (`day`, `status`, `user_id`),
+    KEY `idx_content_daily_stat_user` (`user_id`, `day`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '内容每日状态流转汇总表：发布/审核趋势统计';
+
+
+-- ===================================================================
+-- Table 13: content_daily_latency
+-- ===================================================================
+-- 说明: 每天的审核耗时（待审核→审核完成）和发布耗时（创建→发布）直方图，
+--       按分桶计数，用于计算任意日期范围的耗时分位数
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `content_daily_latency` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '唯一主键',
+    `day` DATE NOT NULL COMMENT '日期',
+    `metric` VARCHAR(20) NOT NULL COMMENT '耗时类型（review/publish）',
+    `bucket` SMALLINT NOT NULL COMMENT '分桶序号',
+    `count` INT NOT NULL DEFAULT 0 COMMENT '次数',
+    `total_seconds` BIGINT NOT NULL DEFAULT 0 COMMENT '耗时合计（秒）',
+
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_content_daily_latency` (`day`, `metric`, `bucket`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '内容每日耗时分布表：审核/发布耗时分位数';
+
+
+-- ===================================================================
+-- Table 14: tag
+-- ===================================================================
+-- 说明: 标签（每个不同的标签名一行），与 content_tag 一起作为 content_management.tag 的规范化索引
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `tag` (
+    `id` INT NOT NULL AUTO_INCREMENT COMMENT '唯一主键',
+    `name` VARCHAR(100) NOT NULL COMMENT '标签名',
+    `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_tag_name` (`name`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '标签表';
+
+
+-- ===================================================================
+-- Table 15: content_tag
+-- ===================================================================
+-- 说明: 内容与标签的关联，内容保存时若标签变化由信号重写；
+--       历史数据用 python manage.py backfill_content_tags 回填
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS `content_tag` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '唯一主键',
+    `content_id` INT NOT NULL COMMENT '内容ID',
+    `tag_id` INT NOT NULL COMMENT '标签ID',
+    `position` SMALLINT NOT NULL DEFAULT 0 COMMENT '标签顺序',
+
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_content_tag` (`content_id`, `tag_id`),
+    KEY `idx_content_tag_tag` (`tag_id`, `content_id`)
+
+) ENGINE = InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_0900_ai_ci
+  COMMENT = '内容标签关联表：按标签筛选、统计';
+
+
 -- ===================================================================
 -- 表结构验证
 -- ===================================================================
@@ -193,6 +503,17 @@ CREATE TABLE IF NOT EXISTS `django_session` (
 --   DESCRIBE content_management;
 --   DESCRIBE comment_management;
 --   DESCRIBE django_session;
+--   DESCRIBE content_change_log;
+--   DESCRIBE image_blob;
+--   DESCRIBE upload_session;
+--   DESCRIBE upload_file;
+--   DESCRIBE content_fingerprint;
+--   DESCRIBE content_lsh_band;
+--   DESCRIBE content_status_count;
+--   DESCRIBE content_daily_stat;
+--   DESCRIBE content_daily_latency;
+--   DESCRIBE tag;
+--   DESCRIBE content_tag;
 --
 -- ===================================================================
 
@@ -201,16 +522,22 @@ CREATE TABLE IF NOT EXISTS `django_session` (
 -- 索引说明
 -- ===================================================================
 -- user_info:
---   - idx_username: 登录查询优化
---   - idx_realname: 按姓名搜索优化
---   - idx_student_id: 按学号搜索优化
+--   - idx_username: 登录查询优化；用户列表按用户名前缀搜索（LIKE 'q%'）
+--   - idx_realname: 按姓名前缀搜索优化
+--   - idx_student_id: 按学号前缀搜索优化
 --   - idx_created_at/updated_at: 时间排序优化
 --
 -- content_management:
---   - idx_creator_id/describer_id/reviewer_id: 用户关联查询优化
+--   - idx_creator_id/describer_id/reviewer_id: 用户关联查询优化；用户列表按用户统计内容数的关联子查询
 --   - idx_status: 按状态筛选优化
 --   - idx_type: 按类型筛选优化
+--   - idx_category: 导出/统计按分类筛选、分组（已有数据库执行 upgrade_tables.sql 增加该列，
+--     再运行 python manage.py backfill_content_category 回填）
+--   - idx_link_hash: 粘贴/导入链接时按规范化链接查重（已有数据库执行 upgrade_tables.sql 增加该列，
+--     再运行 python manage.py backfill_link_hash 回填）
 --   - idx_deadline: DDL 查询优化
+--   - idx_status_deadline: 审核队列领取（pending 且未领取的行按截止时间、创建时间顺序扫描，读够即停）
+--   - idx_locker_id: 查询审核者当前领取的内容
 --   - idx_publish_at: 按发布时间排序优化
 --   - idx_created_at/updated_at: 时间排序优化
 --
@@ -223,4 +550,42 @@ CREATE TABLE IF NOT EXISTS `django_session` (
 -- django_session:
 --   - django_session_expire_date_idx: 过期会话清理优化
 --
+-- content_change_log:
+--   - PRIMARY(id): 增量同步游标范围扫描（id > since）
+--   - idx_change_content_id: 按内容查询变更历史
+--   - idx_change_created_at: 过期日志清理
+--
+-- image_blob:
+--   - uk_blob_digest: 按摘要查找已有图片（重复上传只写元数据）
+--   - idx_blob_gc: 查找引用已释放且超过保留期的图片
+--
+-- upload_session:
+--   - idx_upload_session_user: 统计用户进行中的会话数
+--   - idx_upload_session_updated: 清理长时间无进展的会话
+--
+-- upload_file:
+--   - uk_upload_file_path: 上传/引用变化时按路径定位
+--   - idx_upload_file_modified/size: 文件浏览按时间、大小排序
+--   - idx_upload_file_refs: 筛选未被引用的文件
+--   - idx_upload_file_owner: 按上传者筛选
+--   - idx_upload_file_digest: 按摘要查找同一内容的文件
+--
+-- content_lsh_band:
+--   - idx_content_lsh_band_key: 按段键查找疑似重复候选（band_key IN (...)）
+--   - idx_content_lsh_content: 内容保存/删除时替换其段键
+--
+-- content_daily_stat:
+--   - uk_content_daily_stat: 状态变化时定位累加行；按日期范围汇总（day 为最左列）
+--   - idx_content_daily_stat_user: 按责任人查询工作量
+--
+-- content_daily_latency:
+--   - uk_content_daily_latency: 累加定位；按日期范围汇总分桶计数
+--
+-- tag:
+--   - uk_tag_name: 按标签名查找标签ID
+--
+-- content_tag:
+--   - uk_content_tag: 按内容读取/替换标签（content_id 为最左列，列表批量读取标签）
+--   - idx_content_tag_tag: 按标签查找内容（筛选、分面计数）
+--
 -- ===================================================================
@@ -4,10 +4,12 @@ django_models package
 """
 
 # Lazy import to avoid circular dependency
-# from .models import User_info, Content, Comment
+# from .models import User_info, Content, Comment, ContentChangeLog, ImageBlob, UploadSession, UploadFile,
+#     ContentFingerprint, ContentLshBand, ContentStatusCount, ContentDailyStat, ContentDailyLatency,
+#     Tag, ContentTag
 # from .managers import ContentManager, UserManager, CommentManager
 
-__all__ = ['User_info', 'Content', 'Comment', 'ContentManager', 'UserManager', 'CommentManager']
+__all__ = ['User_info', 'Content', 'Comment', 'ContentChangeLog', 'ImageBlob', 'UploadSession', 'UploadFile', 'ContentFingerprint', 'ContentLshBand', 'ContentStatusCount', 'ContentDailyStat', 'ContentDailyLatency', 'Tag', 'ContentTag', 'ContentManager', 'UserManager', 'CommentManager']
 
 __version__ = '1.0.0'
 
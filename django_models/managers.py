@@ -19,8 +19,11 @@ class ContentQuerySet(models.QuerySet):
         return self.filter(type=content_type)
 
     def with_tag(self, tag):
-        """按标签筛选"""
-        return self.filter(tag__icontains=tag)
+        """按标签筛选（精确匹配，经 content_tag 索引查找）"""
+        from .models import Tag, ContentTag
+        return self.filter(
+            id__in=ContentTag.objects.filter(tag_id__in=Tag.objects.filter(name=tag).values('id')).values('content_id')
+        )
 
     def with_deadline(self):
         """有截止日期的内容"""
@@ -1,11 +1,115 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 import os
 import json
 from django.conf import settings
+
+from common.methods.canonical_url import link_hash
 # Create your models here.
 
 
-class User_info(models.Model):
+class DirtyFieldsMixin:
+    """
+    脏字段追踪
+
+    记录实例从数据库加载（或上次保存）时的字段值，save() 时：
+    - 新建实例：正常 INSERT
+    - 显式传入 update_fields：按调用方指定的字段保存（与 Django 默认行为一致）
+    - 未传 update_fields：只 UPDATE 发生变化的字段（auto_now 字段随之刷新）；
+      没有任何变化时直接跳过，不写库、不刷新 updated_at、不发送 pre_save/post_save 信号
+
+    部分保存时 post_save 信号的 update_fields 参数即为实际写入的字段集合，
+    缓存/索引可据此精确失效。
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            attname: value
+            for attname, value in zip(field_names, values)
+            if value is not models.DEFERRED
+        }
+        return instance
+
+    def _tracked_fields(self):
+        """参与追踪的字段（不含主键和 auto_now 字段）"""
+        return [
+            field for field in self._meta.concrete_fields
+            if not field.primary_key and not getattr(field, 'auto_now', False)
+        ]
+
+    def get_dirty_fields(self):
+        """
+        获取自加载/上次保存以来发生变化的字段名
+
+        Returns:
+            list: 字段名列表；新建实例返回全部追踪字段
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if self._state.adding or loaded is None:
+            return [field.name for field in self._tracked_fields()]
+
+        dirty = []
+        for field in self._tracked_fields():
+            if field.attname not in self.__dict__:
+                # 延迟加载且未被赋值
+                continue
+            if field.attname not in loaded:
+                # 延迟加载后被赋值，无法比较，视为已修改
+                dirty.append(field.name)
+                continue
+            current = getattr(self, field.attname)
+            try:
+                # 统一类型后比较（例如赋值为字符串的日期时间）
+                current = field.to_python(current)
+            except ValidationError:
+                pass
+            if current != loaded[field.attname]:
+                dirty.append(field.name)
+        return dirty
+
+    def is_dirty(self):
+        """是否有未保存的修改"""
+        return bool(self.get_dirty_fields())
+
+    def _snapshot(self, field_names=None):
+        """记录当前字段值作为比较基准"""
+        loaded = getattr(self, '_loaded_values', None) or {}
+        for field in self._meta.concrete_fields:
+            if field_names is not None and field.name not in field_names and field.attname not in field_names:
+                continue
+            if field.attname in self.__dict__:
+                loaded[field.attname] = getattr(self, field.attname)
+        self._loaded_values = loaded
+
+    def save(self, *args, **kwargs):
+        partial = (
+            not args
+            and not self._state.adding
+            and self.pk is not None
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+            and getattr(self, '_loaded_values', None) is not None
+        )
+        if partial:
+            dirty = self.get_dirty_fields()
+            if not dirty:
+                return
+            auto_now_fields = [
+                field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)
+            ]
+            kwargs['update_fields'] = dirty + auto_now_fields
+
+        super().save(*args, **kwargs)
+        self._snapshot(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot(fields)
+
+
+class User_info(DirtyFieldsMixin, models.Model):
     PERMISSION_NONE = 0b00  # 0 - 无权限
     PERMISSION_EDITOR = 0b01  # 1 - 编辑权限
     PERMISSION_ADMIN = 0b10  # 2 - 管理员权限
@@ -93,7 +197,20 @@ class User_info(models.Model):
         return bool(self.role & required_permission)
 
 
-class Content(models.Model):
+class Content(DirtyFieldsMixin, models.Model):
+    # 导出分类（由 tag/type 派生，保存时自动计算）
+    CATEGORY_COLLEGE = 'college'
+    CATEGORY_CLUB = 'club'
+    CATEGORY_LECTURE = 'lecture'
+    CATEGORY_OTHER = 'other'
+
+    CATEGORY_CHOICES = (
+        (CATEGORY_COLLEGE, '院级活动'),
+        (CATEGORY_CLUB, '社团活动'),
+        (CATEGORY_LECTURE, '讲座'),
+        (CATEGORY_OTHER, '其他'),
+    )
+
     STATUS_CHOICES = (
         ('draft', '草稿'),
         ('pending', '待审核'),
@@ -111,6 +228,8 @@ class Content(models.Model):
     title = models.CharField(max_length=200, verbose_name='标题')
     short_title = models.CharField(max_length=100, verbose_name='短标题', null=True, blank=True)
     link = models.TextField(verbose_name='链接')
+    link_hash = models.CharField(max_length=40, default='', blank=True, verbose_name='链接去重键',
+                                 help_text='规范化链接的 SHA-1 摘要，保存时自动计算')
     content = models.TextField(verbose_name='详细内容')
 
     deadline = models.DateTimeField(verbose_name="截止时间", null=True, blank=True)
@@ -120,6 +239,8 @@ class Content(models.Model):
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='draft')
     type = models.CharField(max_length=50, verbose_name='类型')
     tag = models.TextField(verbose_name='标签', default='')
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default=CATEGORY_OTHER,
+                                verbose_name='导出分类', help_text='由标签和类型派生，保存时自动计算')
 
     # 锁定字段（用于并发编辑控制）
     locker_id = models.IntegerField(
@@ -138,6 +259,59 @@ class Content(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @staticmethod
+    def parse_tags(tag_str):
+        """
+        解析标签字段为列表
+
+        支持 JSON 数组字符串（'["讲座"]'）和逗号分隔字符串（"讲座,社团活动"）
+
+        Returns:
+            list: 标签列表
+        """
+        if not tag_str:
+            return []
+
+        if tag_str.startswith('['):
+            try:
+                tags = json.loads(tag_str)
+                if isinstance(tags, list):
+                    return [str(t).strip() for t in tags if str(t).strip()]
+            except (json.JSONDecodeError, TypeError):
+                pass
+
+        return [t.strip() for t in tag_str.split(',') if t.strip()]
+
+    @classmethod
+    def derive_category(cls, tag_str, type_):
+        """
+        根据标签和类型计算导出分类
+
+        优先级：讲座（标签或类型）> 院级活动 > 社团活动 > 其他
+        """
+        return cls.category_for_tags(cls.parse_tags(tag_str), type_)
+
+    @classmethod
+    def category_for_tags(cls, tags, type_):
+        """根据已解析的标签列表（如 content_tag 中的标签）和类型计算导出分类"""
+        if '讲座' in tags or type_ == '讲座':
+            return cls.CATEGORY_LECTURE
+        if '院级活动' in tags:
+            return cls.CATEGORY_COLLEGE
+        if '社团活动' in tags:
+            return cls.CATEGORY_CLUB
+        return cls.CATEGORY_OTHER
+
+    def save(self, *args, **kwargs):
+        self.category = self.derive_category(self.tag, self.type)
+        self.link_hash = link_hash(self.link)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and ('tag' in update_fields or 'type' in update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'category'}
+        if update_fields is not None and 'link' in update_fields:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'link_hash'}
+        super().save(*args, **kwargs)
+
     def add_image(self, image_path):
         """
         将一个图片路径添加到image_list字段中
@@ -164,8 +338,12 @@ class Content(models.Model):
             else:
                 image_list_data = []
 
-            # 生成相对路径
-            relative_path = f"uploads/{os.path.basename(image_path)}"
+            # 生成相对路径（保留 uploads/ 之后的子目录，如 uploads/3f/<摘要>.png）
+            normalized_path = image_path.replace('\\', '/')
+            if 'uploads/' in normalized_path:
+                relative_path = 'uploads/' + normalized_path.rsplit('uploads/', 1)[1]
+            else:
+                relative_path = f"uploads/{os.path.basename(image_path)}"
 
             # 添加到图片列表
             image_list_data.append(relative_path)
@@ -216,7 +394,11 @@ class Content(models.Model):
             models.Index(fields=['reviewer_id'], name='idx_content_reviewer_id'),
             models.Index(fields=['status'], name='idx_content_status'),
             models.Index(fields=['type'], name='idx_content_type'),
+            models.Index(fields=['category', 'publish_at'], name='idx_content_category'),
+            models.Index(fields=['link_hash'], name='idx_content_link_hash'),
             models.Index(fields=['deadline'], name='idx_content_deadline'),
+            models.Index(fields=['status', 'locker_id', 'deadline', 'created_at'], name='idx_content_status_deadline'),
+            models.Index(fields=['locker_id'], name='idx_content_locker_id'),
             models.Index(fields=['publish_at'], name='idx_content_publish_at'),
             models.Index(fields=['created_at'], name='idx_content_created_at'),
             models.Index(fields=['updated_at'], name='idx_content_updated_at'),
@@ -246,4 +428,332 @@ class Comment(models.Model):
             models.Index(fields=['parent_comment_id'], name='idx_parent_comment_id'),
             models.Index(fields=['created'], name='idx_created'),
             models.Index(fields=['updated'], name='idx_updated'),
-        ]
\ No newline at end of file
+        ]
+
+# 4. 内容变更日志表
+class ContentChangeLog(models.Model):
+    """
+    内容变更日志
+
+    由服务层在内容创建、更新、状态变更、删除时写入，
+    自增主键 id 作为单调递增游标，供前端增量同步（/api/contents/changes/）使用。
+    """
+    ACTION_CREATE = 'create'
+    ACTION_UPDATE = 'update'
+    ACTION_STATUS = 'status'
+    ACTION_DELETE = 'delete'
+
+    ACTION_CHOICES = (
+        (ACTION_CREATE, '创建'),
+        (ACTION_UPDATE, '更新'),
+        (ACTION_STATUS, '状态变更'),
+        (ACTION_DELETE, '删除'),
+    )
+
+    id = models.BigAutoField(primary_key=True, verbose_name='变更游标')
+    content_id = models.IntegerField(verbose_name='内容ID')
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES, verbose_name='变更类型')
+    old_status = models.CharField(max_length=50, null=True, blank=True, verbose_name='变更前状态')
+    new_status = models.CharField(max_length=50, null=True, blank=True, verbose_name='变更后状态')
+    operator_id = models.IntegerField(null=True, blank=True, verbose_name='操作者ID')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='变更时间')
+
+    class Meta:
+        db_table = 'content_change_log'
+        verbose_name = '内容变更'
+        verbose_name_plural = '内容变更日志'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['content_id', 'id'], name='idx_change_content_id'),
+            models.Index(fields=['created_at'], name='idx_change_created_at'),
+        ]
+
+
+# 5. 图片存储表（内容寻址）
+class ImageBlob(models.Model):
+    """
+    图片存储（按内容摘要去重）
+
+    每个不同内容的图片只保存一份文件（uploads/<摘要前两位>/<摘要><扩展名>），
+    ref_count 为引用该图片的 Content.image_list 条目数，由 Content 保存/删除时的信号维护；
+    引用计数降为 0 时记录 released_at，超过保留期的记录由 gc_image_blobs 命令分批清理。
+    从未被 image_list 引用过的图片（released_at 为空）不会被清理：上传接口返回的 URL 可能已写入正文。
+    """
+    id = models.BigAutoField(primary_key=True)
+    digest = models.CharField(max_length=64, unique=True, verbose_name='内容摘要(SHA-256)')
+    path = models.CharField(max_length=255, verbose_name='存储路径', help_text='相对 static 目录，如 uploads/3f/<摘要>.png')
+    size = models.BigIntegerField(default=0, verbose_name='文件大小(字节)')
+    ref_count = models.IntegerField(default=0, verbose_name='引用计数')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='首次上传时间')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='最后上传/引用变化时间')
+    released_at = models.DateTimeField(null=True, blank=True, verbose_name='引用释放时间',
+                                       help_text='引用计数降为 0 的时间；为空表示未被释放（从未引用或再次上传）')
+    variants = models.CharField(max_length=100, null=True, blank=True, verbose_name='已生成的衍生图规格',
+                                help_text='逗号分隔，如 print,thumb,web；空字符串表示生成失败，NULL 表示尚未生成')
+
+    class Meta:
+        db_table = 'image_blob'
+        verbose_name = '图片'
+        verbose_name_plural = '图片存储'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['ref_count', 'released_at'], name='idx_blob_gc'),
+        ]
+
+
+# 6. 分片上传会话表
+class UploadSession(models.Model):
+    """
+    分片上传会话
+
+    客户端先创建会话，再按序号逐片上传（数据直接写入暂存文件的对应偏移），
+    全部分片到齐后完成上传：校验摘要并移入内容寻址存储。
+    received_size 即已连续写入的字节数，断线后从该偏移对应的分片继续上传。
+    """
+    STATUS_UPLOADING = 'uploading'
+    STATUS_COMPLETED = 'completed'
+
+    STATUS_CHOICES = (
+        (STATUS_UPLOADING, '上传中'),
+        (STATUS_COMPLETED, '已完成'),
+    )
+
+    id = models.CharField(max_length=32, primary_key=True, verbose_name='会话ID')
+    user_id = models.IntegerField(verbose_name='上传用户ID')
+    filename = models.CharField(max_length=255, verbose_name='原始文件名')
+    extension = models.CharField(max_length=10, verbose_name='扩展名')
+    total_size = models.BigIntegerField(verbose_name='文件总大小(字节)')
+    chunk_size = models.IntegerField(verbose_name='分片大小(字节)')
+    received_size = models.BigIntegerField(default=0, verbose_name='已接收字节数')
+    expected_digest = models.CharField(max_length=64, null=True, blank=True, verbose_name='客户端声明的摘要')
+    digest = models.CharField(max_length=64, null=True, blank=True, verbose_name='完成后的内容摘要')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_UPLOADING, verbose_name='状态')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='最后活动时间')
+
+    class Meta:
+        db_table = 'upload_session'
+        verbose_name = '分片上传会话'
+        verbose_name_plural = '分片上传会话'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['user_id', 'status'], name='idx_upload_session_user'),
+            models.Index(fields=['updated_at'], name='idx_upload_session_updated'),
+        ]
+
+    @property
+    def total_chunks(self) -> int:
+        """分片总数"""
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    @property
+    def received_chunks(self) -> int:
+        """已接收的分片数（下一个待上传分片的序号）"""
+        if self.received_size >= self.total_size:
+            return self.total_chunks
+        return self.received_size // self.chunk_size
+
+
+# 7. 上传文件索引表
+class UploadFile(models.Model):
+    """
+    上传文件索引
+
+    记录 static/uploads 下的每个文件（不含衍生图和分片暂存文件），供管理员文件浏览使用，
+    列表查询只读该表，不扫描目录。上传时写入，Content.image_list 变化时由信号更新引用，
+    可用 rebuild_file_index 命令按目录全量重建。
+    """
+    id = models.BigAutoField(primary_key=True)
+    path = models.CharField(max_length=255, unique=True, verbose_name='文件路径', help_text='相对 static 目录，如 uploads/3f/<摘要>.png')
+    size = models.BigIntegerField(default=0, verbose_name='文件大小(字节)')
+    digest = models.CharField(max_length=64, null=True, blank=True, verbose_name='内容摘要(SHA-256)')
+    owner_id = models.IntegerField(null=True, blank=True, verbose_name='上传用户ID')
+    content_ids = models.TextField(default='[]', verbose_name='引用该文件的内容ID（JSON 数组）')
+    ref_count = models.IntegerField(default=0, verbose_name='引用内容数')
+    modified_at = models.DateTimeField(verbose_name='文件修改时间')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='索引创建时间')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='索引更新时间')
+
+    class Meta:
+        db_table = 'upload_file'
+        verbose_name = '上传文件'
+        verbose_name_plural = '上传文件索引'
+        ordering = ['-modified_at']
+        indexes = [
+            models.Index(fields=['modified_at'], name='idx_upload_file_modified'),
+            models.Index(fields=['size'], name='idx_upload_file_size'),
+            models.Index(fields=['ref_count', 'modified_at'], name='idx_upload_file_refs'),
+            models.Index(fields=['owner_id', 'modified_at'], name='idx_upload_file_owner'),
+            models.Index(fields=['digest'], name='idx_upload_file_digest'),
+        ]
+
+    def get_content_ids(self):
+        """解析引用内容ID列表"""
+        try:
+            ids = json.loads(self.content_ids or '[]')
+        except (json.JSONDecodeError, TypeError):
+            return []
+        return ids if isinstance(ids, list) else []
+
+    def set_content_ids(self, ids):
+        """写入引用内容ID列表（去重排序），同步 ref_count"""
+        ids = sorted(set(ids))
+        self.content_ids = json.dumps(ids)
+        self.ref_count = len(ids)
+
+
+# 8. 内容指纹表（近似重复检测）
+class ContentFingerprint(models.Model):
+    """
+    内容的 MinHash 签名（标题 + 正文开头），内容保存时由信号更新
+
+    签名用于估计两条内容的相似度；查找候选使用 ContentLshBand 的段键索引。
+    """
+    content_id = models.IntegerField(primary_key=True, verbose_name='内容ID')
+    signature = models.CharField(max_length=512, verbose_name='MinHash 签名', help_text='64 个 32 位整数的十六进制')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'content_fingerprint'
+        verbose_name = '内容指纹'
+        verbose_name_plural = '内容指纹'
+
+
+# 9. 内容 LSH 段键表（近似重复检测）
+class ContentLshBand(models.Model):
+    """
+    内容签名的 LSH 段键（每条内容 16 行）
+
+    任一段键相同的内容即为候选，按 band_key 索引查找，不与全表逐条比较。
+    """
+    id = models.BigAutoField(primary_key=True)
+    content_id = models.IntegerField(verbose_name='内容ID')
+    band_key = models.BigIntegerField(verbose_name='段键', help_text='高 4 位为段号，低 59 位为该段签名的哈希')
+
+    class Meta:
+        db_table = 'content_lsh_band'
+        verbose_name = '内容 LSH 段键'
+        verbose_name_plural = '内容 LSH 段键'
+        indexes = [
+            models.Index(fields=['band_key'], name='idx_content_lsh_band_key'),
+            models.Index(fields=['content_id'], name='idx_content_lsh_content'),
+        ]
+
+
+# 10. 内容状态计数表（管理面板统计）
+class ContentStatusCount(models.Model):
+    """
+    各状态的内容数，内容新建/状态变化/删除时由信号增减（与内容写入在同一事务中）
+
+    管理面板读取本表即可得到各状态数量，不随内容表增大而变慢。
+    仅在 DASHBOARD_STATUS_COUNTERS 开启时维护；计数偏差可用 rebuild_status_counts 命令重算。
+    """
+    status = models.CharField(max_length=50, primary_key=True, verbose_name='状态')
+    count = models.IntegerField(default=0, verbose_name='内容数')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'content_status_count'
+        verbose_name = '内容状态计数'
+        verbose_name_plural = '内容状态计数'
+
+
+# 11. 内容每日状态流转汇总表（发布/审核统计）
+class ContentDailyStat(models.Model):
+    """
+    每天、每个状态、每个责任人的状态流转次数
+
+    内容新建（status='created'）或状态变化时由信号累加，趋势统计只读本表，不扫描内容表；
+    可用 backfill_content_analytics 命令根据变更日志和内容表重建。
+    """
+    STATUS_CREATED = 'created'
+
+    id = models.BigAutoField(primary_key=True)
+    day = models.DateField(verbose_name='日期')
+    status = models.CharField(max_length=50, verbose_name='状态', help_text='进入的状态；created 表示新建')
+    user_id = models.IntegerField(default=0, verbose_name='责任人ID',
+                                  help_text='新建/草稿为创建者，待审核为描述者，审核/发布为审核者；0 表示未知')
+    count = models.IntegerField(default=0, verbose_name='次数')
+
+    class Meta:
+        db_table = 'content_daily_stat'
+        verbose_name = '内容每日状态流转'
+        verbose_name_plural = '内容每日状态流转'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'status', 'user_id'], name='uk_content_daily_stat'),
+        ]
+        indexes = [
+            models.Index(fields=['user_id', 'day'], name='idx_content_daily_stat_user'),
+        ]
+
+
+# 12. 内容每日耗时分布表（审核/发布耗时直方图）
+class ContentDailyLatency(models.Model):
+    """
+    每天、每种耗时的直方图（分桶计数），用于计算一段时间内的耗时分位数
+
+    - review：进入待审核到审核通过/拒绝
+    - publish：创建到发布
+    """
+    METRIC_REVIEW = 'review'
+    METRIC_PUBLISH = 'publish'
+
+    id = models.BigAutoField(primary_key=True)
+    day = models.DateField(verbose_name='日期')
+    metric = models.CharField(max_length=20, verbose_name='耗时类型')
+    bucket = models.SmallIntegerField(verbose_name='分桶序号', help_text='桶边界见 api/services/analytics_service.py')
+    count = models.IntegerField(default=0, verbose_name='次数')
+    total_seconds = models.BigIntegerField(default=0, verbose_name='耗时合计（秒）')
+
+    class Meta:
+        db_table = 'content_daily_latency'
+        verbose_name = '内容每日耗时分布'
+        verbose_name_plural = '内容每日耗时分布'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'metric', 'bucket'], name='uk_content_daily_latency'),
+        ]
+
+
+# 13. 标签表
+class Tag(models.Model):
+    """
+    标签（每个不同的标签名一行）
+
+    Content.tag 仍保存原始标签字符串（JSON 数组），content_tag 为其规范化索引，
+    按标签筛选、统计时经 content_tag 走索引，不再对 tag 列做 LIKE 扫描。
+    """
+    id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100, unique=True, verbose_name='标签名')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+
+    class Meta:
+        db_table = 'tag'
+        verbose_name = '标签'
+        verbose_name_plural = '标签'
+
+    def __str__(self):
+        return self.name
+
+
+# 14. 内容标签关联表
+class ContentTag(models.Model):
+    """
+    内容与标签的关联（每条内容的每个标签一行，position 为标签在原字符串中的顺序）
+
+    内容保存时若标签变化由信号重写，删除时由信号清除；历史数据用 backfill_content_tags 命令回填。
+    """
+    id = models.BigAutoField(primary_key=True)
+    content_id = models.IntegerField(verbose_name='内容ID')
+    tag_id = models.IntegerField(verbose_name='标签ID')
+    position = models.SmallIntegerField(default=0, verbose_name='顺序')
+
+    class Meta:
+        db_table = 'content_tag'
+        verbose_name = '内容标签'
+        verbose_name_plural = '内容标签'
+        constraints = [
+            models.UniqueConstraint(fields=['content_id', 'tag_id'], name='uk_content_tag'),
+        ]
+        indexes = [
+            models.Index(fields=['tag_id', 'content_id'], name='idx_content_tag_tag'),
+        ]
@@ -5,7 +5,7 @@ import api from './index'
  * 支持普通用户和管理员：
  * - 普通用户：只能看到活跃状态（排除 terminated）
  * - 管理员：可以看到所有状态（包括 terminated）
- * @param {Object} params - { page, page_size, q, sort, order, status, type }
+ * @param {Object} params - { page, page_size, q, sort, order, status, type, category, tag }
  */
 export const getEntries = async (params = {}) => {
   const { page = 1, page_size = 10, q = '', sort = 'created_at', order = 'desc', ...rest } = params
@@ -15,6 +15,31 @@ export const getEntries = async (params = {}) => {
   return response.data
 }
 
+/**
+ * 获取当前筛选条件下各状态、类型、标签的内容数（筛选下拉框显示数量）
+ * @param {Object} params - 与 getEntries 相同的筛选参数 { q, status, type, category, tag, ... }
+ * @returns {Object} { total, facets: { status: {状态: 数量}, type: {类型: 数量}, tag: [{ tag, count }] } }
+ */
+export const getEntryFacets = async (params = {}) => {
+  const response = await api.get('/contents/facets/', { params })
+  return response.data
+}
+
+/**
+ * 获取增量变更（基于游标同步本地列表）
+ * 不传 since 时只返回当前最新游标
+ * @param {number|null} since - 上次同步返回的 cursor
+ * @param {number} limit - 本次最多读取的变更条数
+ */
+export const getEntryChanges = async (since = null, limit = 200) => {
+  const params = { limit }
+  if (since !== null && since !== undefined) {
+    params.since = since
+  }
+  const response = await api.get('/contents/changes/', { params })
+  return response.data
+}
+
 /**
  * 上传纯文本内容（创建内容）
  * @param {Object} data - { title, short_title, content, link, type, tag, deadline }
@@ -48,6 +73,70 @@ export const uploadImage = async (formData) => {
   return response.data
 }
 
+/**
+ * 图片预检：按 SHA-256 摘要查找已存储的图片
+ * @param {string[]} digests - 摘要列表
+ * @returns {Promise<{existing: Object, missing: string[]}>}
+ */
+export const checkImageDigests = async (digests) => {
+  const response = await api.post('/upload/check/', { digests })
+  return response.data
+}
+
+/**
+ * 计算文件的 SHA-256 摘要（十六进制）
+ * @param {File} file
+ */
+export const digestFile = async (file) => {
+  const buffer = await file.arrayBuffer()
+  const hash = await crypto.subtle.digest('SHA-256', buffer)
+  return Array.from(new Uint8Array(hash)).map((b) => b.toString(16).padStart(2, '0')).join('')
+}
+
+/**
+ * 分片上传图片（断点续传）
+ *
+ * 创建会话后逐片 PUT，单个分片失败时重试（被限流时按 Retry-After 等待）；中断后传入 sessionId 可从服务端记录的进度继续。
+ * 完成后返回 {digest, url, ...}，再通过 uploadImage 的 digests 参数引用该图片。
+ * @param {File} file
+ * @param {Object} options - { sessionId, onProgress(received, total), retries }
+ */
+export const uploadImageChunked = async (file, options = {}) => {
+  const { onProgress, retries = 3 } = options
+  const digest = await digestFile(file)
+
+  let session
+  if (options.sessionId) {
+    session = (await api.get(`/upload/sessions/${options.sessionId}/`)).data
+  } else {
+    session = (await api.post('/upload/sessions/', { filename: file.name, size: file.size, digest })).data
+  }
+
+  for (let index = session.next_chunk; index < session.total_chunks; index++) {
+    const start = index * session.chunk_size
+    const chunk = file.slice(start, Math.min(start + session.chunk_size, file.size))
+    for (let attempt = 0; ; attempt++) {
+      try {
+        session = (await api.put(`/upload/sessions/${session.session_id}/chunks/${index}/`, chunk, {
+          headers: { 'Content-Type': 'application/octet-stream' },
+        })).data
+        break
+      } catch (error) {
+        if (attempt >= retries) throw error
+        // 被限流（429）时按 Retry-After 等待后再重传
+        if (error.response && error.response.status === 429) {
+          const seconds = Number(error.response.headers['retry-after']) || 1
+          await new Promise((resolve) => setTimeout(resolve, seconds * 1000))
+        }
+      }
+    }
+    if (onProgress) onProgress(session.received_size, session.total_size)
+  }
+
+  const response = await api.post(`/upload/sessions/${session.session_id}/finalize/`, { digest })
+  return response.data
+}
+
 /**
  * 粘贴 URL
  * @param {Object} data - { url }
@@ -60,6 +149,18 @@ export const pasteUrl = async (data) => {
   return response.data
 }
 
+/**
+ * 批量导入 URL（立即创建草稿，标题在后台获取后通过变更订阅同步）
+ * @param {string[]} urls - URL 列表
+ */
+export const importUrls = async (urls) => {
+  const response = await api.post('/upload/', {
+    upload_type: 'urls',
+    urls
+  })
+  return response.data
+}
+
 /**
  * 撤回内容
  * @param {number} entryId - 内容ID
@@ -87,6 +188,16 @@ export const getEntryDetail = async (entryId) => {
   return response.data
 }
 
+/**
+ * 获取疑似重复的内容
+ * @param {number} entryId - 内容ID
+ * @returns {Promise<{success: boolean, data: Array<{id: number, title: string, status: string, creator_id: number, similarity: number}>}>}
+ */
+export const getSimilarEntries = async (entryId) => {
+  const response = await api.get(`/content/${entryId}/similar/`)
+  return response.data
+}
+
 /**
  * 搜索内容
  * @param {string} query - 搜索关键词
@@ -18,3 +18,41 @@ export const previewEdit = async (data) => {
   const response = await api.post('/preview/', data)
   return response.data
 }
+
+/**
+ * 订阅事件推送（SSE）
+ * @param {Object} params - { types, mine } - types: 逗号分隔的事件类型
+ * @returns {EventSource} - 调用方通过 addEventListener('content.status', ...) 监听，离开页面时 close()
+ */
+export const openEventStream = (params = {}) => {
+  const baseURL = import.meta.env.VITE_API_BASE_URL || '/api'
+  const query = new URLSearchParams(params).toString()
+  const url = `${baseURL}/events/stream/${query ? `?${query}` : ''}`
+  return new EventSource(url, { withCredentials: true })
+}
+
+/**
+ * 获取自己持有的审核领取
+ */
+export const getReviewQueue = async () => {
+  const response = await api.get('/review/queue/')
+  return response.data
+}
+
+/**
+ * 领取下一批待审核内容
+ * @param {number} count - 本次新领取条数
+ */
+export const claimReviewEntries = async (count = 1) => {
+  const response = await api.post('/review/queue/', { count })
+  return response.data
+}
+
+/**
+ * 释放审核领取（放回队列）
+ * @param {number} entryId - 内容ID
+ */
+export const releaseReviewEntry = async (entryId) => {
+  const response = await api.post(`/content/${entryId}/release/`)
+  return response.data
+}
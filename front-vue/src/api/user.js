@@ -4,11 +4,13 @@ import api from './index'
  * 获取用户列表
  * @param {Object} params - 分页和排序参数
  *   - page: 页码（默认 1）
+ *   - cursor: 游标分页，第一页传 ''，之后传上一页的 next_cursor（传入时不再返回 count/total_pages）
  *   - page_size: 每页条数（默认 10）
  *   - sort: 排序字段（默认 'created_at'）
  *   - order: 排序方向 'asc'|'desc'（默认 'desc'）
- *   - q: 搜索关键词
+ *   - q: 用户名、真实姓名或学号的前缀
  *   - role: 权限筛选
+ * 每个用户附带 content_counts（创建/描述/审核的内容数及创建内容的各状态数量）
  */
 export const getUsers = async (params = {}) => {
   const response = await api.get('/admin/users/', { params })
@@ -46,3 +48,42 @@ export const getAdminData = async () => {
   const response = await api.get('/admin/dashboard/')
   return response.data
 }
+
+/**
+ * 获取发布审核统计（每日流转次数、责任人工作量、审核/发布耗时分位数）
+ * @param {Object} params - 查询参数
+ *   - start: 起始日期 YYYY-MM-DD（默认结束日期前 29 天）
+ *   - end: 结束日期 YYYY-MM-DD（默认今天）
+ *   - users: 返回的责任人数（默认 20）
+ */
+export const getAnalytics = async (params = {}) => {
+  const response = await api.get('/admin/analytics/', { params })
+  return response.data
+}
+
+/**
+ * 获取上传文件列表（管理员文件浏览）
+ * @param {Object} params - 分页、排序和筛选参数
+ *   - page: 页码（默认 1）
+ *   - page_size: 每页条数 20|50|100|200（默认 20）
+ *   - sort: 排序字段 'modified_at'|'size'|'path'|'ref_count'（默认 'modified_at'）
+ *   - order: 排序方向 'asc'|'desc'（默认 'desc'）
+ *   - q: 路径关键词
+ *   - owner_id: 上传者ID
+ *   - referenced: 'true' 只看被引用的文件，'false' 只看未被引用的文件
+ *   - ext: 扩展名（如 '.png'）
+ */
+export const getUploadFiles = async (params = {}) => {
+  const response = await api.get('/admin/files/', { params })
+  return response.data
+}
+
+/**
+ * 删除上传文件
+ * @param {number} fileId - 文件索引ID
+ * @param {boolean} force - 文件仍被内容引用时是否强制删除
+ */
+export const deleteUploadFile = async (fileId, force = false) => {
+  const response = await api.delete(`/admin/files/${fileId}/`, { params: { force } })
+  return response.data
+}
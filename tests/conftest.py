@@ -0,0 +1,60 @@
+"""
+测试公共配置
+
+需要数据库的测试使用 django_db fixture：以临时 SQLite 数据库配置 Django（不需要 MySQL 和配置文件），
+按模型直接建表（项目不使用迁移）。
+"""
+
+import os
+import sys
+
+import pytest
+
+
+# 项目根目录追加到 sys.path 末尾（根目录下的 cmd.py 与标准库 cmd 同名，不能放在前面）
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+
+@pytest.fixture(scope='session')
+def django_db(tmp_path_factory):
+    django = pytest.importorskip('django')
+    from django.conf import settings
+
+    workdir = tmp_path_factory.mktemp('django')
+    settings.configure(
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(workdir / 'db.sqlite3')}},
+        INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.sessions', 'django_models', 'api'],
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        SECRET_KEY='test',
+        USE_TZ=False,
+        DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+        UPLOAD_ROOT=str(workdir / 'uploads'),
+        MEDIA_URL='/media/',
+        STATIC_URL='/static/',
+    )
+    django.setup()
+
+    from django.apps import apps
+    from django.db import connection
+    with connection.schema_editor() as editor:
+        for model in apps.get_app_config('django_models').get_models():
+            editor.create_model(model)
+    return connection
+
+
+@pytest.fixture(scope='session')
+def global_config(tmp_path_factory):
+    """在临时目录中放置 config/config.txt 后导入 config.load_config（GLOBAL_CONFIG 在导入时读取相对路径）"""
+    workdir = tmp_path_factory.mktemp('config')
+    (workdir / 'config').mkdir()
+    (workdir / 'config' / 'config.txt').write_text('FLASK_user_cache:false\n', encoding='utf-8')
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        from config.load_config import GLOBAL_CONFIG
+    finally:
+        os.chdir(cwd)
+    return GLOBAL_CONFIG
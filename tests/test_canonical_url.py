@@ -0,0 +1,27 @@
+"""
+链接规范化与去重键（common.methods.canonical_url）
+"""
+
+from common.methods.canonical_url import canonical_url, link_hash
+
+
+def test_same_page_variants_share_hash():
+    same_page = [
+        'http://jwc.seu.edu.cn/2025/0301/c1234a5678/page.htm',
+        'https://JWC.seu.edu.cn:443/2025/0301/c1234a5678/page.htm#content',
+        'http://www.jwc.seu.edu.cn//2025/0301/c1234a5678/page.htm?utm_source=wechat',
+    ]
+    assert len({link_hash(url) for url in same_page}) == 1
+
+
+def test_wechat_keeps_article_params_only():
+    wechat = 'https://mp.weixin.qq.com/s?__biz=MzA3&mid=2650&idx=1&sn=abc&chksm=84f1&scene=21#wechat_redirect'
+    assert canonical_url(wechat) == 'https://mp.weixin.qq.com/s?__biz=MzA3&idx=1&mid=2650&sn=abc'
+
+
+def test_different_query_is_different_page():
+    assert link_hash('https://example.com/news?id=1') != link_hash('https://example.com/news?id=2')
+
+
+def test_empty_link_has_no_hash():
+    assert link_hash('') == ''
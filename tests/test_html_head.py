@@ -0,0 +1,73 @@
+"""
+网页标题增量提取（common.methods.html_head）
+
+对 benchmarks/title_corpus/ 中保存的网页，按多种分块大小输入（覆盖多字节字符跨块），
+结果须与 corpus.json 中记录的期望标题一致，并与按正确编码解码后用 BeautifulSoup 解析完整页面
+（原 fetch_title 的提取规则）的结果一致。
+"""
+
+import json
+import os
+
+import pytest
+
+from common.methods.html_head import extract_title
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'title_corpus')
+CHUNK_SIZES = (1, 2, 3, 7, 64, 1024, 4096, None)
+
+with open(os.path.join(CORPUS_DIR, 'corpus.json'), encoding='utf-8') as f:
+    CORPUS = json.load(f)
+
+
+def read_page(name):
+    with open(os.path.join(CORPUS_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def split_chunks(data, size):
+    if size is None:
+        return [data]
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def reference_title(data, encoding):
+    """参考实现：BeautifulSoup 解析完整页面，优先 og:title，其次 <title>"""
+    bs4 = pytest.importorskip('bs4')
+    soup = bs4.BeautifulSoup(data.decode(encoding, errors='replace'), 'html.parser')
+    head = soup.find('head') or soup
+    meta_tag = head.find('meta', property='og:title')
+    if meta_tag and meta_tag.get('content'):
+        return meta_tag.get('content').strip()
+    title_tag = head.find('title')
+    if title_tag and title_tag.string and title_tag.string.strip():
+        return title_tag.string.strip()
+    return None
+
+
+@pytest.mark.parametrize('size', CHUNK_SIZES)
+@pytest.mark.parametrize('name', sorted(CORPUS))
+def test_extract_title_matches_expected(name, size):
+    page = CORPUS[name]
+    assert extract_title(split_chunks(read_page(name), size), page['content_type']) == page['title']
+
+
+@pytest.mark.parametrize('name', sorted(CORPUS))
+def test_reference_matches_expected(name):
+    page = CORPUS[name]
+    assert reference_title(read_page(name), page['encoding']) == page['title']
+
+
+def test_stops_reading_after_head():
+    body = b'<p>' + b'x' * 100000 + b'</p>'
+    page = b'<html><head><title>T</title></head><body>' + body + b'</body></html>'
+    read = []
+
+    def chunks():
+        for chunk in split_chunks(page, 1024):
+            read.append(chunk)
+            yield chunk
+
+    assert extract_title(chunks(), 'text/html') == 'T'
+    assert len(read) == 1
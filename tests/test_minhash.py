@@ -0,0 +1,49 @@
+"""
+MinHash 文本签名与 LSH 分段（common.methods.minhash）
+"""
+
+from common.methods.minhash import (
+    BANDS, MAX_TEXT_LENGTH, NUM_PERM, band_keys, decode_signature, encode_signature, similarity, text_signature,
+)
+
+
+ORIGINAL = ('关于2025年寒假学生离校安排的通知',
+            '各学院：根据学校校历安排，2025年寒假自1月18日开始，请各学院做好学生离校前的安全教育工作，'
+            '学生离校前须关好门窗、切断电源，并在系统中登记离校信息。')
+REWORDED = ('关于2025年寒假学生离校安排的通知（转发）',
+            '各学院：根据学校校历安排，2025年寒假自1月18日起，请各学院做好学生离校前安全教育工作，'
+            '学生离校前须关好门窗、切断电源，并在系统中登记离校信息。')
+UNRELATED = ('图书馆寒假开放时间调整',
+             '寒假期间图书馆四牌楼校区分馆开放时间调整为每天8:00-17:00，九龙湖校区总馆正常开放。')
+
+
+def shared_bands(a, b):
+    return len(set(band_keys(a)) & set(band_keys(b)))
+
+
+def test_reworded_notice_is_candidate():
+    a, b = text_signature(*ORIGINAL), text_signature(*REWORDED)
+    assert similarity(a, b) > 0.8
+    assert shared_bands(a, b) > 0
+
+
+def test_unrelated_notice_is_not_candidate():
+    a, c = text_signature(*ORIGINAL), text_signature(*UNRELATED)
+    assert similarity(a, c) < 0.3
+    assert shared_bands(a, c) == 0
+
+
+def test_short_text_has_no_signature():
+    assert text_signature('通知', '') is None
+
+
+def test_signature_round_trip():
+    sig = text_signature(*ORIGINAL)
+    assert len(sig) == NUM_PERM
+    assert len(band_keys(sig)) == BANDS
+    assert decode_signature(encode_signature(sig)) == sig
+
+
+def test_long_text_only_uses_prefix():
+    prefix = ''.join(chr(0x4e00 + i) for i in range(MAX_TEXT_LENGTH))
+    assert text_signature('长文本', prefix + '后续内容' * 100) == text_signature('长文本', prefix)
@@ -0,0 +1,80 @@
+"""
+Flask 权限装饰器（common.decorator.permission_required）
+
+同一请求中 login_required、editor_required 和视图内的 require_current_user() 共用一次用户查询。
+"""
+
+import pytest
+
+
+@pytest.fixture
+def client(django_db, global_config):
+    flask = pytest.importorskip('flask')
+    from common.decorator.permission_required import PermissionDecorators
+
+    app = flask.Flask(__name__)
+    app.secret_key = 'test'
+
+    @app.route('/login')
+    def login():
+        return 'login'
+
+    @app.route('/edit')
+    @PermissionDecorators.login_required
+    @PermissionDecorators.editor_required
+    def edit():
+        return PermissionDecorators.require_current_user().username
+
+    return app.test_client()
+
+
+@pytest.fixture
+def editor(django_db):
+    from django_models.models import User_info
+
+    user, _ = User_info.objects.get_or_create(
+        username='editor',
+        defaults={'password_MD5': 'x', 'realname': 'editor', 'role': User_info.PERMISSION_EDITOR},
+    )
+    return user
+
+
+def user_queries(queries):
+    return [query for query in queries if 'user_info' in query['sql']]
+
+
+def test_one_user_query_per_request(client, editor, django_db):
+    from django.test.utils import CaptureQueriesContext
+
+    with client.session_transaction() as session:
+        session['username'] = editor.username
+
+    with CaptureQueriesContext(django_db) as queries:
+        response = client.get('/edit')
+
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == 'editor'
+    assert len(user_queries(queries.captured_queries)) == 1
+
+
+def test_user_is_not_cached_across_requests(client, editor, django_db):
+    from django.test.utils import CaptureQueriesContext
+
+    with client.session_transaction() as session:
+        session['username'] = editor.username
+
+    with CaptureQueriesContext(django_db) as queries:
+        client.get('/edit')
+        client.get('/edit')
+
+    assert len(user_queries(queries.captured_queries)) == 2
+
+
+def test_anonymous_request_makes_no_query(client, django_db):
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(django_db) as queries:
+        response = client.get('/edit')
+
+    assert response.status_code == 302
+    assert user_queries(queries.captured_queries) == []
@@ -0,0 +1,40 @@
+"""
+内容寻址保存上传文件（common.methods.save_upload）
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from common.methods.save_upload import save_upload
+
+
+DATA = b'hello world' * 1000
+
+
+def test_saves_under_digest_path(tmp_path):
+    saved = save_upload([DATA[:5000], DATA[5000:]], str(tmp_path), '.PNG')
+
+    digest = hashlib.sha256(DATA).hexdigest()
+    assert saved['digest'] == digest
+    assert saved['relative_path'] == f'{digest[:2]}/{digest}.png'
+    assert saved['size'] == len(DATA)
+    assert saved['existed'] is False
+    with open(saved['absolute_path'], 'rb') as f:
+        assert f.read() == DATA
+
+
+def test_same_content_reuses_file(tmp_path):
+    first = save_upload([DATA], str(tmp_path), '.png')
+    second = save_upload([DATA[:3], DATA[3:]], str(tmp_path), '.png')
+
+    assert second['relative_path'] == first['relative_path']
+    assert second['existed'] is True
+
+
+def test_oversized_upload_leaves_no_temp_file(tmp_path):
+    with pytest.raises(ValueError):
+        save_upload([DATA], str(tmp_path), '.png', max_size=100)
+
+    assert [name for name in os.listdir(tmp_path) if name.startswith('.upload-')] == []
@@ -0,0 +1,49 @@
+-- ===================================================================
+-- SEU News 数据库升级脚本
+-- ===================================================================
+-- 说明:
+--   - 用于按旧版 create_tables.sql 建好的已有数据库（新部署直接执行 create_tables.sql 即可）
+--   - create_tables.sql 只包含 CREATE TABLE IF NOT EXISTS，不会给已有的表增加列和索引；
+--     本脚本补齐 content_management 新增的列和索引，新增的表仍由 create_tables.sql 创建
+--   - 每条 ALTER 只需执行一次；重复执行会报 Duplicate column / Duplicate key name，可忽略
+-- ===================================================================
+-- 升级步骤:
+--   1. mysql seu_news < upgrade_tables.sql
+--   2. mysql seu_news < create_tables.sql         （创建新增的表，已有的表不受影响）
+--   3. python manage.py backfill_content_category （回填 category）
+--   4. python manage.py backfill_link_hash        （回填 link_hash）
+--   5. python manage.py backfill_content_tags     （回填 tag / content_tag）
+-- ===================================================================
+
+USE seu_news;
+
+
+-- ===================================================================
+-- content_management: 导出分类（由标签和类型派生）
+-- ===================================================================
+
+ALTER TABLE `content_management`
+    ADD COLUMN `category` VARCHAR(20) NOT NULL DEFAULT 'other'
+        COMMENT '导出分类（college/club/lecture/other，由标签和类型派生）' AFTER `tag`,
+    ADD KEY `idx_category` (`category`, `publish_at`);
+
+
+-- ===================================================================
+-- content_management: 链接去重键（规范化链接的 SHA-1 摘要）
+-- ===================================================================
+
+ALTER TABLE `content_management`
+    ADD COLUMN `link_hash` CHAR(40) NOT NULL DEFAULT ''
+        COMMENT '链接去重键（规范化链接的 SHA-1 摘要）' AFTER `link`,
+    ADD KEY `idx_link_hash` (`link_hash`);
+
+
+-- ===================================================================
+-- content_management: 审核队列领取
+-- ===================================================================
+
+ALTER TABLE `content_management`
+    MODIFY COLUMN `locker_id` INT DEFAULT NULL COMMENT '当前锁定者用户ID（防止并发编辑；审核队列领取者）',
+    MODIFY COLUMN `locked_at` DATETIME DEFAULT NULL COMMENT '锁定时间戳（超过 REVIEW_CLAIM_TTL_SECONDS 视为过期）',
+    ADD KEY `idx_status_deadline` (`status`, `locker_id`, `deadline`, `created_at`),
+    ADD KEY `idx_locker_id` (`locker_id`);